@@ -12,6 +12,8 @@ pytest_plugins = [
     'pytest_plugins.testimony_markers',
     'pytest_plugins.settings_skip',
     'pytest_plugins.rerun_rp.rerun_rp',
+    'pytest_plugins.satellite_affinity',
+    'pytest_plugins.vm_pool',
     # Fixtures
     'pytest_fixtures.api_fixtures',
     'pytest_fixtures.broker',
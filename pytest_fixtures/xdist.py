@@ -10,7 +10,7 @@ from robottelo.logging import logger
 
 
 @pytest.fixture(scope="session", autouse=True)
-def align_to_satellite(worker_id, satellite_factory):
+def align_to_satellite(request, worker_id, satellite_factory):
     """Attempt to align a Satellite to the current xdist worker"""
     cache_proxy = robottelo.config.settings_proxy._cache
     # clear any hostname that may have been previously set
@@ -29,8 +29,13 @@ def align_to_satellite(worker_id, satellite_factory):
         cache_proxy['server.hostnames'] = cache_proxy['server.hostnames'] or []
         cache_proxy['server.hostnames'].extend([host.hostname for host in hosts])
 
+    # the satellite assigned by the xdist controller with --satellite-affinity
+    assigned_hostname = getattr(request.config, 'workerinput', {}).get('satellite_hostname')
+
     # attempt to align a worker to a satellite
-    if settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
+    if assigned_hostname:
+        cache_proxy['server.hostname'] = assigned_hostname
+    elif settings.server.xdist_behavior == 'run-on-one' and settings.server.hostnames:
         cache_proxy['server.hostname'] = settings.server.hostnames[0]
     elif settings.server.hostnames and worker_pos < len(settings.server.hostnames):
         cache_proxy['server.hostname'] = settings.server.hostnames[worker_pos]
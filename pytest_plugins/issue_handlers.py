@@ -1,6 +1,4 @@
-import inspect
 import json
-import re
 from collections import defaultdict
 from datetime import datetime
 
@@ -9,6 +7,7 @@ import pytest
 from robottelo.config import settings
 from robottelo.helpers import slugify_component
 from robottelo.logging import collection_logger as logger
+from robottelo.utils import docstring_index
 from robottelo.utils.issue_handlers import add_workaround
 from robottelo.utils.issue_handlers import bugzilla
 from robottelo.utils.issue_handlers import is_open
@@ -99,35 +98,6 @@ def pytest_collection_modifyitems(session, items, config):
     items[:] = selected
 
 
-IS_OPEN = re.compile(
-    # To match `if is_open('BZ:123456'):`
-    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-NOT_IS_OPEN = re.compile(
-    # To match `if not is_open('BZ:123456'):`
-    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
-)
-
-COMPONENT = re.compile(
-    # To match :CaseComponent: FooBar
-    r"\s*:CaseComponent:\s*(?P<component>\S*)",
-    re.IGNORECASE,
-)
-
-IMPORTANCE = re.compile(
-    # To match :CaseImportance: Critical
-    r"\s*:CaseImportance:\s*(?P<importance>\S*)",
-    re.IGNORECASE,
-)
-
-BZ = re.compile(
-    # To match :BZ: 123456, 456789
-    r"\s*:BZ:\s*(?P<bz>.*\S*)",
-    re.IGNORECASE,
-)
-
-
 def generate_issue_collection(items, config):  # pragma: no cover
     """Generates a dictionary with the usage of Issue blockers
 
@@ -191,6 +161,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
     deselect_data = {}  # a local cache for deselected tests
 
+    index = docstring_index.get_index(config)
+
     test_modules = set()
 
     # --- Build the issue marked usage collection ---
@@ -206,11 +178,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
         # register test module as processed
         test_modules.add(item.module)
         # Find matches from docstrings top-down from: module, class, function.
-        mod_cls_fun = (item.module, getattr(item, 'cls', None), item.function)
-        for docstring in [d for d in map(inspect.getdoc, mod_cls_fun) if d is not None]:
-            bz_matches = BZ.findall(docstring)
-            if bz_matches:
-                bz_marks_to_add.extend(b.strip() for b in bz_matches[-1].split(','))
+        for tokens in reversed(index.item_tokens(item)):
+            bz_marks_to_add.extend(tokens['bz'])
 
         filepath, lineno, testcase = item.location
         # Component and importance marks are determined by testimony tokens
@@ -240,8 +209,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 bz_marks_to_add.append(issue_key.split(':')[-1])
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        usages = index.function_is_open(item.function)
+        if usages['is_open'] or usages['not_is_open']:
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -250,8 +219,8 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            add_workaround(collected_data, usages['is_open'], 'is_open', **kwargs)
+            add_workaround(collected_data, usages['not_is_open'], 'not is_open', **kwargs)
 
         # Add BZs from tokens as a marker to enable filter e.g: "--BZ 123456"
         if bz_marks_to_add:
@@ -259,17 +228,13 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        usages = index.module_is_open(test_module)
+        if usages['is_open'] or usages['not_is_open']:
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
                 'testcase': test_module.__name__,
-                'component': module_component,
+                'component': index.module_component(test_module),
             }
 
             def validation(data, issue, usage, **kwargs):
@@ -277,14 +242,14 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
             add_workaround(
                 collected_data,
-                IS_OPEN.findall(module_source),
+                usages['is_open'],
                 'is_open',
                 validation=validation,
                 **kwargs,
             )
             add_workaround(
                 collected_data,
-                NOT_IS_OPEN.findall(module_source),
+                usages['not_is_open'],
                 'not is_open',
                 validation=validation,
                 **kwargs,
@@ -313,4 +278,6 @@ def generate_issue_collection(items, config):  # pragma: no cover
             json.dump(collected_data, collect_file, indent=4, cls=VersionEncoder)
             logger.info(f"Generated BZ cache file {DEFAULT_BZ_CACHE_FILE}")
 
+    index.save()
+
     return collected_data
@@ -6,8 +6,10 @@ from xdist import is_xdist_worker
 
 from robottelo.logging import DEFAULT_DATE_FORMAT
 from robottelo.logging import logger
+from robottelo.logging import queue_handler
 from robottelo.logging import robottelo_log_dir
 from robottelo.logging import robottelo_log_file
+from robottelo.utils.file_lock import lock_wait_stats
 
 try:
     from pytest_reportportal import RPLogger
@@ -25,6 +27,9 @@ def configure_logging(request, worker_id):
     a logfile named 'robottelo_gw{worker_id}.log' will be created.
 
     Add a handler for ReportPortal logging
+
+    The file and ReportPortal handlers are run by the log listener thread,
+    through the queue handler of the robottelo logger.
     """
     worker_formatter = logzero.LogFormatter(
         fmt=f'%(asctime)s - {worker_id} - %(name)s - %(levelname)s - %(message)s',
@@ -35,17 +40,17 @@ def configure_logging(request, worker_id):
         logging.setLoggerClass(RPLogger)
 
     if is_xdist_worker(request):
-        if f'{worker_id}' not in [h.get_name() for h in logger.handlers]:
+        if f'{worker_id}' not in [h.get_name() for h in queue_handler.handlers]:
             # Track the core logger's file handler level, set it in case core logger wasn't set
             worker_log_level = 'INFO'
             handlers_to_remove = [
                 h
-                for h in logger.handlers
+                for h in queue_handler.handlers
                 if isinstance(h, logging.FileHandler)
                 and getattr(h, 'baseFilename', None) == str(robottelo_log_file)
             ]
             for handler in handlers_to_remove:
-                logger.removeHandler(handler)
+                queue_handler.removeHandler(handler)
                 worker_log_level = handler.level
             worker_handler = logging.FileHandler(
                 robottelo_log_dir.joinpath(f'robottelo_{worker_id}.log')
@@ -53,12 +58,12 @@ def configure_logging(request, worker_id):
             worker_handler.set_name(f'{worker_id}')
             worker_handler.setFormatter(worker_formatter)
             worker_handler.setLevel(worker_log_level)
-            logger.addHandler(worker_handler)
+            queue_handler.addHandler(worker_handler)
 
             if use_rp_logger:
                 rp_handler = RPLogHandler(request.node.config.py_test_service)
                 rp_handler.setFormatter(worker_formatter)
-                # logger.addHandler(rp_handler)
+                # queue_handler.addHandler(robottelo.logging.BatchingHandler(rp_handler))
 
 
 def pytest_runtest_logstart(nodeid, location):
@@ -67,3 +72,17 @@ def pytest_runtest_logstart(nodeid, location):
 
 def pytest_runtest_logfinish(nodeid, location):
     logger.info(f'Finished Test: {nodeid}')
+    # the batched records are sent before the next test starts
+    queue_handler.flush()
+
+
+def pytest_sessionfinish(session):
+    """Log the time this process spent waiting for and holding each file lock"""
+    for name, stats in sorted(
+        lock_wait_stats().items(), key=lambda item: item[1]['total'], reverse=True
+    ):
+        logger.info(
+            f'Lock {name}: acquired {stats["count"]} times, waited {stats["waited"]} times, '
+            f'{stats["total"]:.1f}s in total, {stats["max"]:.1f}s at most, '
+            f'held {stats["held"]:.1f}s in total, {stats["max_held"]:.1f}s at most'
+        )
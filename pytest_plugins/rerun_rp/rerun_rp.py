@@ -29,18 +29,15 @@ def _get_tests(launch, **kwargs):
         i.e status, user, defect_types
     :return list: The list of test names retrieved from RP launch
     """
-    tests = []
-    if 'status' in kwargs:
-        all_status = kwargs.pop('status')
-        for status in all_status:
-            if status == 'failed' and 'defect_types' in kwargs:
-                defect_types = kwargs.pop('defect_types')
-                for dtype in defect_types:
-                    tests.extend(launch.tests(**kwargs, status=status, defect_type=dtype).keys())
-            else:
-                tests.extend(launch.tests(**kwargs, status=status).keys())
+    statuses = kwargs.pop('status', None)
+    defect_types = kwargs.pop('defect_types', None)
+    # The launch fetches its tests once, the filtering is done locally
+    if statuses and defect_types and 'failed' in statuses:
+        tests = list(launch.tests(**kwargs, status='failed', defect_type=defect_types).keys())
+        statuses = [status for status in statuses if status != 'failed']
+        tests.extend(launch.tests(**kwargs, status=statuses).keys())
     else:
-        tests.extend(launch.tests(**kwargs).keys())
+        tests = list(launch.tests(**kwargs, status=statuses).keys())
     transformed_tests = _transform_rp_tests_to_pytest(tests)
     return transformed_tests
 
@@ -0,0 +1,281 @@
+"""Schedule the tests on the xdist workers with affinity to their Satellite.
+
+With ``--satellite-affinity`` the xdist controller assigns the Satellites to
+the workers, then distributes the test modules so the modules using the same
+module and session scoped fixtures run on the same Satellite, where the state
+set up by those fixtures (manifests, synced repositories) is already cached.
+The modules are balanced using their durations in the previous runs, and the
+load of each Satellite is reported at the end of the session.
+"""
+import ast
+import functools
+import os
+from collections import defaultdict
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from robottelo.config import settings
+from robottelo.logging import logger
+
+DURATIONS_KEY = 'robottelo/satellite_affinity/durations'
+# fixtures which state is kept on the Satellite between the test modules
+AFFINITY_FIXTURE_PREFIXES = ('module_', 'session_', 'default_')
+# a Satellite may get this share more than its fair load to keep together the
+# modules sharing fixtures
+BALANCE_TOLERANCE = 0.1
+# duration of a test of a module that never ran
+DEFAULT_TEST_DURATION = 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def module_signature(path):
+    """Return the module and session scoped fixtures used by the tests of a module
+
+    :param str path: the path of the test module
+    :returns frozenset: the fixture names
+    """
+    try:
+        with open(path, 'rb') as module_file:
+            tree = ast.parse(module_file.read())
+    except (OSError, SyntaxError, ValueError):
+        return frozenset()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith(
+            'test'
+        ):
+            names.update(
+                arg.arg for arg in node.args.args if arg.arg.startswith(AFFINITY_FIXTURE_PREFIXES)
+            )
+    return frozenset(names)
+
+
+def satellite_hostname(worker_pos):
+    """Return the Satellite hostname of an xdist worker, as align_to_satellite
+    would choose it, but distributing the workers evenly in balance mode
+
+    :returns: the hostname, None when the Satellite is checked out on demand
+    """
+    hostnames = settings.server.hostnames
+    if not hostnames:
+        return None
+    if settings.server.xdist_behavior == 'run-on-one':
+        return hostnames[0]
+    if worker_pos < len(hostnames) or settings.server.xdist_behavior == 'balance':
+        return hostnames[worker_pos % len(hostnames)]
+    return None
+
+
+def satellite_of(node):
+    """Return the Satellite of a worker node, the worker id if unknown"""
+    return node.workerinput.get('satellite_hostname') or node.gateway.id
+
+
+class SatelliteAffinityScheduling(LoadScopeScheduling):
+    """Distribute the test modules to the workers by Satellite.
+
+    Once collected, the modules are planned from the longest: each module goes
+    to the Satellite which already got the largest share of its fixtures among
+    the Satellites staying under their fair load, else to the Satellite with
+    the lowest load per worker, then to the least loaded worker of that
+    Satellite. A worker done with its planned modules takes the smallest
+    modules left to the busiest worker of its Satellite first, then of the
+    other Satellites.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log=log)
+        cache = getattr(config, 'cache', None)
+        self.durations = cache.get(DURATIONS_KEY, {}) if cache is not None else {}
+        self.estimates = {}
+        self.plan = None
+
+    def _split_scope(self, nodeid):
+        """Group the tests by module"""
+        return nodeid.split('::', 1)[0]
+
+    def _estimate(self, scope, work_unit):
+        known = self.durations.get(scope)
+        if known and known['tests']:
+            return known['duration'] / known['tests'] * len(work_unit)
+        return DEFAULT_TEST_DURATION * len(work_unit)
+
+    def _plan(self):
+        satellites = defaultdict(list)
+        for node in self.nodes:
+            satellites[satellite_of(node)].append(node)
+        satellite_load = dict.fromkeys(satellites, 0.0)
+        satellite_fixtures = {satellite: set() for satellite in satellites}
+        node_load = dict.fromkeys(self.nodes, 0.0)
+        self.plan = {node: [] for node in self.nodes}
+        self.estimates = {
+            scope: self._estimate(scope, work_unit) for scope, work_unit in self.workqueue.items()
+        }
+        load_per_worker = sum(self.estimates.values()) / len(self.nodes)
+        for scope in sorted(self.estimates, key=self.estimates.get, reverse=True):
+            duration = self.estimates[scope]
+            signature = module_signature(os.path.join(str(self.config.rootdir), scope))
+
+            def worker_load(satellite):
+                return (satellite_load[satellite] + duration) / len(satellites[satellite])
+
+            def affinity(satellite):
+                shared = len(signature & satellite_fixtures[satellite])
+                return (shared / (len(signature) or 1), -worker_load(satellite))
+
+            under_fair_load = [
+                satellite
+                for satellite in satellites
+                if worker_load(satellite) <= load_per_worker * (1 + BALANCE_TOLERANCE)
+            ]
+            if under_fair_load:
+                satellite = max(under_fair_load, key=affinity)
+            else:
+                satellite = min(satellites, key=worker_load)
+            node = min(satellites[satellite], key=node_load.get)
+            self.plan[node].append(scope)
+            satellite_load[satellite] += duration
+            satellite_fixtures[satellite].update(signature)
+            node_load[node] += duration
+        for satellite, nodes in satellites.items():
+            self.log(
+                f'Satellite {satellite}: {len(nodes)} workers, '
+                f'{satellite_load[satellite]:.0f}s of planned tests'
+            )
+
+    def _planned_load(self, node):
+        return sum(self.estimates[scope] for scope in self.plan[node] if scope in self.workqueue)
+
+    def _reschedule(self, node):
+        """Maybe schedule new items on the node, a node done with its plan takes
+        work from the other nodes only once idle
+        """
+        if (
+            self.plan is not None
+            and self.workqueue
+            and not node.shutting_down
+            and self._pending_of(self.assigned_work[node])
+            and not any(scope in self.workqueue for scope in self.plan.get(node, []))
+        ):
+            return
+        super()._reschedule(node)
+
+    def _next_scope(self, node):
+        """Return the next module to run on node, following the plan"""
+        satellite = satellite_of(node)
+        # the plan keeps the modules of the removed nodes
+        others = sorted(
+            (other for other in self.plan if other is not node),
+            key=lambda other: (satellite_of(other) != satellite, -self._planned_load(other)),
+        )
+        for candidate in [node] + others:
+            plan = self.plan.get(candidate, [])
+            while plan:
+                scope = plan.pop(0) if candidate is node else plan.pop()
+                if scope in self.workqueue:
+                    return scope
+        # modules of a crashed node put back in the queue
+        return next(iter(self.workqueue))
+
+    def _assign_work_unit(self, node):
+        """Assign the next planned work unit to a node"""
+        assert self.workqueue
+        if self.plan is None:
+            self._plan()
+        scope = self._next_scope(node)
+        work_unit = self.workqueue.pop(scope)
+        self.assigned_work[node][scope] = work_unit
+        worker_collection = self.registered_collections[node]
+        nodeids_indexes = [
+            worker_collection.index(nodeid)
+            for nodeid, completed in work_unit.items()
+            if not completed
+        ]
+        node.send_runtest_some(nodeids_indexes)
+
+
+class SatelliteAffinity:
+    """Record the durations of the modules and the load of the Satellites on
+    the xdist controller
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.module_durations = defaultdict(float)
+        self.module_tests = defaultdict(set)
+        self.satellites = defaultdict(
+            lambda: {'workers': set(), 'modules': set(), 'tests': 0, 'duration': 0.0}
+        )
+
+    def pytest_runtest_logreport(self, report):
+        module = report.nodeid.split('::', 1)[0]
+        self.module_durations[module] += report.duration
+        self.module_tests[module].add(report.nodeid)
+        node = getattr(report, 'node', None)
+        if node is None:
+            return
+        satellite = self.satellites[satellite_of(node)]
+        satellite['workers'].add(node.gateway.id)
+        satellite['modules'].add(module)
+        satellite['duration'] += report.duration
+        if report.when == 'call':
+            satellite['tests'] += 1
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, 'cache', None)
+        if cache is None:
+            return
+        durations = cache.get(DURATIONS_KEY, {})
+        for module, duration in self.module_durations.items():
+            durations[module] = {'duration': duration, 'tests': len(self.module_tests[module])}
+        cache.set(DURATIONS_KEY, durations)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.satellites:
+            return
+        terminalreporter.section('Satellite affinity')
+        loads = []
+        for hostname, satellite in sorted(self.satellites.items()):
+            load = satellite['duration'] / len(satellite['workers'])
+            loads.append(load)
+            line = (
+                f'{hostname}: {len(satellite["workers"])} workers, '
+                f'{len(satellite["modules"])} modules, {satellite["tests"]} tests, '
+                f'{satellite["duration"]:.0f}s, {load:.0f}s per worker'
+            )
+            terminalreporter.write_line(line)
+            logger.info(f'Satellite affinity - {line}')
+        balance = min(loads) / max(loads) if max(loads) else 1
+        terminalreporter.write_line(f'balance (least / most loaded per worker): {balance:.2f}')
+
+
+def pytest_addoption(parser):
+    """Add the --satellite-affinity option"""
+    parser.addoption(
+        '--satellite-affinity',
+        action='store_true',
+        default=False,
+        help='Assign the Satellites to the xdist workers and schedule the test modules '
+        'sharing fixtures on the same Satellite, balanced by their previous durations.',
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('satellite_affinity', False) and not hasattr(config, 'workerinput'):
+        config.pluginmanager.register(SatelliteAffinity(config), 'satellite_affinity_recorder')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Assign a Satellite to the worker, used by align_to_satellite"""
+    if not node.config.getoption('satellite_affinity', False):
+        return
+    worker_pos = int(node.gateway.id.replace('gw', ''))
+    node.workerinput['satellite_hostname'] = satellite_hostname(worker_pos)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('satellite_affinity', False):
+        return SatelliteAffinityScheduling(config, log)
@@ -1,9 +1,7 @@
-import inspect
-import re
-
 import pytest
 
 from robottelo.logging import collection_logger as logger
+from robottelo.utils import docstring_index
 
 IMPORTANCE_LEVELS = []
 
@@ -34,25 +32,6 @@ def pytest_configure(config):
         config.addinivalue_line("markers", marker)
 
 
-component_regex = re.compile(
-    # To match :CaseComponent: FooBar
-    r'\s*:CaseComponent:\s*(?P<component>\S*)',
-    re.IGNORECASE,
-)
-
-importance_regex = re.compile(
-    # To match :CaseImportance: Critical
-    r'\s*:CaseImportance:\s*(?P<importance>\S*)',
-    re.IGNORECASE,
-)
-
-assignee_regex = re.compile(
-    # To match :Assignee: jsmith
-    r'\s*:Assignee:\s*(?P<assignee>\S*)',
-    re.IGNORECASE,
-)
-
-
 @pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(session, items, config):
     """Add markers for testimony tokens"""
@@ -64,6 +43,7 @@ def pytest_collection_modifyitems(session, items, config):
 
     selected = []
     deselected = []
+    index = docstring_index.get_index(config)
     logger.info('Processing test items to add testimony token markers')
     for item in items:
         if item.nodeid.startswith('tests/robottelo/'):
@@ -72,24 +52,16 @@ def pytest_collection_modifyitems(session, items, config):
 
         # apply the marks for importance, component, and assignee
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
-        ]
         item_mark_names = [m.name for m in item.iter_markers()]
-        for docstring in item_docstrings:
+        for tokens in index.item_tokens(item):
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
-            if doc_component and 'component' not in item_mark_names:
-                item.add_marker(pytest.mark.component(doc_component[0]))
-            doc_importance = importance_regex.findall(docstring)
-            if doc_importance and 'importance' not in item_mark_names:
-                item.add_marker(pytest.mark.importance(doc_importance[0]))
-            doc_assignee = assignee_regex.findall(docstring)
-            if doc_assignee and 'assignee' not in item_mark_names:
-                item.add_marker(pytest.mark.assignee(doc_assignee[0]))
+            if tokens['component'] is not None and 'component' not in item_mark_names:
+                item.add_marker(pytest.mark.component(tokens['component']))
+            if tokens['importance'] is not None and 'importance' not in item_mark_names:
+                item.add_marker(pytest.mark.importance(tokens['importance']))
+            if tokens['assignee'] is not None and 'assignee' not in item_mark_names:
+                item.add_marker(pytest.mark.assignee(tokens['assignee']))
 
         # exit early if no filters were passed
         if importance or component or assignee:
@@ -129,3 +101,4 @@ def pytest_collection_modifyitems(session, items, config):
     # selected will be empty if no filter option was passed, defaulting to full items list
     items[:] = selected if deselected else items
     config.hook.pytest_deselected(items=deselected)
+    index.save()
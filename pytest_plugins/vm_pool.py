@@ -0,0 +1,12 @@
+"""Destroy the virtual machines left in the pool at the end of the session.
+
+The pool is filled by :meth:`robottelo.vm.VirtualMachine.create` when
+``clients.pool_size`` is set, see :class:`robottelo.vm.VMPool`. Its hit rate
+and boot times are logged before the virtual machines are destroyed.
+"""
+from robottelo.vm import vm_pool
+
+
+def pytest_sessionfinish(session):
+    """Shut down the virtual machines pool of this process"""
+    vm_pool.shutdown()
@@ -1,5 +1,7 @@
 """Generic base class for cli hammer commands."""
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from wait_for import wait_for
 
@@ -112,9 +114,13 @@ class Base:
         return result
 
     @classmethod
-    def create(cls, options=None, timeout=None):
+    def create(cls, options=None, timeout=None, fetch_info=False):
         """
         Creates a new record using the arguments passed via dictionary.
+
+        When ``performance.create_from_json`` is enabled, the create output is
+        requested as JSON. It only holds the id and the name of the new record,
+        which is fetched again with ``info`` if ``fetch_info`` is True.
         """
 
         cls.command_sub = 'create'
@@ -122,32 +128,27 @@ class Base:
         if options is None:
             options = {}
 
+        if settings.performance and settings.performance.create_from_json:
+            result = cls.execute(
+                cls._construct_command(options), output_format='json', timeout=timeout
+            )
+            if isinstance(result, list) and result and isinstance(result[0], dict):
+                result = result[0]
+            if not isinstance(result, dict):
+                # not a record, e.g. a message
+                return result
+            result = {key: value for key, value in result.items() if key != 'message'}
+            if fetch_info and 'id' in result:
+                new_obj = cls._info_after_create(result['id'], options)
+                if len(new_obj) > 0:
+                    result = new_obj
+            return result
+
         result = cls.execute(cls._construct_command(options), output_format='csv', timeout=timeout)
 
         # Extract new object ID if it was successfully created
         if len(result) > 0 and 'id' in result[0]:
-            obj_id = result[0]['id']
-
-            # Fetch new object
-            # Some Katello obj require the organization-id for subcommands
-            info_options = {'id': obj_id}
-            if cls.command_requires_org:
-                if 'organization-id' not in options:
-                    tmpl = 'organization-id option is required for {0}.create'
-                    raise CLIError(tmpl.format(cls.__name__))
-                info_options['organization-id'] = options['organization-id']
-
-            # organization creation can take some time
-            if cls.command_base == 'organization':
-                new_obj, _ = wait_for(
-                    lambda: cls.info(info_options),
-                    timeout=300,
-                    delay=5,
-                    silent_failure=True,
-                    handle_exception=True,
-                )
-            else:
-                new_obj = cls.info(info_options)
+            new_obj = cls._info_after_create(result[0]['id'], options)
 
             # stdout should be a dictionary containing the object
             if len(new_obj) > 0:
@@ -155,6 +156,30 @@ class Base:
 
         return result
 
+    @classmethod
+    def _info_after_create(cls, obj_id, options):
+        """Fetch the record with ``obj_id`` that was created using ``options``"""
+        # Some Katello obj require the organization-id for subcommands
+        info_options = {'id': obj_id}
+        if cls.command_requires_org:
+            if 'organization-id' not in options:
+                tmpl = 'organization-id option is required for {0}.create'
+                raise CLIError(tmpl.format(cls.__name__))
+            info_options['organization-id'] = options['organization-id']
+
+        # organization creation can take some time
+        if cls.command_base == 'organization':
+            new_obj, _ = wait_for(
+                lambda: cls.info(info_options),
+                timeout=300,
+                delay=5,
+                silent_failure=True,
+                handle_exception=True,
+            )
+        else:
+            new_obj = cls.info(info_options)
+        return new_obj
+
     @classmethod
     def delete(cls, options=None, timeout=None):
         """Deletes existing record."""
@@ -224,14 +249,84 @@ class Base:
         return_raw_response=None,
         connection_timeout=None,
     ):
-        """Executes the cli ``command`` on the server via ssh"""
+        """Executes the cli ``command`` on the server via ssh
+
+        When ``performance.hammer_backend`` is ``shell`` the command is sent to
+        a persistent ``hammer shell`` session, falling back to a one-shot
+        ``hammer`` process if the command could not be sent to the session.
+        """
+        # imported here as hammer_shell errors are CLI errors
+        from robottelo.cli import hammer_shell
+
         user, password = cls._get_username_password(user, password)
         time_hammer = False
+        hammer_backend = 'ssh'
         if settings.performance:
             time_hammer = settings.performance.time_hammer
+            hammer_backend = settings.performance.hammer_backend
+
+        start_time = time.time()
+        response = None
+        # the time measured by `time -p` is only available for one-shot commands
+        if hammer_backend == 'shell' and not time_hammer:
+            session = hammer_shell.get_session(
+                hostname or cls.hostname or settings.server.hostname,
+                user=user,
+                password=password,
+                locale=settings.locale,
+            )
+            try:
+                response = session.run(command, output_format=output_format, timeout=timeout)
+            except hammer_shell.HammerShellStartError as err:
+                cls.logger.warning(f'{err}, falling back to one-shot execution')
+            else:
+                hammer_shell.record_latency('shell', time.time() - start_time)
+        if response is None:
+            start_time = time.time()
+            response = cls._execute_one_shot(
+                command,
+                hostname=hostname,
+                user=user,
+                password=password,
+                output_format=output_format,
+                timeout=timeout,
+                time_hammer=time_hammer,
+                connection_timeout=connection_timeout,
+            )
+            hammer_shell.record_latency('ssh', time.time() - start_time)
+        if return_raw_response:
+            return response
+        else:
+            return cls._handle_response(response, ignore_stderr=ignore_stderr)
 
+    @classmethod
+    def _execute_one_shot(
+        cls,
+        command,
+        hostname=None,
+        user=None,
+        password=None,
+        output_format=None,
+        timeout=None,
+        time_hammer=False,
+        connection_timeout=None,
+    ):
+        """Executes the cli ``command`` in a new hammer process via ssh"""
+        cmd = cls._hammer_command(command, user, password, output_format, time_hammer)
+        response = ssh.command(
+            cmd.encode('utf-8'),
+            hostname=hostname or cls.hostname,
+            output_format=output_format,
+            timeout=timeout,
+            connection_timeout=connection_timeout,
+        )
+        return response
+
+    @classmethod
+    def _hammer_command(cls, command, user, password, output_format=None, time_hammer=False):
+        """Build the shell command running ``command`` with hammer"""
         # add time to measure hammer performance
-        cmd = 'LANG={} {} hammer -v {} {} {} {}'.format(
+        return 'LANG={} {} hammer -v {} {} {} {}'.format(
             settings.locale,
             'time -p' if time_hammer else '',
             f'-u {user}' if user else "--interactive no",
@@ -239,17 +334,49 @@ class Base:
             f'--output={output_format}' if output_format else "",
             command,
         )
-        response = ssh.command(
+
+    @classmethod
+    def execute_stream(
+        cls,
+        command,
+        hostname=None,
+        user=None,
+        password=None,
+        output_format='csv',
+        timeout=None,
+        ignore_stderr=None,
+        connection_timeout=None,
+    ):
+        """Executes the cli ``command`` on the server via ssh and lazily parse
+        its output.
+
+        The output lines are parsed as they are received, so the whole output
+        is never held in memory.
+
+        :return: generator of dicts, one for each row of the ``csv`` output
+            or each item of the ``json`` output.
+        :raises robottelo.cli.base.CLIReturnCodeError: once the output is
+            consumed, if the command failed.
+        """
+        if output_format not in ('csv', 'json'):
+            raise CLIError(f'output format {output_format} can not be streamed')
+        user, password = cls._get_username_password(user, password)
+        cmd = cls._hammer_command(command, user, password, output_format)
+        stream = ssh.command(
             cmd.encode('utf-8'),
             hostname=hostname or cls.hostname,
             output_format=output_format,
             timeout=timeout,
             connection_timeout=connection_timeout,
+            stream=True,
         )
-        if return_raw_response:
-            return response
-        else:
-            return cls._handle_response(response, ignore_stderr=ignore_stderr)
+        parse = hammer.parse_json_iter if output_format == 'json' else hammer.parse_csv_iter
+        return cls._parse_stream(stream, parse, ignore_stderr)
+
+    @classmethod
+    def _parse_stream(cls, stream, parse, ignore_stderr=None):
+        yield from parse(stream)
+        cls._handle_response(stream, ignore_stderr=ignore_stderr)
 
     @classmethod
     def exists(cls, options=None, search=None):
@@ -296,10 +423,12 @@ class Base:
         return result
 
     @classmethod
-    def list(cls, options=None, per_page=True, output_format='csv'):
+    def list(cls, options=None, per_page=True, output_format='csv', stream=False):
         """
         List information.
         @param options: ID (sometimes name works as well) to retrieve info.
+        @param stream: return a generator parsing the output lines as they are
+            received instead of a list, see ``execute_stream``.
         """
 
         cls.command_sub = 'list'
@@ -313,10 +442,68 @@ class Base:
         if cls.command_requires_org and 'organization-id' not in options:
             raise CLIError(f'organization-id option is required for {cls.__name__}.list')
 
+        if stream:
+            return cls.execute_stream(cls._construct_command(options), output_format=output_format)
+
         result = cls.execute(cls._construct_command(options), output_format=output_format)
 
         return result
 
+    @classmethod
+    def iter_list(cls, options=None, page_size=1000, output_format='csv', prefetch=False):
+        """Iterate over the listed entities requesting one page at a time.
+
+        Unlike ``list``, which requests every entity at once, the pages are
+        requested with ``--page`` and ``--per-page`` as the iteration goes, and
+        the iteration stops on the first page with less than ``page_size``
+        entities.
+
+        :param options: the ``list`` options, ``page`` is the first page to
+            request and defaults to 1.
+        :param page_size: the number of entities requested per page.
+        :param output_format: csv|json
+        :param prefetch: request the next page in a background thread while the
+            current one is consumed.
+        :return: a generator of the listed entities
+        """
+        options = dict(options or {})
+        if page_size < 1:
+            raise CLIError(f'page_size must be a positive integer, got {page_size}')
+        if cls.command_requires_org and 'organization-id' not in options:
+            raise CLIError(f'organization-id option is required for {cls.__name__}.iter_list')
+        options['per-page'] = page_size
+        first_page = int(options.pop('page', 1))
+        return cls._iter_pages(options, first_page, page_size, output_format, prefetch)
+
+    @classmethod
+    def _iter_pages(cls, options, page, page_size, output_format, prefetch):
+        def page_command(page):
+            # build the command in the caller thread, command_sub is shared
+            cls.command_sub = 'list'
+            return cls._construct_command({**options, 'page': page})
+
+        def fetch(command):
+            return cls.execute(command, output_format=output_format) or []
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            pending = executor.submit(fetch, page_command(page)) if prefetch else None
+            while True:
+                if prefetch:
+                    entities = pending.result()
+                else:
+                    entities = fetch(page_command(page))
+                last_page = len(entities) < page_size
+                if prefetch and not last_page:
+                    pending = executor.submit(fetch, page_command(page + 1))
+                yield from entities
+                if last_page:
+                    return
+                page += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
     @classmethod
     def puppetclasses(cls, options=None):
         """
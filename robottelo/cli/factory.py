@@ -6,6 +6,9 @@ import os
 import pprint
 import random
 import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
 from os import chmod
 from tempfile import mkstemp
 from time import sleep
@@ -107,6 +110,21 @@ class CLIFactoryError(Exception):
     """Indicates an error occurred while creating an entity using hammer"""
 
 
+class CLIFactoryBatchError(CLIFactoryError):
+    """Indicates one or more entities of a batch could not be created.
+
+    ``results`` holds, in input order, the created entity or the
+    :class:`CLIFactoryError` of each item, and ``errors`` holds the
+    ``(index, error)`` of each failed item, also in input order.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        details = '\n'.join(f'[{index}] {error}' for index, error in errors)
+        super().__init__(f'{len(errors)} of {len(results)} entities failed:\n{details}')
+
+
 def create_object(cli_object, options, values):
     """
     Creates <object> with dictionary of arguments.
@@ -160,6 +178,156 @@ def _entity_with_credentials(credentials, cli_entity_cls):
     return cli_entity_cls
 
 
+def _call_factory(make_fn, options):
+    """Run a factory in a worker process.
+
+    CLI errors can't always be pickled back to the parent process, so they are
+    returned as text.
+    """
+    try:
+        return True, make_fn(options)
+    except Exception as err:
+        return False, f'{type(err).__name__}: {err}'
+
+
+def make_entity_graph(specs, concurrency=4):
+    """Create entities concurrently, respecting the dependencies among them.
+
+    Each spec is a dict with the keys:
+
+    * ``factory``: a module level ``make_*`` function;
+    * ``options``: the options passed to the factory;
+    * ``requires``: optional, maps an option name to the index of the spec
+      whose entity provides it, either as an index (the ``id`` of the entity
+      is used) or as an ``(index, field)`` tuple.
+
+    An entity is created as soon as all the entities it requires exist, using
+    at most ``concurrency`` worker processes, so for example an organization,
+    its products and their repositories can be created with::
+
+        make_entity_graph([
+            {'factory': make_org, 'options': {}},
+            {'factory': make_product, 'options': {}, 'requires': {'organization-id': 0}},
+            {'factory': make_repository, 'options': {}, 'requires': {'product-id': 1}},
+        ])
+
+    Worker processes are forked so each one uses its own ssh connections and
+    the class attributes changed by ``Base`` commands are not shared.
+
+    :return: list of the created entities, in the same order as ``specs``
+    :raises CLIFactoryBatchError: if any entity could not be created. The
+        entities requiring a failed one are not created and fail as well.
+    """
+    specs = list(specs)
+    requires = []
+    for index, spec in enumerate(specs):
+        spec_requires = {}
+        for option, source in (spec.get('requires') or {}).items():
+            source_index, field = source if isinstance(source, tuple) else (source, 'id')
+            if not 0 <= source_index < len(specs) or source_index == index:
+                raise ValueError(f'Invalid requirement {source!r} for entity {index}')
+            spec_requires[option] = (source_index, field)
+        requires.append(spec_requires)
+
+    results = [None] * len(specs)
+    failed = {}
+    pending = set(range(len(specs)))
+    running = {}
+    with ProcessPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while pending or running:
+            for index in sorted(pending):
+                sources = {source for source, _ in requires[index].values()}
+                failed_sources = sorted(sources.intersection(failed))
+                if failed_sources:
+                    pending.discard(index)
+                    failed[index] = CLIFactoryError(
+                        f'Required entities {failed_sources} could not be created'
+                    )
+                elif all(results[source] is not None for source in sources):
+                    pending.discard(index)
+                    options = dict(specs[index].get('options') or {})
+                    for option, (source, field) in requires[index].items():
+                        options[option] = results[source][field]
+                    future = executor.submit(_call_factory, specs[index]['factory'], options)
+                    running[future] = index
+            if not running:
+                if pending:
+                    raise ValueError(f'Circular requirements among entities {sorted(pending)}')
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    created, result = future.result()
+                except Exception as err:
+                    created, result = False, f'{type(err).__name__}: {err}'
+                if created:
+                    results[index] = result
+                else:
+                    failed[index] = CLIFactoryError(result)
+
+    if failed:
+        errors = sorted(failed.items())
+        for index, error in errors:
+            results[index] = error
+        raise CLIFactoryBatchError(results, errors)
+    return results
+
+
+def make_many(make_fn, options_list, concurrency=4):
+    """Create several entities concurrently using the same factory.
+
+    :param make_fn: a module level ``make_*`` function
+    :param options_list: a list with the options of each entity
+    :param concurrency: the number of worker processes
+    :return: list of the created entities, in the same order as
+        ``options_list``
+    :raises CLIFactoryBatchError: if any entity could not be created
+    """
+    return make_entity_graph(
+        [{'factory': make_fn, 'options': options} for options in options_list],
+        concurrency=concurrency,
+    )
+
+
+def make_orgs(specs, concurrency=4):
+    """Create several organizations concurrently, see :func:`make_many`"""
+    return make_many(make_org, specs, concurrency=concurrency)
+
+
+def make_products(org_id, specs, concurrency=4):
+    """Create several products of an organization concurrently, see
+    :func:`make_many`
+    """
+    return make_many(
+        make_product,
+        [{**(spec or {}), 'organization-id': org_id} for spec in specs],
+        concurrency=concurrency,
+    )
+
+
+def make_repositories(product_id, specs, concurrency=4):
+    """Create several repositories of a product concurrently, see
+    :func:`make_many`
+    """
+    return make_many(
+        make_repository,
+        [{**(spec or {}), 'product-id': product_id} for spec in specs],
+        concurrency=concurrency,
+    )
+
+
+def make_activation_keys(org_id, specs, concurrency=4):
+    """Create several activation keys of an organization concurrently, see
+    :func:`make_many`
+    """
+    return make_many(
+        make_activation_key,
+        [{**(spec or {}), 'organization-id': org_id} for spec in specs],
+        concurrency=concurrency,
+    )
+
+
 @cacheable
 def make_activation_key(options=None):
     """Creates an Activation Key
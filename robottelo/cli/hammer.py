@@ -76,6 +76,65 @@ def parse_csv(output):
     return [dict(zip(keys, values)) for values in reader if len(values) > 0]
 
 
+def parse_csv_iter(lines):
+    """Lazily parse CSV output from Hammer CLI, yielding one dictionary per
+    row as soon as its line is available.
+
+    :param lines: any iterable of lines, e.g. a ``SSHCommandStream``
+    """
+    lines = iter(lines)
+    for header_line in lines:
+        # skip blank lines and the warning printed before the output
+        if header_line and not header_line.startswith(
+            'Puppet and OSTree will no longer be supported in Katello 3.16'
+        ):
+            break
+    else:
+        return
+    keys = [_normalize(header) for header in next(csv.reader([header_line]))]
+    for values in csv.reader(lines):
+        if len(values) > 0:
+            yield dict(zip(keys, values))
+
+
+def parse_json_iter(lines):
+    """Lazily parse JSON output from Hammer CLI, yielding each normalized item
+    of the top level list as soon as it is complete.
+
+    A top level object is yielded as a single item.
+
+    :param lines: any iterable of lines, e.g. a ``SSHCommandStream``
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    in_list = False
+    for line in lines:
+        buffer += line + '\n'
+        if not in_list:
+            stripped = buffer.lstrip()
+            if not stripped:
+                continue
+            if stripped.startswith('['):
+                in_list = True
+                buffer = stripped[1:]
+        # an item can only be complete on a line closing an object or a list
+        if not line.lstrip().startswith(('}', ']')):
+            continue
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if not buffer or buffer.startswith(']'):
+                break
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                break
+            yield _normalize_obj(item)
+            buffer = buffer[end:]
+    buffer = buffer.strip().lstrip(',').strip()
+    if buffer and buffer != ']':
+        raise ValueError(f'Incomplete JSON output: {buffer[:100]!r}')
+
+
 def parse_help(output):
     """Parse the help output from a hammer command and return a dictionary
     mapping the subcommands and options accepted by that command.
@@ -0,0 +1,236 @@
+"""Persistent ``hammer shell`` sessions used to run hammer commands without
+paying the ruby and hammer start up time on every command.
+
+Every command written to the shell is followed by two sync lines made of a
+random token. Hammer reports each sync line as an unknown command on stderr,
+the first one marks the end of the command output. The error of an unknown
+command spans several lines, which may arrive after the sync line itself: the
+lines between the two sync lines tell how many lines follow the second one,
+and they are all read so none is left for the next command. ``hammer shell``
+does not expose
+the return code of the commands it runs, so the return code is derived from
+stderr: any line that is not a warning makes the command fail with return
+code 1.
+
+When the session can not be started, the command is not sent and
+:class:`HammerShellStartError` is raised, the caller is expected to fall back
+to the one-shot execution. When the output can not be framed once the command
+was sent (timeout, closed channel, unexpected output) the session is closed
+and :class:`HammerShellError` is raised: the command may have run, so it must
+not be run again.
+"""
+import os
+import re
+import threading
+import time
+import uuid
+
+from robottelo import ssh
+from robottelo.cli.base import CLIError
+from robottelo.logging import logger
+
+SYNC_PREFIX = '__robottelo_sync_'
+PROMPT_REGEX = r'^(hammer> )+'
+WARNING_PREFIXES = ('warning:', 'deprecation warning:')
+RECV_SIZE = 32768
+
+
+class HammerShellError(CLIError):
+    """Raised when a hammer shell session is out of sync or not usable"""
+
+
+class HammerShellStartError(HammerShellError):
+    """Raised when a command could not be sent to a hammer shell session"""
+
+
+class HammerShell:
+    """A long-lived ``hammer shell`` process running on ``hostname``
+
+    :param hostname: the Satellite hostname
+    :param user: the hammer username
+    :param password: the hammer password
+    :param locale: the LANG used to run hammer
+    """
+
+    def __init__(self, hostname, user=None, password=None, locale=None):
+        self.hostname = hostname
+        self.user = user
+        self.password = password
+        self.locale = locale
+        self._client = None
+        self._channel = None
+        self._lock = threading.Lock()
+
+    def _shell_command(self):
+        # ruby buffers stdout when it is not a tty, force a flush of every write
+        # so the output of a command is available before the sync line is
+        return (
+            "LANG={} ruby -e 'STDOUT.sync = STDERR.sync = true; load ARGV.shift' "
+            '"$(command -v hammer)" -v {} {} shell'.format(
+                self.locale,
+                f'-u {self.user}' if self.user else '--interactive no',
+                f'-p {self.password}' if self.password else '',
+            )
+        )
+
+    @property
+    def is_alive(self):
+        return (
+            self._channel is not None
+            and not self._channel.closed
+            and not self._channel.exit_status_ready()
+        )
+
+    def start(self):
+        """Open the ssh channel and start ``hammer shell``"""
+        self._client = ssh.get_client(hostname=self.hostname)
+        self._channel = self._client.get_transport().open_session()
+        self._channel.exec_command(self._shell_command())
+        logger.debug(f'Started hammer shell session on {self.hostname}')
+
+    def close(self):
+        """Stop ``hammer shell`` and close the ssh connection"""
+        if self._channel is not None:
+            self._channel.close()
+            self._channel = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            logger.debug(f'Closed hammer shell session on {self.hostname}')
+
+    def _read_until_sync(self, token, timeout):
+        """Read the channel until the end of the error of the second sync line
+        of ``token`` on stderr
+
+        :return: a tuple with the stdout and stderr (up to the first sync line)
+        """
+        stdout = b''
+        stderr = b''
+        first_token, second_token = (f'{token}_{index}'.encode('utf-8') for index in (1, 2))
+        end_time = time.time() + timeout
+        while True:
+            # only complete lines, the last one may still be written
+            lines = stderr.splitlines(keepends=True)
+            lines = [line for line in lines if line.endswith(b'\n')]
+            first = next((index for index, line in enumerate(lines) if first_token in line), None)
+            second = next((index for index, line in enumerate(lines) if second_token in line), None)
+            if first is not None and second is not None:
+                error_size = second - first - 1
+                if len(lines) - second - 1 >= error_size:
+                    break
+            if time.time() > end_time:
+                raise HammerShellError(f'hammer shell did not respond in {timeout} seconds')
+            if self._channel.recv_ready():
+                stdout += self._channel.recv(RECV_SIZE)
+            elif self._channel.recv_stderr_ready():
+                stderr += self._channel.recv_stderr(RECV_SIZE)
+            elif self._channel.exit_status_ready():
+                raise HammerShellError('hammer shell exited unexpectedly')
+            else:
+                time.sleep(0.01)
+        # drain the stdout written before the sync lines were processed
+        while self._channel.recv_ready():
+            stdout += self._channel.recv(RECV_SIZE)
+        if len(stderr.splitlines()) > second + error_size + 1:
+            raise HammerShellError('hammer shell output is out of sync')
+        stderr = b''.join(lines[:first])
+        if SYNC_PREFIX.encode('utf-8') in stdout + stderr:
+            raise HammerShellError('hammer shell output is out of sync')
+        return stdout, stderr
+
+    def _discard_pending_output(self):
+        """Discard any output left by the previous command"""
+        while self._channel.recv_ready():
+            self._channel.recv(RECV_SIZE)
+        while self._channel.recv_stderr_ready():
+            self._channel.recv_stderr(RECV_SIZE)
+
+    @staticmethod
+    def _return_code(stderr):
+        for line in stderr.splitlines():
+            line = line.strip().lower()
+            if line and not line.startswith(WARNING_PREFIXES):
+                return 1
+        return 0
+
+    def run(self, command, output_format=None, timeout=None):
+        """Run a hammer command in the shell
+
+        :param command: the hammer command without the ``hammer`` prefix
+        :param output_format: base|json|csv|None
+        :param timeout: time to wait for the command output
+        :return: SSHCommandResult
+        :raises HammerShellStartError: when the command was not sent
+        :raises HammerShellError: when the command output can not be framed
+        """
+        if '\n' in command:
+            raise HammerShellStartError('multi-line commands can not run in hammer shell')
+        timeout = timeout or 300
+        token = f'{SYNC_PREFIX}{uuid.uuid4().hex}'
+        line = '{} {}'.format(f'--output={output_format}' if output_format else '', command)
+        with self._lock:
+            try:
+                if not self.is_alive:
+                    self.close()
+                    self.start()
+                self._discard_pending_output()
+            except Exception as err:
+                self.close()
+                raise HammerShellStartError(f'hammer shell is not usable: {err!r}') from err
+            logger.info('>>> (hammer shell) %s', line.strip())
+            try:
+                self._channel.sendall(f'{line.strip()}\n{token}_1\n{token}_2\n'.encode('utf-8'))
+                stdout, stderr = self._read_until_sync(token, timeout)
+            except Exception:
+                self.close()
+                raise
+        stdout = re.sub(PROMPT_REGEX, '', stdout.decode('utf-8'), flags=re.MULTILINE)
+        stderr = stderr.decode('utf-8')
+        return ssh.build_command_result(stdout, stderr, self._return_code(stderr), output_format)
+
+
+_sessions = {}
+_sessions_pid = os.getpid()
+_sessions_lock = threading.Lock()
+
+
+def get_session(hostname, user=None, password=None, locale=None):
+    """Return the hammer shell session of the current process for the given
+    hostname and credentials, creating it when needed.
+    """
+    global _sessions, _sessions_pid
+    key = (hostname, user, password, locale)
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # sessions inherited from the parent process belong to the parent
+            _sessions = {}
+            _sessions_pid = os.getpid()
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = HammerShell(hostname, user, password, locale)
+    return session
+
+
+def close_sessions():
+    """Close all the hammer shell sessions of the current process"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+_latency = {}
+
+
+def record_latency(backend, duration):
+    """Record the time a hammer command took to run with the given backend"""
+    count, total = _latency.get(backend, (0, 0.0))
+    _latency[backend] = (count + 1, total + duration)
+
+
+def latency_stats():
+    """Return the number of commands, total and mean time per backend"""
+    return {
+        backend: {'count': count, 'total': total, 'mean': total / count}
+        for backend, (count, total) in _latency.items()
+    }
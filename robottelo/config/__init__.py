@@ -27,27 +27,44 @@ dynaconf_settings = LazySettings(
     envless_mode=True,
     lowercase_read=True,
 )
-dynaconf_settings.validators.register(**dynaconf_validators)
+_validators_registered = False
 
-try:
-    legacy_settings.configure()
-except ImproperlyConfigured:
-    logger.warning(
-        "Legacy Robottelo settings configure() failed, most likely required "
-        "configuration option is not provided. Continuing for the sake of unit tests"
-    )
 
-try:
-    dynaconf_settings.validators.validate()
-except ValidationError:
-    logger.warning("Dynaconf validation failed, continuing for the sake of unit tests")
+def _configure_settings():
+    """Configure the settings providers, NailGun and AirGun.
+
+    Reading and validating the configuration files is deferred to the first
+    setting access, so importing this module is cheap for processes, like
+    xdist workers or scripts, that use few or no settings.
+    """
+    global _validators_registered
+    # the hook runs again after a failure, which must not add the validators twice
+    if not _validators_registered:
+        dynaconf_settings.validators.register(**dynaconf_validators)
+        _validators_registered = True
+
+    try:
+        legacy_settings.configure(lazy=True)
+    except ImproperlyConfigured:
+        logger.warning(
+            "Legacy Robottelo settings configure() failed, most likely required "
+            "configuration option is not provided. Continuing for the sake of unit tests"
+        )
+
+    try:
+        dynaconf_settings.validators.validate()
+    except ValidationError:
+        logger.warning("Dynaconf validation failed, continuing for the sake of unit tests")
+
+    settings.configure_nailgun()
+    settings.configure_airgun()
+
 
 settings_proxy = SettingsFacade()
 settings_proxy.set_configs(dynaconf_settings, legacy_settings)
+settings_proxy.on_first_access(_configure_settings)
 
 settings = SettingsNodeWrapper(settings_proxy)
-settings.configure_nailgun()
-settings.configure_airgun()
 
 
 def setting_is_set(option):
@@ -61,7 +78,7 @@ def setting_is_set(option):
     # Within the split world of Legacy settings and dynaconf, there is a limitation on validating
     # against the dynaconf settings within the scope of this method, and its use to skip tests.
     # With dynaconf 3.2, selective validation is available, and this is a perfect use for it.
-    # Otherwise dynaconf validation is done above when the instance is created
+    # Otherwise dynaconf validation is done above on the first settings access
     # Validation misses are allowed while the SettingsFacade still exists, because the opposite
     # configuration provider may have that field and will resolve.
     from dynaconf.utils.boxing import DynaBox
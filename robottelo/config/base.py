@@ -1,6 +1,7 @@
 """Define and instantiate the configuration class for Robottelo."""
 import importlib
 import os
+import threading
 from configparser import ConfigParser
 from configparser import NoOptionError
 from configparser import NoSectionError
@@ -13,6 +14,7 @@ from robottelo.config import casts
 from robottelo.constants import AZURERM_VALID_REGIONS
 from robottelo.constants import VALID_GCE_ZONES
 from robottelo.errors import ImproperlyConfigured
+from robottelo.logging import config_logger as logger
 
 
 SETTINGS_FILE_NAME = 'robottelo.properties'
@@ -245,11 +247,19 @@ class BugzillaSettings(FeatureSettings):
         super().__init__(*args, **kwargs)
         self.url = None
         self.api_key = None
+        self.chunk_size = None
+        self.workers = None
+        self.cache_file = None
+        self.cache_ttl = None
 
     def read(self, reader):
         """Read and validate Bugzilla server settings."""
         self.url = reader.get('bugzilla', 'url', 'https://bugzilla.redhat.com')
         self.api_key = reader.get('bugzilla', 'api_key', None)
+        self.chunk_size = reader.get('bugzilla', 'chunk_size', 200, int)
+        self.workers = reader.get('bugzilla', 'workers', 8, int)
+        self.cache_file = reader.get('bugzilla', 'cache_file', 'bz_data_cache.json')
+        self.cache_ttl = reader.get('bugzilla', 'cache_ttl', 3600, int)
 
     def validate(self):
         """This section is lazily validated on .issue_handlers.bugzilla."""
@@ -324,12 +334,16 @@ class ClientsSettings(FeatureSettings):
         self.image_dir = None
         self.provisioning_server = None
         self.distros = None
+        self.pool_size = None
+        self.ip_discovery = None
 
     def read(self, reader):
         """Read clients settings."""
         self.image_dir = reader.get('clients', 'image_dir')
         self.provisioning_server = reader.get('clients', 'provisioning_server')
         self.distros = [x.strip() for x in reader.get('clients', 'distros', "rhel7").split(",")]
+        self.pool_size = reader.get('clients', 'pool_size', 0, int)
+        self.ip_discovery = reader.get('clients', 'ip_discovery', 'poll')
 
     def validate(self):
         """Validate clients settings."""
@@ -551,6 +565,11 @@ class FakeManifestSettings(FeatureSettings):
         self.cert_url = None
         self.key_url = None
         self.url = None
+        self.cache_dir = None
+        self.download_timeout = None
+        self.pool_size = None
+        self.pool_workers = None
+        self.concurrent_uploads = None
 
     def read(self, reader):
         """Read fake manifest settings."""
@@ -562,11 +581,16 @@ class FakeManifestSettings(FeatureSettings):
         except ValueError:
             url['default'] = reader.get('fake_manifest', 'url')
         self.url = url
+        self.cache_dir = reader.get('fake_manifest', 'cache_dir', 'manifest_cache')
+        self.download_timeout = reader.get('fake_manifest', 'download_timeout', 60, int)
+        self.pool_size = reader.get('fake_manifest', 'pool_size', 5, int)
+        self.pool_workers = reader.get('fake_manifest', 'pool_workers', 2, int)
+        self.concurrent_uploads = reader.get('fake_manifest', 'concurrent_uploads', 2, int)
 
     def validate(self):
         """Validate fake manifest settings."""
         validation_errors = []
-        if not all(vars(self).values()):
+        if not all((self.cert_url, self.key_url, self.url)):
             validation_errors.append(
                 'All [fake_manifest] cert_url, key_url, url options must be provided.'
             )
@@ -994,6 +1018,8 @@ class PerformanceSettings(FeatureSettings):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.time_hammer = None
+        self.hammer_backend = None
+        self.create_from_json = None
         self.cdn_address = None
         self.virtual_machines = None
         self.fresh_install_savepoint = None
@@ -1006,6 +1032,8 @@ class PerformanceSettings(FeatureSettings):
     def read(self, reader):
         """Read performance settings."""
         self.time_hammer = reader.get('performance', 'time_hammer', False, bool)
+        self.hammer_backend = reader.get('performance', 'hammer_backend', 'ssh')
+        self.create_from_json = reader.get('performance', 'create_from_json', False, bool)
         self.cdn_address = reader.get('performance', 'cdn_address')
         self.virtual_machines = reader.get('performance', 'virtual_machines', cast=list)
         self.fresh_install_savepoint = reader.get('performance', 'fresh_install_savepoint')
@@ -1036,6 +1064,9 @@ class SSHClientSettings(FeatureSettings):
         super().__init__(*args, **kwargs)
         self._command_timeout = None
         self._connection_timeout = None
+        self._pool_size = None
+        self._pool_idle_timeout = None
+        self._keepalive_interval = None
 
     @property
     def command_timeout(self):
@@ -1045,12 +1076,31 @@ class SSHClientSettings(FeatureSettings):
     def connection_timeout(self):
         return self._connection_timeout if (self._connection_timeout is not None) else 10
 
+    @property
+    def pool_size(self):
+        return self._pool_size if (self._pool_size is not None) else 4
+
+    @property
+    def pool_idle_timeout(self):
+        return self._pool_idle_timeout if (self._pool_idle_timeout is not None) else 300
+
+    @property
+    def keepalive_interval(self):
+        return self._keepalive_interval if (self._keepalive_interval is not None) else 30
+
     def read(self, reader):
         """Read SSHClient settings."""
         self._command_timeout = reader.get('ssh_client', 'command_timeout', default=300, cast=int)
         self._connection_timeout = reader.get(
             'ssh_client', 'connection_timeout', default=10, cast=int
         )
+        self._pool_size = reader.get('ssh_client', 'pool_size', default=4, cast=int)
+        self._pool_idle_timeout = reader.get(
+            'ssh_client', 'pool_idle_timeout', default=300, cast=int
+        )
+        self._keepalive_interval = reader.get(
+            'ssh_client', 'keepalive_interval', default=30, cast=int
+        )
 
     def validate(self):
         """Validate SSHClient settings."""
@@ -1293,6 +1343,9 @@ class ReportPortalSettings(FeatureSettings):
         self.rp_project = None
         self.rp_key = None
         self.fail_threshold = None
+        self.page_size = None
+        self.workers = None
+        self.cache_dir = None
 
     def read(self, reader):
         """Read Report portal settings."""
@@ -1300,6 +1353,9 @@ class ReportPortalSettings(FeatureSettings):
         self.rp_project = reader.get('report_portal', 'project')
         self.rp_key = reader.get('report_portal', 'api_key')
         self.fail_threshold = reader.get('report_portal', 'fail_threshold', 20, int)
+        self.page_size = reader.get('report_portal', 'page_size', 300, int)
+        self.workers = reader.get('report_portal', 'workers', 8, int)
+        self.cache_dir = reader.get('report_portal', 'cache_dir', 'rp_launch_cache')
 
     def validate(self):
         """Validate Report portal settings."""
@@ -1315,6 +1371,9 @@ class Settings:
     """Robottelo's settings representation."""
 
     def __init__(self):
+        # feature settings left unread by a lazy configure, by name
+        self._unread_features = {}
+        self._read_lock = threading.Lock()
         self._all_features = None
         self._configured = False
         self._validation_errors = []
@@ -1338,6 +1397,10 @@ class Settings:
         self.swid_tools_repo = None
         self.screenshots_path = None
         self.tmp_dir = None
+        self.download_cache_dir = None
+        self.download_cache_size = None
+        self.remote_download_cache_dir = None
+        self.remote_download_cache_size = None
         self.artifacts_server = None
         self.saucelabs_key = None
         self.saucelabs_user = None
@@ -1385,11 +1448,28 @@ class Settings:
         self.report_portal = ReportPortalSettings()
         self.http_proxy = HttpProxySettings()
 
-    def configure(self, settings_path=None):
+    def __getattr__(self, name):
+        # only called for the features removed from the instance attributes
+        # until they are read, so reading the other settings costs nothing
+        unread_features = self.__dict__.get('_unread_features')
+        if not unread_features or name not in unread_features:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        with self._read_lock:
+            if name in unread_features:
+                self._read_feature(name, unread_features[name])
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return [*super().__dir__(), *self._unread_features]
+
+    def configure(self, settings_path=None, lazy=False):
         """Read the settings file and parse the configuration.
 
         :param str settings_path: path to settings file to read. If None, looks in the project
             root for a file named 'robottelo.properties'.
+        :param bool lazy: only read Robottelo's general settings, every feature
+            settings section is read and validated the first time it is
+            accessed.
 
         :raises: ImproperlyConfigured if any issue is found during the parsing
             or validation of the configuration.
@@ -1415,6 +1495,10 @@ class Settings:
         feature_settings = filter(lambda tpl: isinstance(tpl[1], FeatureSettings), attrs)
         for name, settings in feature_settings:
             if self.reader.has_section(name) or name == 'server':
+                if lazy:
+                    self._unread_features[name] = settings
+                    delattr(self, name)
+                    continue
                 settings.read(self.reader)
                 self._validation_errors.extend(settings.validate())
 
@@ -1425,6 +1509,22 @@ class Settings:
             )
         self._configured = True
 
+    def _read_feature(self, name, settings):
+        """Read and validate a feature settings section left unread by a lazy
+        ``configure``. Validation errors are logged as the sections are read
+        while the settings are in use.
+        """
+        settings.read(self.reader)
+        setattr(self, name, settings)
+        del self._unread_features[name]
+        validation_errors = settings.validate()
+        if validation_errors:
+            self._validation_errors.extend(validation_errors)
+            logger.warning(
+                f'Failed to validate the [{name}] configuration, check the message(s):\n'
+                + '\n'.join(validation_errors)
+            )
+
     def _read_robottelo_settings(self):
         """Read Robottelo's general settings."""
         self.log_driver_commands = self.reader.get(
@@ -1462,6 +1562,16 @@ class Settings:
             'robottelo', 'screenshots_path', '/tmp/robottelo/screenshots'
         )
         self.tmp_dir = self.reader.get('robottelo', 'tmp_dir', '/var/tmp')
+        self.download_cache_dir = self.reader.get(
+            'robottelo', 'download_cache_dir', 'download_cache'
+        )
+        self.download_cache_size = self.reader.get('robottelo', 'download_cache_size', 2048, int)
+        self.remote_download_cache_dir = self.reader.get(
+            'robottelo', 'remote_download_cache_dir', '/var/cache/robottelo/downloads'
+        )
+        self.remote_download_cache_size = self.reader.get(
+            'robottelo', 'remote_download_cache_size', 1024, int
+        )
         self.artifacts_server = self.reader.get('robottelo', 'artifacts_server', None)
         self.run_one_datapoint = self.reader.get('robottelo', 'run_one_datapoint', False, bool)
         self.upstream = self.reader.get('robottelo', 'upstream', True, bool)
@@ -1521,8 +1631,9 @@ class Settings:
     def all_features(self):
         """List all expected feature settings sections."""
         if self._all_features is None:
+            features = {**vars(self), **self._unread_features}
             self._all_features = [
-                name for name, value in vars(self).items() if isinstance(value, FeatureSettings)
+                name for name, value in features.items() if isinstance(value, FeatureSettings)
             ]
         return self._all_features
 
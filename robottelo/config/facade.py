@@ -1,4 +1,5 @@
 import os
+import threading
 from functools import reduce
 from urllib.parse import urljoin
 from urllib.parse import urlunsplit
@@ -36,6 +37,8 @@ WRAPPER_EXCEPTIONS = (
     'azurerm.tenant_id',
     'azurerm.username',
     'clients.provisioning_server',
+    'clients.pool_size',
+    'clients.ip_discovery',
     'compute_resources.libvirt_hostname',
     'container_repo.registries.redhat.url',
     'container_repo.registries.redhat.username',
@@ -50,6 +53,11 @@ WRAPPER_EXCEPTIONS = (
     'docker.private_registry_url',
     'docker.private_registry_username',
     'fake_capsules.port_range',
+    'fake_manifest.cache_dir',
+    'fake_manifest.download_timeout',
+    'fake_manifest.pool_size',
+    'fake_manifest.pool_workers',
+    'fake_manifest.concurrent_uploads',
     'gce.cert_path',
     'gce.cert_path',
     'gce.cert_url',
@@ -82,6 +90,9 @@ WRAPPER_EXCEPTIONS = (
     'open_ldap.hostname',
     'open_ldap.group_base_dn',
     'open_ldap.open_ldap_user',
+    'report_portal.page_size',
+    'report_portal.workers',
+    'report_portal.cache_dir',
     'rhel7_os',
     'rhel8_os',
     'rhsso.rhsso_user',
@@ -102,12 +113,20 @@ WRAPPER_EXCEPTIONS = (
     'azurerm.azure_subnet',
     'bugzilla.url',
     'bugzilla.api_key',
+    'bugzilla.chunk_size',
+    'bugzilla.workers',
+    'bugzilla.cache_file',
+    'bugzilla.cache_ttl',
     'distro.image_el6',
     'distro.image_el7',
     'distro.image_el8',
     'distro.image_sles11',
     'distro.image_sles12',
     'fake_capsules.port_range',
+    'robottelo.download_cache_dir',
+    'robottelo.download_cache_size',
+    'robottelo.remote_download_cache_dir',
+    'robottelo.remote_download_cache_size',
     'shared_function.storage',
     'shared_function.scope',
     'shared_function.enabled',
@@ -119,6 +138,8 @@ WRAPPER_EXCEPTIONS = (
     'shared_function.redis_password',
     'shared_function.call_retries',
 )
+_wrapper_exceptions = frozenset(WRAPPER_EXCEPTIONS)
+_logged_exceptions = set()
 
 
 class SettingsNodeWrapper(CallableObjectProxy):
@@ -134,10 +155,12 @@ class SettingsNodeWrapper(CallableObjectProxy):
         if self._self_full_path:
             new_path = f"{self._self_full_path}.{name}"
         config_value = self._self_config_provider.get(new_path)
-        if new_path in WRAPPER_EXCEPTIONS:
-            logger.debug(
-                f"Found '{new_path}' in exceptions list - will not wrap in SettingsNodeWrapper"
-            )
+        if new_path in _wrapper_exceptions:
+            if new_path not in _logged_exceptions:
+                _logged_exceptions.add(new_path)
+                logger.debug(
+                    f"Found '{new_path}' in exceptions list - will not wrap in SettingsNodeWrapper"
+                )
             return config_value
         return SettingsNodeWrapper(config_value, self._self_config_provider, new_path)
 
@@ -219,11 +242,63 @@ class SettingsNodeWrapper(CallableObjectProxy):
 
 class SettingsFacade:
     _cache = {}
+    _missing = set()
+    _key_index = {}
     _configs = []
+    _dispatch_table = None
+    _setup_hooks = []
+    _setup_hooks_lock = threading.RLock()
+    _running_setup_hooks = False
 
     @classmethod
     def set_configs(cls, *configs):
         cls._configs = configs
+        cls.invalidate()
+
+    @classmethod
+    def on_first_access(cls, hook):
+        """Register a function to be called once, before the first setting
+        value is read from the configuration providers.
+        """
+        cls._setup_hooks.append(hook)
+
+    @classmethod
+    def _run_setup_hooks(cls):
+        """Run the setup hooks once, the other threads reading a setting wait
+        for them. A hook is kept to run again on the next access if it fails.
+        """
+        with cls._setup_hooks_lock:
+            if cls._running_setup_hooks:
+                # a hook is reading the settings
+                return
+            cls._running_setup_hooks = True
+            try:
+                while cls._setup_hooks:
+                    cls._setup_hooks[0]()
+                    cls._setup_hooks.pop(0)
+            finally:
+                cls._running_setup_hooks = False
+
+    @classmethod
+    def invalidate(cls, key=None):
+        """Drop cached setting values so they are read again from the
+        configuration providers on the next access.
+
+        :param key: the setting to invalidate, e.g. ``server.hostname``, the
+            settings below it are invalidated too. When not set every cached
+            value is dropped.
+        """
+        if key is None:
+            cls._cache.clear()
+            cls._missing.clear()
+            cls._key_index.clear()
+            return
+        prefix = f'{key}.'
+        for cached_key in [k for k in cls._cache if k == key or k.startswith(prefix)]:
+            del cls._cache[cached_key]
+        cls._missing.difference_update(
+            [k for k in cls._missing if k == key or k.startswith(prefix)]
+        )
 
     @classmethod
     def _from_cache(cls, key):
@@ -371,62 +446,63 @@ class SettingsFacade:
         port_range = cast_port_range(port_range)
         return port_range
 
+    def _computed_values(self):
+        """Return the dispatch table of the computed settings, built once per
+        instance, mapping every key to a function computing its value.
+        """
+        if self._dispatch_table is not None:
+            return self._dispatch_table
+        self._dispatch_table = {
+            "configure": lambda: self._cached_function(lambda: None),
+            "verbosity": self._robottelo_verbosity,
+            "server.get_credentials": lambda: self._cached_function(self.__server_get_credentials),
+            "server.get_url": lambda: self.__server_get_url,
+            "server.get_pub_url": lambda: self.__server_get_pub_url,
+            "server.get_cert_rpm_url": lambda: self.__server_get_cert_rpm_url,
+            "server.get_hostname": lambda: self.__server_get_hostname,
+            "server.version": self.__server_version,
+            "capsule.hostname": self.__capsule_hostname,
+            "ssh_client.command_timeout": self.__ssh_client_command_timeout,
+            "ssh_client.connection_timeout": self.__ssh_client_connection_timeout,
+            "fake_capsules.port_range": self._fake_capsules_port_range,
+            "configured": lambda: True,
+            "all_features": self.__all_features,
+        }
+        return self._dispatch_table
+
     def _dispatch_computed_value(self, key):
-        if key == "configure":
-            value = self._cached_function(lambda: None)
-        elif key == "verbosity":
-            value = self._robottelo_verbosity()
-        elif key == "server.get_credentials":
-            value = self._cached_function(self.__server_get_credentials)
-        elif key == "server.get_url":
-            value = self.__server_get_url
-        elif key == "server.get_pub_url":
-            value = self.__server_get_pub_url
-        elif key == "server.get_cert_rpm_url":
-            value = self.__server_get_cert_rpm_url
-        elif key == 'server.get_hostname':
-            value = self.__server_get_hostname
-        elif key == "server.version":
-            value = self.__server_version()
-        elif key == "capsule.hostname":
-            value = self.__capsule_hostname()
-        elif key == "ssh_client.command_timeout":
-            value = self.__ssh_client_command_timeout()
-        elif key == "ssh_client.connection_timeout":
-            value = self.__ssh_client_connection_timeout()
-        elif key == "fake_capsules.port_range":
-            value = self._fake_capsules_port_range()
-        elif key == "configured":
-            value = True
-        elif key == "all_features":
-            value = self.__all_features()
-        else:
-            raise KeyError()
+        compute = self._computed_values().get(key)
+        if compute is None:
+            raise KeyError(key)
+        value = compute()
         self._add_to_cache(key, value)
         return value
 
+    @classmethod
+    def _section_keys(cls, section):
+        """Return the lowercased keys of a dynaconf settings section, read
+        once until the next ``invalidate``.
+        """
+        try:
+            return cls._key_index[section]
+        except KeyError:
+            pass
+        if cls._configs and hasattr(cls._configs[0], section):
+            keys = frozenset(
+                setting.lower() for setting in getattr(cls._configs[0], section).keys()
+            )
+        else:
+            keys = frozenset()
+        cls._key_index[section] = keys
+        return keys
+
     # TO DO: Should be removed when LegacySettings are removed
     def _dispatch_robottelo_value(self, key):
         """Returns robottelo setting with dynaconf object in stead of dynaconf.robottelo object
 
         e.g `self.verbosity` instead of `self.robottelo.verbosity`
         """
-        if hasattr(self._configs[0], 'robottelo'):
-            robottelo_keys = [setting.lower() for setting in self._configs[0].robottelo.keys()]
-            top_key = key.split('.')[0]
-            if top_key in robottelo_keys:
-                try:
-                    # From DynaConf
-                    value = self.get(f'robottelo.{key}')
-                except KeyError:
-                    # From Legacy Setting
-                    value = self.get(key)
-            else:
-                raise KeyError()
-            self._add_to_cache(key, value)
-            return value
-        else:
-            raise KeyError()
+        return self._dispatch_section_value('robottelo', key)
 
     # TO DO: Should be removed when LegacySettings are removed
     def _dispatch_repos_value(self, key):
@@ -434,24 +510,23 @@ class SettingsFacade:
 
         e.g `self.capsule_repo` instead of `self.repos.capsule_repo`
         """
-        if hasattr(self._configs[0], 'repos'):
-            repos_keys = [setting.lower() for setting in self._configs[0].repos.keys()]
-            top_key = key.split('.')[0]
-            if top_key in repos_keys:
-                try:
-                    # From DynaConf
-                    value = self.get(f'repos.{key}')
-                except KeyError:
-                    # From Legacy Setting
-                    value = self.get(key)
-            else:
-                raise KeyError()
-            self._add_to_cache(key, value)
-            return value
-        else:
-            raise KeyError()
+        return self._dispatch_section_value('repos', key)
+
+    def _dispatch_section_value(self, section, key):
+        if key.split('.', 1)[0] not in self._section_keys(section):
+            raise KeyError(key)
+        try:
+            # From DynaConf
+            value = self.get(f'{section}.{key}')
+        except KeyError:
+            # From Legacy Setting
+            value = self.get(key)
+        self._add_to_cache(key, value)
+        return value
 
     def _get_from_configs(self, key):
+        if key in self._missing:
+            raise AttributeError(f"None of configuration providers has attribute '{key}'")
         for config_provider in self._configs:
             try:
                 real_value = reduce(getattr, key.split('.'), config_provider)
@@ -464,6 +539,7 @@ class SettingsFacade:
         else:
             if not key.startswith('_'):
                 logger.debug(f"failed to find '{key}' in configuration")
+            self._missing.add(key)
             msg = f"None of configuration providers has attribute '{key}'"
             raise AttributeError(msg)
         self._add_to_cache(key, real_value)
@@ -471,34 +547,36 @@ class SettingsFacade:
 
     def get(self, full_path):
         try:
-            return self._from_cache(full_path)
+            return self._cache[full_path]
         except KeyError:
             pass
 
-        try:
+        if self._setup_hooks:
+            self._run_setup_hooks()
+            if full_path in self._cache:
+                return self._cache[full_path]
+
+        if full_path in self._computed_values():
             return self._dispatch_computed_value(full_path)
-        except KeyError:
-            pass
 
-        try:
+        top_key = full_path.split('.', 1)[0]
+        if top_key in self._section_keys('robottelo'):
             return self._dispatch_robottelo_value(full_path)
-        except KeyError:
-            pass
-
-        try:
+        if top_key in self._section_keys('repos'):
             return self._dispatch_repos_value(full_path)
-        except KeyError:
-            pass
 
         value = self._get_from_configs(full_path)
         return value
 
     def __dir__(self):
+        if self._setup_hooks:
+            self._run_setup_hooks()
         all_keys = []
         for config in self._configs:
             try:
                 keys = config.keys()
             except AttributeError:
-                keys = config.__dict__.keys()
+                # with the legacy feature settings not read yet
+                keys = [*config.__dict__, *getattr(config, '_unread_features', ())]
             all_keys.extend(keys)
         return tuple(all_keys)
@@ -49,6 +49,10 @@ validators = dict(
     bugzilla=[
         Validator("bugzilla.url", default='https://bugzilla.redhat.com'),
         Validator("bugzilla.api_key", must_exist=True),
+        Validator("bugzilla.chunk_size", default=200, gt=0),
+        Validator("bugzilla.workers", default=8, gt=0),
+        Validator("bugzilla.cache_file", default='bz_data_cache.json'),
+        Validator("bugzilla.cache_ttl", default=3600, gte=0),
     ],
     capsule=[
         Validator("capsule.instance_name", must_exist=True),
@@ -65,7 +69,11 @@ validators = dict(
             must_exist=True,
         )
     ],
-    clients=[Validator("clients.provisioning_server")],
+    clients=[
+        Validator("clients.provisioning_server"),
+        Validator("clients.pool_size", default=0, gte=0),
+        Validator("clients.ip_discovery", default='poll', is_in=('poll', 'watch')),
+    ],
     compute_resources=[
         Validator("compute_resources.libvirt_hostname", must_exist=True),
         Validator("compute_resources.libvirt_image_dir", default='/var/lib/libvirt/images'),
@@ -118,6 +126,11 @@ validators = dict(
         Validator(
             'fake_manifest.cert_url', 'fake_manifest.key_url', 'fake_manifest.url', must_exist=True
         ),
+        Validator('fake_manifest.cache_dir', default='manifest_cache'),
+        Validator('fake_manifest.download_timeout', default=60, gt=0),
+        Validator('fake_manifest.pool_size', default=5, gte=0),
+        Validator('fake_manifest.pool_workers', default=2, gt=0),
+        Validator('fake_manifest.concurrent_uploads', default=2, gt=0),
     ],
     gce=[
         Validator(
@@ -203,7 +216,11 @@ validators = dict(
             must_exist=True,
         )
     ],
-    performance=[Validator("performance.time_hammer", default=False)],
+    performance=[
+        Validator("performance.time_hammer", default=False),
+        Validator("performance.hammer_backend", default='ssh', is_in=['ssh', 'shell']),
+        Validator("performance.create_from_json", default=False, is_type_of=bool),
+    ],
     report_portal=[
         Validator(
             "report_portal.portal_url",
@@ -212,6 +229,9 @@ validators = dict(
             must_exist=True,
         ),
         Validator("report_portal.fail_threshold", default=20),
+        Validator("report_portal.page_size", default=300, gt=0),
+        Validator("report_portal.workers", default=8, gt=0),
+        Validator("report_portal.cache_dir", default='rp_launch_cache'),
     ],
     repos=[
         Validator(
@@ -265,6 +285,12 @@ validators = dict(
             must_exist=True,
         )
     ],
+    robottelo=[
+        Validator('robottelo.download_cache_dir', default='download_cache'),
+        Validator('robottelo.download_cache_size', default=2048, gt=0),
+        Validator('robottelo.remote_download_cache_dir', default='/var/cache/robottelo/downloads'),
+        Validator('robottelo.remote_download_cache_size', default=1024, gt=0),
+    ],
     shared_function=[
         Validator("shared_function.storage", is_in=("file", "redis"), default='file'),
         Validator("shared_function.share_timeout", lte=86400, default=86400),
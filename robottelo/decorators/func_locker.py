@@ -1,4 +1,4 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using fcntl file locking
 
 Usage::
 
@@ -45,10 +45,9 @@ import os
 import tempfile
 from contextlib import contextmanager
 
-from pytest_services.locks import file_lock
-
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils.file_lock import file_lock
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_LOCK_DIR = 'lock_functions'
@@ -59,6 +58,10 @@ LOCK_DEFAULT_SCOPE = None
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+# the lock file paths locked by this process, and the id of the process
+# holding them, as forked processes inherit this mapping
+_locked_paths = {}
+
 
 class FunctionLockerError(Exception):
     """the default function locker error"""
@@ -161,27 +164,18 @@ def _get_function_name_lock_path(function_name, scope=None, scope_kwargs=None, s
 
 
 def _check_deadlock(lock_file_path, process_id):
-    """To prevent process deadlock, raise exception if the file content is the
-    same as process_id
+    """To prevent process deadlock, raise exception if the file is already
+    locked by process_id
 
     note: this function is called before the lock
 
     :type lock_file_path: str
     :type process_id: str
     """
-    if os.path.exists(lock_file_path):
-        try:
-            lock_file_handler = open(lock_file_path)
-            lock_file_content = lock_file_handler.read()
-        except OSError as exp:
-            # do nothing, but anyway log the exception
-            logger.exception(exp)
-            lock_file_content = None
-
-        if lock_file_content and lock_file_content == process_id:
-            raise FunctionLockerError(
-                'recursion detected: the function file already locked by the same process'
-            )
+    if _locked_paths.get(lock_file_path) == process_id:
+        raise FunctionLockerError(
+            'recursion detected: the function file already locked by the same process'
+        )
 
 
 def _write_content(handler, content):
@@ -193,6 +187,28 @@ def _write_content(handler, content):
     handler.flush()
 
 
+@contextmanager
+def _lock_file(lock_file_path, name, timeout):
+    """Lock the file at lock_file_path, writing the id of the locking process
+    in the file while locked
+    """
+    process_id = str(os.getpid())
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    _check_deadlock(lock_file_path, process_id)
+
+    with file_lock(lock_file_path, timeout=timeout, name=name) as handler:
+        _locked_paths[lock_file_path] = process_id
+        # write the process id that locked this function
+        _write_content(handler, process_id)
+        try:
+            yield handler
+        finally:
+            # clear the file
+            _write_content(handler, None)
+            del _locked_paths[lock_file_path]
+
+
 def lock_function(
     function=None,
     scope=_get_default_scope,
@@ -239,25 +255,14 @@ def lock_function(
             lock_file_path = _get_function_name_lock_path(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
-            process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _lock_file(lock_file_path, function_name, timeout):
                 logger.info(
                     'process id: {} lock function using file path: {}'.format(
-                        process_id, lock_file_path
+                        os.getpid(), lock_file_path
                     )
                 )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
                 # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
+                res = func(*args, **kwargs)
 
             return res
 
@@ -303,22 +308,11 @@ def locking_function(
     lock_file_path = _get_function_name_lock_path(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
-    process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
-
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _lock_file(lock_file_path, function_name, timeout) as handler:
         logger.info(
             'process id: {} - lock function name:{}  - using file path: {}'.format(
-                process_id, function_name, lock_file_path
+                os.getpid(), function_name, lock_file_path
             )
         )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
         # let the locked code run
-        try:
-            yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+        yield handler
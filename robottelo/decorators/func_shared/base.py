@@ -1,3 +1,4 @@
+import contextlib
 import json
 
 
@@ -18,10 +19,21 @@ class BaseStorageHandler:
         """called when the lock is acquired to do some added action"""
         raise NotImplementedError
 
+    @contextlib.contextmanager
+    def claim(self, key):
+        """Return a context manager holding the key lock and yielding the key
+        value, None when the value is missing and must be written before exit
+        """
+        with self.lock(key) as data:
+            self.when_lock_acquired(data)
+            yield self.get(key)
+
     def get(self, key):
         """Return the key value"""
         raise NotImplementedError
 
-    def set(self, key, value):
-        """Write the value of key to storage"""
+    def set(self, key, value, timeout=None):
+        """Write the value of key to storage, expiring after timeout seconds
+        when the storage supports it
+        """
         raise NotImplementedError
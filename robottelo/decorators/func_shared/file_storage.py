@@ -1,10 +1,9 @@
 import os
 import tempfile
 
-from pytest_services.locks import file_lock
-
 from robottelo.config import settings
 from robottelo.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.file_lock import file_lock
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_SHARED_DIR = 'shared_functions'
@@ -65,7 +64,7 @@ class FileStorageHandler(BaseStorageHandler):
     def lock(self, key):
         """Return the storage locker context manager"""
         lock_key = f'{key}.lock'
-        return file_lock(self.get_key_file_path(lock_key), remove=False, timeout=self._lock_timeout)
+        return file_lock(self.get_key_file_path(lock_key), timeout=self._lock_timeout, name=key)
 
     def when_lock_acquired(self, handler):
         """Write the process id to file handler"""
@@ -88,11 +87,12 @@ class FileStorageHandler(BaseStorageHandler):
             value = self.decode(value)
         return value
 
-    def set(self, key, value):
-        """Write the value of key
+    def set(self, key, value, timeout=None):
+        """Write the value of key, the expiry timeout is not supported
 
         :type key: str
         :type value: object
+        :type timeout: int
         """
         value = self.encode(value)
         key_file_path = self.get_key_file_path(key)
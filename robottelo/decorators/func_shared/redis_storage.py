@@ -1,3 +1,9 @@
+import contextlib
+import json
+import time
+import uuid
+import zlib
+
 try:
     import redis
 except ImportError:
@@ -10,10 +16,50 @@ REDIS_PORT = 6379
 REDIS_DB = 0
 REDIS_PASSWORD = None
 LOCK_TIMEOUT = 7200
+# waiters re-check the key at this interval, in case the claiming process died
+WAIT_POLL_INTERVAL = 10
+
+# Return the key value if any, else claim the key computation by setting the
+# lock key: 1 when claimed, 0 when an other process holds the claim
+GET_OR_CLAIM_SCRIPT = '''
+local value = redis.call('GET', KEYS[1])
+if value then
+    return value
+end
+if redis.call('SET', KEYS[2], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+'''
+
+# Release the claim if still owned and wake up the waiting processes
+RELEASE_SCRIPT = '''
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+return redis.call('PUBLISH', ARGV[2], 'ready')
+'''
+
+_connection_pools = {}
+
+
+def _get_connection_pool(host, port, db, password):
+    """Return the connection pool shared by the handlers of a redis server"""
+    pool_key = (host, port, db, password)
+    if pool_key not in _connection_pools:
+        _connection_pools[pool_key] = redis.ConnectionPool(
+            host=host, port=port, db=db, password=password
+        )
+    return _connection_pools[pool_key]
 
 
 class RedisStorageHandler(BaseStorageHandler):
-    """Redis Key value storage handler"""
+    """Redis Key value storage handler
+
+    Values are stored zlib compressed with a server side expiry. A value is
+    read or its computation claimed in one round-trip, the processes waiting
+    for an other one to compute the value are notified with redis pub/sub.
+    """
 
     def __init__(
         self,
@@ -25,12 +71,29 @@ class RedisStorageHandler(BaseStorageHandler):
     ):
 
         self._lock_timeout = lock_timeout
-        self._client = redis.StrictRedis(host=host, port=port, db=db, password=password)
+        self._client = redis.StrictRedis(
+            connection_pool=_get_connection_pool(host, port, db, password)
+        )
+        self._get_or_claim = self._client.register_script(GET_OR_CLAIM_SCRIPT)
+        self._release = self._client.register_script(RELEASE_SCRIPT)
 
     @property
     def client(self):
         return self._client
 
+    @staticmethod
+    def encode(data):
+        return zlib.compress(json.dumps(data).encode('utf-8'))
+
+    @staticmethod
+    def decode(data):
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            # value stored uncompressed
+            pass
+        return json.loads(data)
+
     def lock(self, key, timeout=None):
         """Return the storage locker context manager"""
         if timeout is None:
@@ -44,6 +107,48 @@ class RedisStorageHandler(BaseStorageHandler):
         # do nothing
         pass
 
+    def _claim_or_wait(self, key, token):
+        """Return the key value, or None once the key computation is claimed
+
+        :raises redis.exceptions.LockError: when the value is not ready and
+            the claim not released after the lock timeout
+        """
+        lock_key = f'{key}.lock'
+        claim_args = [token, int(self._lock_timeout * 1000)]
+        value = self._get_or_claim(keys=[key, lock_key], args=claim_args)
+        if value != 0:
+            return value
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(f'{key}.ready')
+            deadline = time.monotonic() + self._lock_timeout
+            while True:
+                # check again once subscribed, the value may be ready since
+                value = self._get_or_claim(keys=[key, lock_key], args=claim_args)
+                if value != 0:
+                    return value
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise redis.exceptions.LockError(f'Unable to acquire lock {lock_key}')
+                pubsub.get_message(timeout=min(remaining, WAIT_POLL_INTERVAL))
+        finally:
+            pubsub.close()
+
+    @contextlib.contextmanager
+    def claim(self, key):
+        """Return a context manager yielding the key value, or None when this
+        process claimed the key computation, the claim is released on exit
+        """
+        token = uuid.uuid4().hex
+        value = self._claim_or_wait(key, token)
+        if value != 1:
+            yield self.decode(value)
+            return
+        try:
+            yield None
+        finally:
+            self._release(keys=[f'{key}.lock'], args=[token, f'{key}.ready'])
+
     def get(self, key):
         """Return the key value
 
@@ -54,11 +159,12 @@ class RedisStorageHandler(BaseStorageHandler):
             value = self.decode(value)
         return value
 
-    def set(self, key, value):
-        """Write the value of key
+    def set(self, key, value, timeout=None):
+        """Write the value of key, expiring after timeout seconds if any
 
         :type key: str
         :type value: object
+        :type timeout: int
         """
         value = self.encode(value)
-        self.client.set(key, value)
+        self.client.set(key, value, ex=timeout)
@@ -302,8 +302,7 @@ class _SharedFunction:
         # and if an other process is running the function, I should wait it
         # to finish
         # note: when results are ready this lock has a very short time
-        with self.storage.lock(self.key) as data:
-            self.storage.when_lock_acquired(data)
+        with self.storage.claim(self.key) as value:
             # first must investigate, call the function or use the results
             result = None
             error = None
@@ -311,7 +310,6 @@ class _SharedFunction:
             error_class_name = None
             exp = None
             pid = None
-            value = self.storage.get(self.key)
             if value is None:
                 call_function = True
             else:
@@ -361,7 +359,7 @@ class _SharedFunction:
                         pid=os.getpid(),
                         creation_datetime=creation_datetime,
                     )
-                self.storage.set(self.key, value)
+                self.storage.set(self.key, value, timeout=self._share_timeout)
 
         if call_function and exp:
             # i'am in the first launched process
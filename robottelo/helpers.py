@@ -18,6 +18,8 @@ from robottelo.constants import RHEL_6_MAJOR_VERSION
 from robottelo.constants import RHEL_7_MAJOR_VERSION
 from robottelo.errors import GCECertNotFoundError
 from robottelo.logging import logger
+from robottelo.utils.download_cache import download_cache
+from robottelo.utils.download_cache import RemoteDownloadCache
 
 
 class DataFileError(Exception):
@@ -66,9 +68,8 @@ class ServerFileDownloader:
         """
         if not self.file_downloaded:  # pragma: no cover
             self.fd, self.file_path = mkstemp(suffix=f'.{extention}')
-            fileobj = os.fdopen(self.fd, 'wb')
-            fileobj.write(requests.get(fileurl).content)
-            fileobj.close()
+            os.close(self.fd)
+            download_cache.copy(fileurl, self.file_path)
             if os.path.exists(self.file_path):
                 self.file_downloaded = True
             else:
@@ -85,6 +86,10 @@ def file_downloader(file_url, local_path=None, file_name=None, hostname=None):
     to download file on the localhost.If remote directory is not specified it
     downloads file to /tmp/.
 
+    The file is kept in the download cache of the host, so it is downloaded
+    again only when it changed on the server, see
+    :mod:`robottelo.utils.download_cache`.
+
     :param str file_url: The complete server file path from where the
         file will be downloaded.
     :param str local_path: Name of directory where file will be saved. If not
@@ -101,16 +106,12 @@ def file_downloader(file_url, local_path=None, file_name=None, hostname=None):
 
     # download on localhost
     if hostname is None:
-        with open(f'{local_path}{file_name}', 'wb') as fileobj:
-            r = requests.get(file_url)
-            r.raise_for_status()
-            fileobj.write(r.content)
-            fileobj.close()
+        download_cache.copy(file_url, f'{local_path}{file_name}')
         if not os.path.exists(f"{local_path}{file_name}"):
             raise DownloadFileError(f'Unable to download {file_name}')
     # download on any server.
     else:
-        result = ssh.command(f'wget -O {local_path}{file_name} {file_url}', hostname=hostname)
+        result = RemoteDownloadCache(hostname).copy(file_url, f'{local_path}{file_name}')
         if result.return_code != 0:
             raise DownloadFileError(f'Unable to download {file_name}')
     return [f'{local_path}{file_name}', file_name]
@@ -287,7 +288,8 @@ def remove_katello_ca(hostname=None):
 def md5_by_url(url, hostname=None):
     """Returns md5 checksum of a file, accessible via URL. Useful when you want
     to calculate checksum but don't want to deal with storing a file and
-    removing it afterwards.
+    removing it afterwards. The file and its checksum are kept in the download
+    cache of the remote host.
 
     :param str url: URL of a file.
     :param str hostname: Hostname or IP address of the remote host. If
@@ -297,10 +299,7 @@ def md5_by_url(url, hostname=None):
         reached or calculation was not successful).
     """
     filename = url.split('/')[-1]
-    result = ssh.command(
-        f'wget -qO - {url} | tee {filename} | md5sum | awk \'{{print $1}}\'',
-        hostname=hostname,
-    )
+    result = RemoteDownloadCache(hostname).md5(url)
     if result.return_code != 0:
         raise AssertionError(f'Failed to calculate md5 checksum of {filename}')
     return result.stdout[0]
@@ -1,6 +1,8 @@
 """Module that gather several informations about host"""
-import functools
+import base64
+import json
 import re
+import threading
 
 from packaging.version import Version
 
@@ -10,71 +12,223 @@ from robottelo.config import settings
 from robottelo.logging import logger
 
 
-@functools.lru_cache(maxsize=1)
-def get_host_os_version():
-    """Fetches host's OS version through SSH
-    :return: str with version
+_OS_RELEASE_COMMAND = 'cat /etc/redhat-release'
+
+_SAT_6_2_VERSION_COMMAND = 'rpm -q satellite'
+
+_SAT_6_1_VERSION_COMMAND = 'grep "VERSION" /usr/share/foreman/lib/satellite/version.rb'
+
+# gathered together by the first access to any of them
+_HOST_FACT_COMMANDS = (_OS_RELEASE_COMMAND, _SAT_6_2_VERSION_COMMAND, _SAT_6_1_VERSION_COMMAND)
+
+_REPOMD_PATH = 'repodata/repomd.xml'
+
+
+def fact_script(commands):
+    """Return a shell script running the commands and printing a JSON list with
+    the exit code, stdout and stderr of each command, base64 encoded so any
+    output is valid JSON
+
+    :param commands: the shell commands
+    :return: the script
+    :rtype: str
     """
-    cmd = ssh.command('cat /etc/redhat-release')
-    if cmd.stdout:
-        version_description = cmd.stdout[0]
-        version_re = r'Red Hat Enterprise Linux Server release (?P<version>\d(\.\d)*)'
-        result = re.search(version_re, version_description)
-        if result:
-            host_os_version = f'RHEL{result.group("version")}'
-            logger.debug(f'Host version: {host_os_version}')
-            return host_os_version
+    scripts = [
+        f'out=$({{ {cmd}; }} 2>"$err"); rc=$?; '
+        'printf \'{"rc": %d, "stdout": "%s", "stderr": "%s"}\' "$rc" '
+        '"$(printf %s "$out" | base64 -w0)" "$(base64 -w0 "$err")"'
+        for cmd in commands
+    ]
+    return (
+        'err=$(mktemp); printf "["; '
+        + '; printf ", "; '.join(scripts)
+        + '; printf "]"; rm -f "$err"'
+    )
 
-    logger.warning(f'Host version not available: {cmd!r}')
-    return 'Not Available'
 
+class HostFacts:
+    """Facts of a host, gathered over SSH and cached per hostname
 
-_SAT_6_2_VERSION_COMMAND = 'rpm -q satellite'
+    Facts are the results of shell commands. The commands gathered at once run
+    in one script over one SSH command, which prints their results as JSON.
+    The results are cached until gathered again or invalidated::
 
-_SAT_6_1_VERSION_COMMAND = 'grep "VERSION" /usr/share/foreman/lib/satellite/version.rb'
+        facts = HostFacts.of('capsule.example.com')
+        facts.os_version
+        HostFacts.invalidate('capsule.example.com')
+
+    :param str optional hostname: hostname or IP address of the remote host. If
+        ``None`` the hostname will be get from ``main.server.hostname`` config.
+    """
+
+    _hosts = {}
+    _hosts_lock = threading.Lock()
+
+    def __init__(self, hostname=None):
+        self.hostname = hostname
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, hostname=None):
+        """Return the cached facts of a host"""
+        hostname = hostname or settings.server.hostname
+        with cls._hosts_lock:
+            if hostname not in cls._hosts:
+                cls._hosts[hostname] = cls(hostname)
+            return cls._hosts[hostname]
+
+    @classmethod
+    def invalidate(cls, hostname=None):
+        """Drop the cached facts of a host, of all the hosts if hostname is None"""
+        with cls._hosts_lock:
+            if hostname is None:
+                cls._hosts.clear()
+            else:
+                cls._hosts.pop(hostname, None)
+
+    def gather(self, *commands, cache=True):
+        """Run the commands on the host at once and cache their results
 
+        :param bool cache: whether to cache the results, not worth it for the
+            commands run once
 
-@functools.lru_cache(maxsize=1)
-def get_host_sat_version():
-    """Fetches host's Satellite version through SSH
+        :return: the SSHCommandResult of each command
+        :rtype: list
+        """
+        result = ssh.command(fact_script(commands), hostname=self.hostname, output_format='plain')
+        try:
+            facts = json.loads(result.stdout)
+            if len(facts) != len(commands):
+                raise ValueError(f'{len(facts)} facts for {len(commands)} commands')
+            results = [
+                ssh.build_command_result(
+                    base64.b64decode(fact['stdout']), base64.b64decode(fact['stderr']), fact['rc']
+                )
+                for fact in facts
+            ]
+        except (TypeError, ValueError, KeyError) as err:
+            logger.warning(f'Unable to gather facts of {self.hostname or "server"}: {err}')
+            failed = ssh.SSHCommandResult(
+                stdout=[], stderr=result.stderr, return_code=result.return_code or 1
+            )
+            # not cached, the commands did not run
+            return [failed] * len(commands)
+        if cache:
+            with self._lock:
+                self._results.update(zip(commands, results))
+        return results
+
+    def result(self, command, gather=()):
+        """Return the cached result of a command, gathered with the gather
+        commands not cached yet when missing
+        """
+        with self._lock:
+            if command in self._results:
+                return self._results[command]
+            missing = [cmd for cmd in gather if cmd not in self._results]
+        if command not in missing:
+            missing.insert(0, command)
+        return self.gather(*missing)[missing.index(command)]
+
+    @property
+    def os_version(self):
+        """The host OS version, like RHEL7.9, 'Not Available' when unknown"""
+        result = self.result(_OS_RELEASE_COMMAND, _HOST_FACT_COMMANDS)
+        if result.stdout:
+            version_description = result.stdout[0]
+            version_re = r'Red Hat Enterprise Linux Server release (?P<version>\d(\.\d)*)'
+            match = re.search(version_re, version_description)
+            if match:
+                host_os_version = f'RHEL{match.group("version")}'
+                logger.debug(f'Host version: {host_os_version}')
+                return host_os_version
+
+        logger.warning(f'Host version not available: {result!r}')
+        return 'Not Available'
+
+    @property
+    def sat_version(self):
+        """The host Satellite major and minor version, 'Not Available' when unknown"""
+        for command in (_SAT_6_2_VERSION_COMMAND, _SAT_6_1_VERSION_COMMAND):
+            result = self.result(command, _HOST_FACT_COMMANDS)
+            version = _extract_sat_version(result)
+            if version != 'Not Available':
+                logger.debug(f'Host Satellite version: {version}')
+                return version
+
+        logger.warning(f'Host Satellite version not available: {result!r}')
+        return version
+
+    def repo_files(self, repo_path, extension='rpm'):
+        """Gather the names of the files of a repository, see get_repo_files"""
+        if not repo_path.endswith('/'):
+            repo_path += '/'
+        (result,) = self.gather(
+            f"find {repo_path} -name '*.{extension}' | awk -F/ '{{print $NF}}'", cache=False
+        )
+        if result.return_code != 0:
+            raise CLIReturnCodeError(result.return_code, result.stderr, f'No .{extension} found')
+        # strip empty lines and sort alphabetically (as order may be wrong because
+        # of different paths)
+        return sorted([repo_file for repo_file in result.stdout if repo_file])
+
+    def repomd_revision(self, repo_path):
+        """Gather the revision of a repository, see get_repomd_revision"""
+        (result,) = self.gather(
+            f"grep -oP '(?<=<revision>).*?(?=</revision>)' {repo_path}/{_REPOMD_PATH}",
+            cache=False,
+        )
+        # strip empty lines
+        stdout = [line for line in result.stdout if line]
+        if result.return_code != 0 or len(stdout) != 1:
+            raise CLIReturnCodeError(
+                result.return_code,
+                result.stderr,
+                f'Unable to fetch revision for {repo_path}. Please double check your '
+                'hostname, path and contents of repomd.xml',
+            )
+        return stdout[0]
+
+
+def get_host_os_version(hostname=None):
+    """Fetches host's OS version through SSH, cached per host
+    :return: str with version
+    """
+    return HostFacts.of(hostname).os_version
+
+
+def get_host_sat_version(hostname=None):
+    """Fetches host's Satellite version through SSH, cached per host
     :return: Satellite version
     :rtype: version
     """
-    commands = (
-        _extract_sat_version(c) for c in (_SAT_6_2_VERSION_COMMAND, _SAT_6_1_VERSION_COMMAND)
-    )
-    for version, ssh_result in commands:
-        if version != 'Not Available':
-            logger.debug(f'Host Satellite version: {version}')
-            return version
-
-    logger.warning(f'Host Satellite version not available: {ssh_result!r}')
-    return version
+    return HostFacts.of(hostname).sat_version
 
 
-def _extract_sat_version(ssh_cmd):
+def _extract_sat_version(ssh_result):
     """Extracts Satellite version if possible or 'Not Available' otherwise
 
-    :param ssh_cmd: str ssh command
+    :param ssh_result: SSHCommandResult of a version command
     :return: Satellite version
     :rtype: str
     """
-    ssh_result = ssh.command(ssh_cmd)
     if ssh_result.stdout:
         version_description = ssh_result.stdout[0]
         version_re = r'[^\d]*(?P<version>\d(\.\d){1})'
         result = re.search(version_re, version_description)
         if result:
-            host_sat_version = result.group('version')
-            return host_sat_version, ssh_result
+            return result.group('version')
 
-    return 'Not Available', ssh_result
+    return 'Not Available'
 
 
 def get_repo_files(repo_path, extension='rpm', hostname=None):
     """Returns a list of repo files (for example rpms) in specific repository
     directory.
 
+    The files are gathered again on each call, as the repository content changes.
+
     :param str repo_path: unix path to the repo, e.g. '/var/lib/pulp/fooRepo/'
     :param str extension: extension of searched files. Defaults to 'rpm'
     :param str optional hostname: hostname or IP address of the remote host. If
@@ -82,43 +236,21 @@ def get_repo_files(repo_path, extension='rpm', hostname=None):
     :return: list representing rpm package names
     :rtype: list
     """
-    if not repo_path.endswith('/'):
-        repo_path += '/'
-    result = ssh.command(
-        f"find {repo_path} -name '*.{extension}' | awk -F/ '{{print $NF}}'",
-        hostname=hostname,
-    )
-    if result.return_code != 0:
-        raise CLIReturnCodeError(result.return_code, result.stderr, f'No .{extension} found')
-    # strip empty lines and sort alphabetically (as order may be wrong because
-    # of different paths)
-    return sorted([repo_file for repo_file in result.stdout if repo_file])
+    return HostFacts.of(hostname).repo_files(repo_path, extension)
 
 
 def get_repomd_revision(repo_path, hostname=None):
     """Fetches a revision of repository.
 
+    The revision is gathered again on each call, as the repository content changes.
+
     :param str repo_path: unix path to the repo, e.g. '/var/lib/pulp/fooRepo'
     :param str optional hostname: hostname or IP address of the remote host. If
         ``None`` the hostname will be get from ``main.server.hostname`` config.
     :return: string containing repository revision
     :rtype: str
     """
-    repomd_path = 'repodata/repomd.xml'
-    result = ssh.command(
-        f"grep -oP '(?<=<revision>).*?(?=</revision>)' {repo_path}/{repomd_path}",
-        hostname=hostname,
-    )
-    # strip empty lines
-    stdout = [line for line in result.stdout if line]
-    if result.return_code != 0 or len(stdout) != 1:
-        raise CLIReturnCodeError(
-            result.return_code,
-            result.stderr,
-            f'Unable to fetch revision for {repo_path}. Please double check your '
-            'hostname, path and contents of repomd.xml',
-        )
-    return stdout[0]
+    return HostFacts.of(hostname).repomd_revision(repo_path)
 
 
 class SatVersionDependentValues:
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from pathlib import Path
 from urllib.parse import urljoin
@@ -17,6 +18,7 @@ from robottelo.constants import REPOS
 from robottelo.helpers import install_katello_ca
 from robottelo.helpers import InstallerCommand
 from robottelo.helpers import remove_katello_ca
+from robottelo.logging import logger
 
 
 def setup_capsule(satellite, capsule, registration_args=None, installation_args=None):
@@ -443,6 +445,132 @@ class ContentHost(Host):
         return self.execute(f"echo '{rh_product_os_releasever}' > /etc/yum/vars/releasever")
 
 
+class ContentHostFleetError(Exception):
+    """Raised by :class:`ContentHostFleet` when steps failed on some hosts.
+
+    ``results`` holds, in hosts order, the list of the step results of each
+    host, ending with the exception of the failed step if any, and ``errors``
+    holds the ``(host, step name, exception)`` of each failure, also in hosts
+    order.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        details = '\n'.join(f'{host.hostname} {step}: {error!r}' for host, step, error in errors)
+        super().__init__(f'{len(errors)} of {len(results)} hosts failed:\n{details}')
+
+
+class ContentHostFleet:
+    """Run provisioning steps on several content hosts concurrently.
+
+    A step is the name of a host method, a ``(method name, kwargs)`` tuple or a
+    callable taking the host as argument::
+
+        fleet = ContentHostFleet(hosts)
+        fleet.run(
+            ('install_katello_ca', {'sat_hostname': satellite.hostname}),
+            ('register_contenthost', {'org': org.label, 'activation_key': ak.name}),
+            'install_katello_host_tools',
+            lambda host: host.configure_puppet(rhel7_repo),
+        )
+
+    Any host with the methods of the steps can be part of a fleet, such as
+    :class:`ContentHost` or :class:`robottelo.vm.VirtualMachine`. A step fails
+    when it raises an exception or returns a command result with a non-zero
+    status, and the following steps are then skipped for that host.
+
+    :param hosts: the hosts of the fleet
+    :param int concurrency: the maximum number of hosts running a step at once
+    """
+
+    def __init__(self, hosts, concurrency=10):
+        self.hosts = list(hosts)
+        self.concurrency = concurrency
+
+    @staticmethod
+    def _step_name(step):
+        if isinstance(step, str):
+            return step
+        if isinstance(step, tuple):
+            return step[0]
+        return getattr(step, '__name__', repr(step))
+
+    def _run_step(self, host, step):
+        if callable(step):
+            result = step(host)
+        else:
+            name, kwargs = (step, {}) if isinstance(step, str) else step
+            result = getattr(host, name)(**kwargs)
+        status = getattr(result, 'status', getattr(result, 'return_code', 0))
+        if isinstance(status, int) and status != 0:
+            raise ContentHostError(
+                f'{self._step_name(step)} failed on {host.hostname}: '
+                f'{getattr(result, "stderr", None) or result}'
+            )
+        return result
+
+    def _run_steps(self, host, steps):
+        results = []
+        for step in steps:
+            try:
+                results.append(self._run_step(host, step))
+            except Exception as err:
+                results.append(err)
+                return results, (host, self._step_name(step), err)
+        return results, None
+
+    def run(self, *steps, barrier=False):
+        """Run the steps on all the hosts.
+
+        Each host runs the steps in order. By default a host goes on with its
+        next step as soon as its previous one is over. With ``barrier`` a step
+        starts on the hosts only once it is over on all the hosts, for the
+        steps needing the previous ones done on the whole fleet.
+
+        :param steps: the steps to run
+        :param bool barrier: wait for each step to be over on all the hosts
+        :return: list with the list of the step results of each host, in hosts
+            order
+        :raises ContentHostFleetError: if a step failed on any host. The results
+            of all the hosts are available on the exception.
+        """
+        if not self.hosts:
+            return []
+        errors = [None] * len(self.hosts)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(self.hosts)))) as ex:
+            if barrier:
+                results = [[] for _ in self.hosts]
+                for step in steps:
+                    logger.info(f'Running {self._step_name(step)} on {len(self.hosts)} hosts')
+                    running = {
+                        index: ex.submit(self._run_steps, host, [step])
+                        for index, host in enumerate(self.hosts)
+                        if errors[index] is None
+                    }
+                    for index, future in running.items():
+                        step_results, errors[index] = future.result()
+                        results[index].extend(step_results)
+            else:
+                futures = [ex.submit(self._run_steps, host, steps) for host in self.hosts]
+                results = []
+                for index, future in enumerate(futures):
+                    step_results, errors[index] = future.result()
+                    results.append(step_results)
+        errors = [error for error in errors if error is not None]
+        if errors:
+            raise ContentHostFleetError(results, errors)
+        return results
+
+    def map(self, step):
+        """Run one step on all the hosts.
+
+        :return: list with the result of the step on each host, in hosts order
+        :raises ContentHostFleetError: if the step failed on any host
+        """
+        return [host_results[0] for host_results in self.run(step)]
+
+
 class Capsule(ContentHost):
     def restart_services(self):
         """Restart services, returning True if passed and stdout if not"""
@@ -14,6 +14,8 @@ from fauxfactory import gen_mac
 
 from robottelo import ssh
 from robottelo.config import settings
+from robottelo.libvirt_watch import GUEST_IP_TIMEOUT
+from robottelo.libvirt_watch import wait_for_guest_ip
 
 
 def _gen_mac_for_libvirt():
@@ -73,8 +75,7 @@ class LibvirtGuest:
             self.image_dir = settings.compute_resources.libvirt_image_dir
         else:
             self.image_dir = image_dir
-        if mac is None:
-            self.mac = _gen_mac_for_libvirt()
+        self.mac = mac or _gen_mac_for_libvirt()
         if network is None:
             if settings.vlan_networking.bridge or settings.vlan_networking.network:
                 if settings.vlan_networking.bridge:
@@ -180,6 +181,25 @@ class LibvirtGuest:
             hostname=self.libvirt_server,
         )
 
+    def wait_for_ip(self, timeout=GUEST_IP_TIMEOUT):
+        """Wait for the guest to get an IPv4 address
+
+        The address is found by the guest addresses watch of the libvirt
+        server, shared with the other guests, see
+        :func:`robottelo.libvirt_watch.wait_for_guest_ip`.
+
+        :param int timeout: the time in seconds to wait
+        :return: the IP address, also set as ``ip_addr``
+        :raises robottelo.libvirt_discovery.LibvirtGuestError: if the guest
+            has no IPv4 address in time
+        """
+        if not self._created:
+            raise LibvirtGuestError('The virtual guest should be created before waiting for its IP')
+        self.ip_addr = wait_for_guest_ip(self.libvirt_server, self.mac, timeout=timeout)
+        if self.ip_addr is None:
+            raise LibvirtGuestError(f'Failed to get the IP address of {self.hostname}')
+        return self.ip_addr
+
     def attach_nic(self):
         """Add a new NIC to existing host"""
         if not self._created:
@@ -0,0 +1,143 @@
+"""Watch the IP addresses of the libvirt guests of a hypervisor
+
+Instead of asking the qemu guest agent of each booting guest in its own ssh
+command, a single ssh command per hypervisor lists the IPv4 addresses of the
+running guests every second, from the libvirt DHCP leases, the qemu guest
+agent or the ARP table, and prints the MAC and IP addresses of each guest
+once found. Its output is streamed over one pooled connection and shared by
+all the threads waiting for a guest IP address, see :func:`wait_for_guest_ip`.
+
+The command is stopped when no thread waits for an address anymore.
+"""
+import threading
+from time import monotonic
+
+from robottelo import ssh
+from robottelo.logging import logger
+
+# time in seconds to wait for a guest IP address
+GUEST_IP_TIMEOUT = 60
+# time in seconds after which the watch command is restarted
+WATCH_TIMEOUT = 3600
+# an empty line is printed after each round so that the watcher stops soon
+# after the last waiter is gone
+WATCH_SCRIPT = r'''declare -A found
+while true; do
+  for domain in $(virsh list --name); do
+    [ -n "${found[$domain]}" ] && continue
+    for source in lease agent arp; do
+      addresses=$(virsh domifaddr --source $source "$domain" 2>/dev/null \
+        | awk '$3 == "ipv4" && $4 !~ /^127\./ {sub("/.*", "", $4); print $2, $4}')
+      if [ -n "$addresses" ]; then
+        echo "$addresses"
+        found[$domain]=1
+        break
+      fi
+    done
+  done
+  echo
+  sleep 1
+done'''
+
+
+class GuestAddressWatcher:
+    """Collect the guests IP addresses of a hypervisor by MAC address
+
+    The watch command runs in a background thread, started by :meth:`wait`
+    and stopped once no thread waits anymore.
+    """
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.addresses = {}
+        self._condition = threading.Condition()
+        self._waiters = 0
+        self._thread = None
+
+    def wait(self, mac, timeout=GUEST_IP_TIMEOUT):
+        """Wait for the guest with the given MAC address to get an IPv4 address
+
+        :param str mac: the MAC address of a guest interface
+        :param int timeout: the time in seconds to wait
+        :returns: the IP address, None on timeout or when the watch command
+            failed
+        """
+        mac = mac.lower()
+        deadline = monotonic() + timeout
+        started = False
+        with self._condition:
+            self._waiters += 1
+            try:
+                while mac not in self.addresses:
+                    if self._thread is None:
+                        if started:
+                            # the watch command failed
+                            return None
+                        self._thread = threading.Thread(
+                            target=self._watch, name=f'libvirt_watch {self.hostname}', daemon=True
+                        )
+                        self._thread.start()
+                        started = True
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._condition.wait(remaining)
+                return self.addresses[mac]
+            finally:
+                self._waiters -= 1
+
+    def _watch(self):
+        try:
+            while True:
+                stream = ssh.command(
+                    WATCH_SCRIPT,
+                    hostname=self.hostname,
+                    output_format='plain',
+                    timeout=WATCH_TIMEOUT,
+                    stream=True,
+                )
+                lines = iter(stream)
+                try:
+                    for line in lines:
+                        with self._condition:
+                            fields = line.split()
+                            if len(fields) == 2:
+                                self.addresses[fields[0].lower()] = fields[1]
+                                self._condition.notify_all()
+                            if not self._waiters:
+                                return
+                except ssh.SSHCommandTimeoutError:
+                    continue
+                finally:
+                    # closing the stream early closes its connection
+                    lines.close()
+                logger.warning(
+                    f'The guest addresses watch on {self.hostname} exited with '
+                    f'{stream.return_code}: {stream.stderr}'
+                )
+                return
+        except Exception as err:
+            logger.warning(f'Failed to watch the guest addresses on {self.hostname}: {err}')
+        finally:
+            with self._condition:
+                self._thread = None
+                self._condition.notify_all()
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def wait_for_guest_ip(hostname, mac, timeout=GUEST_IP_TIMEOUT):
+    """Wait for a guest of hostname to get an IPv4 address
+
+    :param str hostname: the hypervisor running the guest
+    :param str mac: the MAC address of a guest interface
+    :param int timeout: the time in seconds to wait
+    :returns: the IP address, None when not found in time
+    """
+    with _watchers_lock:
+        watcher = _watchers.get(hostname)
+        if watcher is None:
+            watcher = _watchers[hostname] = GuestAddressWatcher(hostname)
+    return watcher.wait(mac, timeout=timeout)
@@ -1,5 +1,9 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import weakref
 from pathlib import Path
 
 import logzero
@@ -16,6 +20,7 @@ with robottelo_root_dir.joinpath('logging.yaml').open() as f:
     logging_yaml = AttrDict(yaml.load(f, yaml.FullLoader))
 
 DEFAULT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_QUEUE_POLICIES = ('block', 'drop')
 
 defaultFormatter = logzero.LogFormatter(
     fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt=DEFAULT_DATE_FORMAT
@@ -74,3 +79,168 @@ config_logger = logzero.setup_logger(
     fileLoglevel=logging_yaml.config.fileLevel,
     formatter=defaultFormatter,
 )
+
+
+class LogListener(logging.handlers.QueueListener):
+    """Run the handlers of the queued records in a thread
+
+    The queue is bounded by maxsize, when it is full a record is either waited
+    for room in the queue with the ``block`` policy or discarded with the
+    ``drop`` policy. The count of the dropped records is logged with the next
+    record handled.
+
+    A forked child process has no listener thread, its records are handled
+    right away.
+    """
+
+    def __init__(self, maxsize=0, policy='block'):
+        if policy not in LOG_QUEUE_POLICIES:
+            raise ValueError(f'Log queue policy must be one of {LOG_QUEUE_POLICIES}, not {policy}')
+        super().__init__(queue.Queue(maxsize))
+        self.policy = policy
+        self.dropped = 0
+        self._reported = 0
+        listener = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: listener() and listener()._after_fork())
+
+    def _after_fork(self):
+        # the records queued by the parent are handled by the parent
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def put(self, record, handlers):
+        """Queue a record for handlers, handle it right away if not running"""
+        if not self.running:
+            self.handle((record, handlers))
+        elif self.policy == 'block':
+            self.queue.put((record, handlers))
+        else:
+            try:
+                self.queue.put_nowait((record, handlers))
+            except queue.Full:
+                self.dropped += 1
+
+    def handle(self, item):
+        record, handlers = item
+        if self.dropped != self._reported:
+            dropped, self._reported = self.dropped - self._reported, self.dropped
+            self.handle(
+                (
+                    logging.makeLogRecord(
+                        {
+                            'name': 'robottelo.logging',
+                            'levelno': logging.WARNING,
+                            'levelname': 'WARNING',
+                            'msg': f'{dropped} log records dropped, the log queue was full',
+                        }
+                    ),
+                    handlers,
+                )
+            )
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    # the listener thread must keep running
+                    handler.handleError(record)
+
+    def enqueue_sentinel(self):
+        # the queue may be full
+        self.queue.put(self._sentinel)
+
+    def wait(self):
+        """Wait for the queued records to be handled"""
+        if self.running:
+            self.queue.join()
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Pass the records to handlers run by the log listener thread, so the
+    logging threads do not wait for the disk or the network
+
+    The handlers are managed with addHandler and removeHandler, as on a logger.
+    """
+
+    def __init__(self, listener, handlers=()):
+        super().__init__(listener.queue)
+        self.listener = listener
+        self.handlers = ()
+        for handler in handlers:
+            self.addHandler(handler)
+
+    def addHandler(self, handler):
+        if handler not in self.handlers:
+            self.handlers += (handler,)
+            self._update_level()
+
+    def removeHandler(self, handler):
+        if handler in self.handlers:
+            self.handlers = tuple(h for h in self.handlers if h is not handler)
+            self._update_level()
+
+    def _update_level(self):
+        # records no handler would emit are not queued
+        self.setLevel(min((h.level for h in self.handlers), default=logging.CRITICAL + 1))
+
+    def prepare(self, record):
+        """Return a copy of the record with the arguments merged in the message,
+        as they may change once logged, the listener thread formats the rest
+        """
+        # cheaper than copy.copy
+        prepared = logging.LogRecord.__new__(logging.LogRecord)
+        prepared.__dict__.update(record.__dict__)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        return prepared
+
+    def enqueue(self, record):
+        self.listener.put(record, self.handlers)
+
+    def flush(self):
+        """Wait for the queued records to be handled, then flush the handlers"""
+        self.listener.wait()
+        for handler in self.handlers:
+            handler.flush()
+
+
+class BatchingHandler(logging.handlers.MemoryHandler):
+    """Send the records to target in batches of capacity records, at once for
+    the error records and when flushed
+    """
+
+    def __init__(self, target, capacity=None):
+        super().__init__(
+            capacity or logging_yaml.queue.batch_size,
+            flushLevel=logging.ERROR,
+            target=target,
+            flushOnClose=True,
+        )
+        self.setLevel(target.level)
+
+
+def queue_file_handlers(logger_, listener):
+    """Move the file handlers of a logger behind a LogQueueHandler
+
+    :returns: the LogQueueHandler, where the file handlers can be added and removed
+    """
+    file_handlers = [h for h in logger_.handlers if isinstance(h, logging.FileHandler)]
+    for handler in file_handlers:
+        logger_.removeHandler(handler)
+    queue_handler = LogQueueHandler(listener, file_handlers)
+    logger_.addHandler(queue_handler)
+    return queue_handler
+
+
+log_listener = LogListener(maxsize=logging_yaml.queue.size, policy=logging_yaml.queue.policy)
+log_listener.start()
+# the listener handles the records logged at exit itself once stopped
+atexit.register(log_listener.stop)
+
+queue_handler = queue_file_handlers(logger, log_listener)
+queue_file_handlers(collection_logger, log_listener)
+queue_file_handlers(config_logger, log_listener)
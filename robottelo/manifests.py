@@ -1,11 +1,18 @@
 """Manifest clonning tools.."""
+import functools
+import hashlib
 import io
 import json
+import os
+import threading
 import time
 import uuid
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from pathlib import Path
 
-import requests
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import serialization
@@ -16,8 +23,83 @@ from robottelo.cli.subscription import Subscription
 from robottelo.config import settings
 from robottelo.constants import INTERFACE_API
 from robottelo.constants import INTERFACE_CLI
-from robottelo.decorators.func_locker import lock_function
+from robottelo.decorators.func_locker import get_temp_dir
+from robottelo.decorators.func_locker import LOCK_DEFAULT_TIMEOUT
+from robottelo.decorators.func_locker import TEMP_ROOT_DIR
+from robottelo.logging import logger
 from robottelo.ssh import upload_file
+from robottelo.utils.atomic_write import write_atomic
+from robottelo.utils.download_cache import download_cache
+from robottelo.utils.file_lock import file_lock
+from robottelo.utils.file_lock import file_semaphore
+
+
+@functools.lru_cache(maxsize=None)
+def _load_private_key(signing_key):
+    return serialization.load_pem_private_key(signing_key, password=None, backend=default_backend())
+
+
+def _clone(template, private_key, org_environment_access=False):
+    """Return the content of a clone of the template manifest, see
+    :meth:`ManifestCloner.clone`
+    """
+    template_zip = zipfile.ZipFile(io.BytesIO(template))
+    # Extract the consumer_export.zip from the template manifest.
+    consumer_export_zip = zipfile.ZipFile(io.BytesIO(template_zip.read('consumer_export.zip')))
+
+    # Generate a new consumer_export.zip file changing the consumer
+    # uuid.
+    consumer_export = io.BytesIO()
+    with zipfile.ZipFile(consumer_export, 'w') as new_consumer_export_zip:
+        for name in consumer_export_zip.namelist():
+            if name == 'export/consumer.json':
+                consumer_data = json.loads(consumer_export_zip.read(name).decode('utf-8'))
+                consumer_data['uuid'] = str(uuid.uuid1())
+                if org_environment_access:
+                    consumer_data['contentAccessMode'] = 'org_environment'
+                    consumer_data['owner']['contentAccessModeList'] = 'entitlement,org_environment'
+                new_consumer_export_zip.writestr(name, json.dumps(consumer_data))
+            else:
+                new_consumer_export_zip.writestr(name, consumer_export_zip.read(name))
+
+    # Generate a new manifest.zip file with the generated
+    # consumer_export.zip and new signature.
+    manifest = io.BytesIO()
+    with zipfile.ZipFile(manifest, 'w', zipfile.ZIP_DEFLATED) as manifest_zip:
+        consumer_export.seek(0)
+        manifest_zip.writestr('consumer_export.zip', consumer_export.read())
+        consumer_export.seek(0)
+        signature = private_key.sign(consumer_export.read(), padding.PKCS1v15(), hashes.SHA256())
+        manifest_zip.writestr('signature', signature)
+    return manifest.getvalue()
+
+
+def _clone_into(pool_dir, template, signing_key, org_environment_access, claim):
+    """Clone the template manifest in the pool directory, then remove its claim
+    file, run by the pool processes
+    """
+    try:
+        content = _clone(template, _load_private_key(signing_key), org_environment_access)
+        write_atomic(os.path.join(pool_dir, f'{hashlib.sha256(content).hexdigest()}.zip'), content)
+    finally:
+        _remove_claim(claim)
+
+
+def _remove_claim(claim):
+    try:
+        os.unlink(claim)
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
 
 
 class ManifestCloner:
@@ -32,13 +114,18 @@ class ManifestCloner:
         """Download and cache the manifest information."""
         if self.template is None:
             self.template = {}
-        self.template[name] = requests.get(settings.fake_manifest.url[name]).content
+        timeout = settings.fake_manifest.download_timeout
+        self.template[name] = download_cache.read(settings.fake_manifest.url[name], timeout)
         if self.signing_key is None:
-            self.signing_key = requests.get(settings.fake_manifest.key_url).content
+            self.signing_key = download_cache.read(settings.fake_manifest.key_url, timeout)
         if self.private_key is None:
-            self.private_key = serialization.load_pem_private_key(
-                self.signing_key, password=None, backend=default_backend()
-            )
+            self.private_key = _load_private_key(self.signing_key)
+
+    def template_data(self, name='default'):
+        """Return the template manifest and the signing key contents"""
+        if self.signing_key is None or self.template is None or self.template.get(name) is None:
+            self._download_manifest_info(name)
+        return self.template[name], self.signing_key
 
     def clone(self, org_environment_access=False, name='default'):
         """Clones a RedHat-manifest file.
@@ -59,45 +146,8 @@ class ManifestCloner:
             ``StringIO`` on Python 2) with the contents of the cloned
             manifest.
         """
-        if self.signing_key is None or self.template is None or self.template.get(name) is None:
-            self._download_manifest_info(name)
-
-        template_zip = zipfile.ZipFile(io.BytesIO(self.template[name]))
-        # Extract the consumer_export.zip from the template manifest.
-        consumer_export_zip = zipfile.ZipFile(io.BytesIO(template_zip.read('consumer_export.zip')))
-
-        # Generate a new consumer_export.zip file changing the consumer
-        # uuid.
-        consumer_export = io.BytesIO()
-        with zipfile.ZipFile(consumer_export, 'w') as new_consumer_export_zip:
-            for name in consumer_export_zip.namelist():
-                if name == 'export/consumer.json':
-                    consumer_data = json.loads(consumer_export_zip.read(name).decode('utf-8'))
-                    consumer_data['uuid'] = str(uuid.uuid1())
-                    if org_environment_access:
-                        consumer_data['contentAccessMode'] = 'org_environment'
-                        consumer_data['owner'][
-                            'contentAccessModeList'
-                        ] = 'entitlement,org_environment'
-                    new_consumer_export_zip.writestr(name, json.dumps(consumer_data))
-                else:
-                    new_consumer_export_zip.writestr(name, consumer_export_zip.read(name))
-
-        # Generate a new manifest.zip file with the generated
-        # consumer_export.zip and new signature.
-        manifest = io.BytesIO()
-        with zipfile.ZipFile(manifest, 'w', zipfile.ZIP_DEFLATED) as manifest_zip:
-            consumer_export.seek(0)
-            manifest_zip.writestr('consumer_export.zip', consumer_export.read())
-            consumer_export.seek(0)
-            signature = self.private_key.sign(
-                consumer_export.read(), padding.PKCS1v15(), hashes.SHA256()
-            )
-            manifest_zip.writestr('signature', signature)
-        # Make sure that the file-like object is at the beginning and
-        # ready to be read.
-        manifest.seek(0)
-        return manifest
+        template, _ = self.template_data(name)
+        return io.BytesIO(_clone(template, self.private_key, org_environment_access))
 
     def original(self, name='default'):
         """Returns the original manifest as a file-like object.
@@ -111,14 +161,169 @@ class ManifestCloner:
         Make sure to close the returned file-like object in order to clean up
         the memory used to store it.
         """
-        if self.signing_key is None or self.template is None or self.template.get(name) is None:
-            self._download_manifest_info(name)
-        return io.BytesIO(self.template[name])
+        template, _ = self.template_data(name)
+        return io.BytesIO(template)
+
+
+class ManifestPool:
+    """Cloned manifests generated ahead by background processes.
+
+    The manifests cloned from a template are kept in a directory of the manifest
+    cache named after the digest of the template, the signing key and the
+    content access mode, one file per manifest named after its digest, so the
+    xdist workers share them. A manifest is taken by renaming its file, which
+    only one worker can do, then ``workers`` processes clone manifests until
+    the pool holds ``size`` of them again. Each manifest being cloned has a
+    ``<pid>.<uuid>.claim`` file in the directory, counted with the manifests by
+    all the workers so they do not clone the same missing manifests. The
+    manifests are cloned on the calling thread when the pool is empty or its
+    size is 0.
+
+    :param cloner: the ManifestCloner downloading the templates
+    :param int size: the number of manifests to keep ready for each template,
+        by default ``fake_manifest.pool_size``
+    :param int workers: the number of cloning processes, by default
+        ``fake_manifest.pool_workers``
+    """
+
+    def __init__(self, cloner, size=None, workers=None):
+        self.cloner = cloner
+        self._size = size
+        self._workers = workers
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return settings.fake_manifest.pool_size if self._size is None else self._size
+
+    @property
+    def workers(self):
+        return settings.fake_manifest.pool_workers if self._workers is None else self._workers
+
+    def _pool_dir(self, name, org_environment_access):
+        template, signing_key = self.cloner.template_data(name)
+        digest = hashlib.sha256(template)
+        digest.update(signing_key)
+        digest.update(b'org_environment' if org_environment_access else b'entitlement')
+        pool_dir = Path(settings.fake_manifest.cache_dir, 'manifests', digest.hexdigest())
+        pool_dir.mkdir(parents=True, exist_ok=True)
+        return pool_dir
+
+    @staticmethod
+    def _take(pool_dir):
+        """Take a manifest out of the pool, None if empty"""
+        with os.scandir(pool_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.zip'):
+                    continue
+                taken = f'{entry.path}.{os.getpid()}.{threading.get_ident()}'
+                try:
+                    os.rename(entry.path, taken)
+                except FileNotFoundError:
+                    # taken by another worker
+                    continue
+                try:
+                    with open(taken, 'rb') as manifest:
+                        return manifest.read()
+                finally:
+                    os.unlink(taken)
+        return None
+
+    @staticmethod
+    def _count(pool_dir):
+        """Return the number of manifests in the pool and being cloned,
+        removing the claims of the dead workers
+        """
+        count = 0
+        with os.scandir(pool_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.claim'):
+                    if not _pid_alive(int(entry.name.split('.', 1)[0])):
+                        _remove_claim(entry.path)
+                        continue
+                    count += 1
+                elif entry.name.endswith('.zip'):
+                    count += 1
+        return count
+
+    def _cloned(self, executor, claim, future):
+        # the claim is left when the cloning process died
+        _remove_claim(claim)
+        with self._lock:
+            if isinstance(future.exception(), BrokenProcessPool) and self._executor is executor:
+                # a new executor is started by the next fill
+                self._executor = None
+        if future.exception() is not None:
+            logger.warning(
+                f'Unable to clone a manifest in {os.path.dirname(claim)}: {future.exception()!r}'
+            )
+
+    def fill(self, name='default', org_environment_access=False):
+        """Clone manifests in the background until the pool of the template
+        holds ``size`` of them
+
+        :param name: key name of the fake_manifest.url dict
+        :param org_environment_access: whether the manifests are Golden ticket
+            enabled
+        """
+        pool_dir = self._pool_dir(name, org_environment_access)
+        futures = []
+        with self._lock:
+            with file_lock(str(pool_dir / 'fill.lock'), name='manifest_pool_fill'):
+                missing = self.size - self._count(pool_dir)
+                claims = [
+                    pool_dir / f'{os.getpid()}.{uuid.uuid4().hex}.claim' for _ in range(missing)
+                ]
+                for claim in claims:
+                    claim.touch()
+            if not claims:
+                return
+            # the cloning processes are forked on submit, out of the file lock
+            # which they would hold as long as they run
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=max(1, self.workers))
+                self._pid = os.getpid()
+            executor = self._executor
+            template, signing_key = self.cloner.template_data(name)
+            for index, claim in enumerate(claims):
+                try:
+                    future = executor.submit(
+                        _clone_into,
+                        str(pool_dir),
+                        template,
+                        signing_key,
+                        org_environment_access,
+                        str(claim),
+                    )
+                except BrokenProcessPool as err:
+                    for unused in claims[index:]:
+                        _remove_claim(unused)
+                    logger.warning(f'Manifest cloning processes failed, restarting them: {err!r}')
+                    self._executor = None
+                    break
+                futures.append((future, claim))
+        # a done future runs its callback at once, which takes the lock
+        for future, claim in futures:
+            future.add_done_callback(functools.partial(self._cloned, executor, str(claim)))
+
+    def get(self, org_environment_access=False, name='default'):
+        """Return a cloned manifest, see :meth:`ManifestCloner.clone`"""
+        if not self.size:
+            return self.cloner.clone(org_environment_access=org_environment_access, name=name)
+        content = self._take(self._pool_dir(name, org_environment_access))
+        self.fill(name, org_environment_access)
+        if content is None:
+            logger.debug(f'Manifest pool of {name} is empty, cloning a manifest')
+            return self.cloner.clone(org_environment_access=org_environment_access, name=name)
+        return io.BytesIO(content)
 
 
 # Cache the ManifestCloner in order to avoid downloading the manifest template
 # every single time.
 _manifest_cloner = ManifestCloner()
+_manifest_pool = ManifestPool(_manifest_cloner)
 
 
 class Manifest:
@@ -137,7 +342,7 @@ class Manifest:
         self.filename = filename
 
         if self._content is None:
-            self._content = _manifest_cloner.clone(
+            self._content = _manifest_pool.get(
                 org_environment_access=org_environment_access, name=name
             )
         if self.filename is None:
@@ -194,7 +399,36 @@ def original_manifest(name='default'):
     return Manifest(_manifest_cloner.original(name=name))
 
 
-@lock_function
+@contextmanager
+def upload_lock(org_id, hostname=None, timeout=LOCK_DEFAULT_TIMEOUT):
+    """Lock a manifest upload across the xdist workers.
+
+    At most ``fake_manifest.concurrent_uploads`` manifests are uploaded to a
+    Satellite at once, and one at a time to an organization. The time spent
+    waiting for and holding the locks is recorded under the
+    ``manifest_upload_org`` and ``manifest_upload_slot`` names, see
+    :func:`robottelo.utils.file_lock.lock_wait_stats`.
+
+    :param org_id: the id of the organization the manifest is uploaded to
+    :param str hostname: the Satellite hostname, by default
+        ``server.hostname``
+    :param int timeout: the time in seconds to wait for each lock
+    """
+    hostname = hostname or settings.server.hostname
+    lock_dir = os.path.join(get_temp_dir(), TEMP_ROOT_DIR, 'manifest_upload', hostname)
+    os.makedirs(lock_dir, exist_ok=True)
+    slots = [
+        os.path.join(lock_dir, f'slot_{index}.lock')
+        for index in range(settings.fake_manifest.concurrent_uploads)
+    ]
+    # the organization lock is always taken first
+    with file_lock(
+        os.path.join(lock_dir, f'org_{org_id}.lock'), timeout=timeout, name='manifest_upload_org'
+    ):
+        with file_semaphore(slots, timeout=timeout, name='manifest_upload_slot'):
+            yield
+
+
 def upload_manifest_locked(org_id, manifest=None, interface=INTERFACE_API, timeout=None):
     """Upload a manifest with locking, using the requested interface.
 
@@ -205,8 +439,8 @@ def upload_manifest_locked(org_id, manifest=None, interface=INTERFACE_API, timeo
 
     :returns: the upload result
 
-    Note: The manifest uploading is strictly locked only when using this
-        function
+    Note: The manifest uploading is locked only when using this function, see
+        :func:`upload_lock`
 
     Usage::
 
@@ -233,18 +467,20 @@ def upload_manifest_locked(org_id, manifest=None, interface=INTERFACE_API, timeo
         # other processes and we do not want to be interrupted by the default configuration
         # ssh_client timeout.
         timeout = 1500
-    if interface == INTERFACE_API:
-        with manifest:
-            result = entities.Subscription().upload(
-                data={'organization_id': org_id}, files={'content': manifest.content}
-            )
-    else:
-        # interface is INTERFACE_CLI
+    if interface == INTERFACE_CLI:
+        # the manifest file is copied to the server before locking
         with manifest:
             upload_file(manifest.content, manifest.filename)
-
-        result = Subscription.upload(
-            {'file': manifest.filename, 'organization-id': org_id}, timeout=timeout
-        )
+    with upload_lock(org_id):
+        if interface == INTERFACE_API:
+            with manifest:
+                result = entities.Subscription().upload(
+                    data={'organization_id': org_id}, files={'content': manifest.content}
+                )
+        else:
+            # interface is INTERFACE_CLI
+            result = Subscription.upload(
+                {'file': manifest.filename, 'organization-id': org_id}, timeout=timeout
+            )
 
     return result
@@ -1,6 +1,7 @@
 """Utilities to help work with log files"""
 import os
 import re
+import shlex
 
 from robottelo import ssh
 from robottelo.config import robottelo_root_dir
@@ -8,37 +9,97 @@ from robottelo.config import robottelo_root_dir
 LOGS_DATA_DIR = os.path.join(robottelo_root_dir, 'data', 'logs')
 
 
+class LogFileError(Exception):
+    """Raised when the remote log file can not be read"""
+
+
 class LogFile:
     """
     References a remote log file. The log file will be downloaded to allow
     operate on it using python
+
+    In tail mode the log file is not downloaded, its size is recorded instead
+    and only the lines appended since are read from the server, optionally
+    filtered on the server with ``grep -E``::
+
+        log = LogFile('/var/log/foreman/production.log', tail=True)
+        # run the test steps
+        errors = log.filter('ERROR')
     """
 
-    def __init__(self, remote_path, pattern=None):
+    def __init__(self, remote_path, pattern=None, tail=False, hostname=None):
         self.remote_path = remote_path
         self.pattern = pattern
+        self.tail = tail
+        self.hostname = hostname
 
+        if tail:
+            self.data = None
+            self.offset = self._remote_size()
+            return
         if not os.path.isdir(LOGS_DATA_DIR):
             os.makedirs(LOGS_DATA_DIR)
         self.local_path = os.path.join(LOGS_DATA_DIR, os.path.basename(remote_path))
-        ssh.download_file(remote_path, self.local_path)
+        ssh.download_file(remote_path, self.local_path, hostname=hostname)
         with open(self.local_path) as file_:
             self.data = file_.readlines()
 
-    def filter(self, pattern=None):
-        """
-        Filter the log file using the pattern argument or object's pattern
+    def _remote_size(self):
+        with ssh.get_sftp_session(hostname=self.hostname) as sftp:
+            try:
+                return sftp.stat(self.remote_path).st_size
+            except FileNotFoundError:
+                # the log file is created later
+                return 0
+
+    def _iter_new_lines(self, pattern=None):
+        """Read the lines appended to the remote log file since the offset,
+        the whole file if it was rotated since
         """
+        path = shlex.quote(self.remote_path)
+        cmd = (
+            f'if [ $(stat -c %s {path}) -lt {self.offset} ]; then cat {path}; '
+            f'else tail -c +{self.offset + 1} {path}; fi'
+        )
+        if pattern is not None:
+            # grep exits with 1 when no line matched, a read error exits with 2
+            # like a grep error so it is not taken for no match
+            cmd = (
+                f'({cmd}) | grep -E {shlex.quote(pattern)}; status=("${{PIPESTATUS[@]}}"); '
+                '[ "${status[0]}" -eq 0 ] || exit 2; exit "${status[1]}"'
+            )
+        stream = ssh.command(cmd, hostname=self.hostname, output_format='plain', stream=True)
+        for line in stream:
+            yield f'{line}\n'
+        if stream.return_code != 0 and not (pattern is not None and stream.return_code == 1):
+            raise LogFileError(f'Unable to read {self.remote_path}: {stream.stderr}')
 
-        if pattern is None:
-            pattern = self.pattern
+    def iter_lines(self, pattern=None, grep=False):
+        """Iterate lazily over the log file lines, the lines appended since the
+        log file object creation in tail mode, matching pattern if any
 
+        :param str pattern: a regular expression the lines must match
+        :param bool grep: in tail mode, filter the lines on the server with
+            ``grep -E``, pattern must then be a POSIX extended regular expression
+        """
+        if self.tail and grep:
+            yield from self._iter_new_lines(pattern)
+            return
+        lines = self._iter_new_lines() if self.tail else self.data
+        if pattern is None:
+            yield from lines
+            return
         compiled = re.compile(pattern)
+        for line in lines:
+            if compiled.search(line) is not None:
+                yield line
 
-        result = []
+    def filter(self, pattern=None, grep=False):
+        """
+        Filter the log file using the pattern argument or object's pattern
+        """
 
-        for line in self.data:
-            if compiled.search(line) is not None:
-                result.append(line)
+        if pattern is None:
+            pattern = self.pattern
 
-        return result
+        return list(self.iter_lines(pattern, grep=grep))
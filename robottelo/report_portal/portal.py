@@ -1,12 +1,18 @@
+import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry
 from tenacity import stop_after_attempt
 from tenacity import wait_fixed
 
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils.atomic_write import write_atomic
 
 
 launch_types = ['satellite6', 'upgrades']
@@ -40,6 +46,8 @@ class ReportPortal:
         self.rp_url = settings.report_portal.portal_url
         self.rp_project = settings.report_portal.project
         self.rp_api_key = settings.report_portal.api_key
+        self._session = None
+        self._launches_data = None
 
     @property
     def api_url(self):
@@ -55,6 +63,21 @@ class ReportPortal:
         """
         return {'Authorization': f'Bearer {self.rp_api_key}'}
 
+    @property
+    def session(self):
+        """The HTTP session shared by the Report Portal requests, its connection
+        pool is sized for the concurrent test items requests.
+        :returns: requests session
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+            self._session.verify = False
+            adapter = HTTPAdapter(pool_maxsize=settings.report_portal.workers)
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+        return self._session
+
     def _format_launches(self, launches):
         """The pretty formatter function that formats launches in a structured way
 
@@ -78,14 +101,16 @@ class ReportPortal:
     def _launch_requester(self):
         """The launch GET requester to fetch the all available launches of ReportPortal
 
+        The launches are requested once per Report Portal object.
+
         :returns dict: The json of all RP launches
         """
-        params = {'page.page': 1, 'page.size': 500, 'page.sort': 'startTime'}
-        resp = requests.get(
-            url=f'{self.api_url}/launch', headers=self.headers, params=params, verify=False
-        )
-        resp.raise_for_status()
-        return resp.json()
+        if self._launches_data is None:
+            params = {'page.page': 1, 'page.size': 500, 'page.sort': 'startTime'}
+            resp = self.session.get(url=f'{self.api_url}/launch', params=params)
+            resp.raise_for_status()
+            self._launches_data = resp.json()
+        return self._launches_data
 
     def launches(self, sat_version=None, launch_type='satellite6'):
         """Returns launches in Report Portal customized by sat_version, launch_type and
@@ -163,6 +188,7 @@ class Launch:
         self.info = launch_info
         self.name = self.info['name']
         self.statistics = self.info['statistics']['executions']
+        self._tests_data = None
         self._versions()
 
     def _versions(self):
@@ -188,39 +214,66 @@ class Launch:
         self.satellite_version = re.search(version_compiler, launch_name).group(1)
         self.snap_version = re.search(version_compiler, launch_name).group(2)
 
-    def _test_params(self, status, defect_type, user):
+    @property
+    def finished(self):
+        """Whether the launch is finished, so its tests data will not change"""
+        return self.info.get('status', 'IN_PROGRESS') != 'IN_PROGRESS'
+
+    def _test_params(self):
         """Customise parameters for Test items API request
 
         :returns dict: The parameters dict for API test items request
         """
-        params = [
-            ('filter.eq.launchId', self.info['id']),
-            ('page.page', 1),
-            ('page.size', 50),
-            ('page.sort', 'startTime'),
-        ]
+        return {
+            'filter.eq.launchId': self.info['id'],
+            'page.page': 1,
+            'page.size': settings.report_portal.page_size,
+            'page.sort': 'startTime',
+        }
+
+    def _test_filter(self, status, defect_type, user):
+        """Customise the filter of the tests data of the launch
+
+        :param status: A test status or a list of test statuses
+        :param defect_type: A defect type or a list of defect types
+        :param str user: The case owner of the tests
+        :returns function: The function telling if a test matches the filter
+        """
+        statuses = [status] if isinstance(status, str) else status
+        defect_types = [defect_type] if isinstance(defect_type, str) else defect_type
         rp_defect_types = ReportPortal.defect_types
-        if defect_type:
-            if defect_type in rp_defect_types:
-                params.insert(0, ('filter.eq.issueType', rp_defect_types[defect_type].lower()))
-            else:
-                raise ValueError(
-                    f'Invalid value \'{defect_type}\' for defect type parameter, '
-                    f'should be one of {[*rp_defect_types.keys()]}'
-                )
+        if defect_types is not None:
+            for dtype in defect_types:
+                if dtype not in rp_defect_types:
+                    raise ValueError(
+                        f'Invalid value \'{dtype}\' for defect type parameter, '
+                        f'should be one of {[*rp_defect_types.keys()]}'
+                    )
+            issue_types = {rp_defect_types[dtype].lower() for dtype in defect_types}
         rp_statuses = ReportPortal.statuses
-        if status:
-            if status in rp_statuses:
-                params.insert(2, ('filter.eq.status', status))
-            else:
-                raise ValueError(
-                    f'Invalid value \'{status}\' for status parameter, '
-                    f'should be one of {rp_statuses}'
+        if statuses is not None:
+            for test_status in statuses:
+                if test_status not in rp_statuses:
+                    raise ValueError(
+                        f'Invalid value \'{test_status}\' for status parameter, '
+                        f'should be one of {rp_statuses}'
+                    )
+
+        def match(test):
+            if statuses is not None and test['status'].lower() not in statuses:
+                return False
+            if defect_types is not None:
+                issue_type = (test.get('issue') or {}).get('issueType', '')
+                if issue_type.lower() not in issue_types:
+                    return False
+            if user:
+                return any(
+                    attr.get('key') == 'case_owner' and attr.get('value') == user
+                    for attr in test.get('attributes', [])
                 )
-        if user:
-            params.insert(0, ('filter.has.attributeKey', 'case_owner'))
-            params.insert(1, ('filter.has.attributeValue', user))
-        return dict(params)
+            return True
+
+        return match
 
     @retry(
         stop=stop_after_attempt(6),
@@ -234,37 +287,80 @@ class Launch:
         :returns tuple (int, list): Total pages count and the list of tests along with
             each tests properties in a page
         """
-        params['page.page'] = page
-        resp = requests.get(
-            url=f'{self.report_portal.api_url}/item',
-            headers=self.report_portal.headers,
-            params=params,
-            verify=False,
+        resp = self.report_portal.session.get(
+            url=f'{self.report_portal.api_url}/item', params={**params, 'page.page': page}
         )
         resp.raise_for_status()
         total_pages = resp.json()['page']['totalPages']
         pagedata = resp.json().get('content')
         return total_pages, pagedata
 
+    @property
+    def _cache_path(self):
+        cache_dir = settings.report_portal.cache_dir
+        return os.path.join(cache_dir, f'launch_{self.info["id"]}.json') if cache_dir else None
+
+    def _load_cached_tests(self):
+        """Read the tests data of a finished launch cached on disk
+
+        :returns list: The tests data, None if not cached
+        """
+        if not self.finished or not self._cache_path or not os.path.exists(self._cache_path):
+            return None
+        try:
+            with open(self._cache_path) as cache:
+                return json.load(cache)
+        except ValueError:
+            logger.warning(f'Ignoring invalid Report Portal cache file {self._cache_path}')
+            return None
+
+    def _save_cached_tests(self, data):
+        """Write the tests data of a finished launch on disk"""
+        if not self.finished or not self._cache_path:
+            return
+        cache_dir = os.path.dirname(self._cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(self._cache_path, json.dumps(data))
+
+    def _all_tests(self):
+        """Returns the data of all the tests of the launch
+
+        The first page tells the total pages count, the other pages are then fetched
+        concurrently. The tests data of a finished launch is cached on disk.
+
+        :returns list: The tests along with each tests properties
+        """
+        if self._tests_data is None:
+            data = self._load_cached_tests()
+            if data is None:
+                params = self._test_params()
+                total_pages, data = self._test_requester(params=params, page=1)
+                if total_pages > 1:
+                    with ThreadPoolExecutor(settings.report_portal.workers) as executor:
+                        pages = executor.map(
+                            partial(self._test_requester, params), range(2, total_pages + 1)
+                        )
+                        for _, pagedata in pages:
+                            data.extend(pagedata)
+                self._save_cached_tests(data)
+            self._tests_data = data
+        return self._tests_data
+
     def tests(self, status=None, defect_type=None, user=None):
         """Returns tests data customized by kwargs parameters.
 
         This is a main function that will be called to retrieve the tests data
-        of a particular test status or/and defect_type
+        of a particular test status or/and defect_type. All the tests of the launch are
+        fetched once and filtered locally.
 
-        :param str status: Filter tests of a launch with tests `status`
-        :param str defect_type: Filter tests of a launch with tests `defect_type`
+        :param status: Filter tests of a launch with tests `status`, or a list of them
+        :param defect_type: Filter tests of a launch with tests `defect_type`, or a list of them
+        :param str user: Filter tests of a launch with tests case owner `user`
         :returns dict: All filtered tests dict based on params data keyed by test name and test
             properties as value, in format -
             ```{'test_name1':test1_properties_dict, 'test_name2':test2_properties_dict}```
         """
-        page = 1
-        params = self._test_params(status, defect_type, user)
-        total_pages, data = self._test_requester(params=params, page=page)
-        while page < total_pages:
-            page += 1
-            _, pagedata = self._test_requester(params=params, page=page)
-            data.extend(pagedata)
+        match = self._test_filter(status, defect_type, user)
         # formatting tests data to return tests data keyed by test name
-        tests_ = {test['name']: test for test in data}
+        tests_ = {test['name']: test for test in self._all_tests() if match(test)}
         return tests_
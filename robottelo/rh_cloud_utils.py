@@ -1,32 +1,161 @@
 """Utility module for RH cloud inventory tests"""
+import bz2
+import codecs
+import gzip
 import hashlib
 import json
+import lzma
 import os
+import re
 import tarfile
 
 from robottelo import ssh
 
+CHUNK_SIZE = 1024 * 1024
+JSON_CHUNK_SIZE = 64 * 1024
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# tarfile decompresses whole chunks at once in stream mode, these file objects
+# hold bounded buffers
+_DECOMPRESSORS = {
+    b'\xfd7zXZ\x00': lzma.LZMAFile,
+    b'\x1f\x8b': lambda fileobj: gzip.GzipFile(fileobj=fileobj),
+    b'BZh': bz2.BZ2File,
+}
+
+
+class _HashingReader:
+    """File object wrapper updating a hash with the data read"""
+
+    def __init__(self, fileobj, hash_):
+        self._fileobj = fileobj
+        self.hash = hash_
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self.hash.update(data)
+        return data
+
+    def read_all(self):
+        """Read the rest of the file by chunks"""
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+class _JSONStream:
+    """Decode the values of a JSON document read by chunks, holding in memory
+    a chunk and the value being decoded only
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self):
+        data = self._fileobj.read(JSON_CHUNK_SIZE)
+        self._eof = not data
+        text = self._text_decoder.decode(data, final=self._eof)
+        self._buffer = self._buffer[self._pos :] + text  # noqa: E203
+        self._pos = 0
+
+    def peek(self):
+        """Return the next non whitespace character, an empty string at the end"""
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos : self._pos + 1]  # noqa: E203
+            self._read()
+
+    def expect(self, chars):
+        """Consume and return the next character, which must be one of chars"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f'Expecting one of {chars!r}', self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode and return the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            self._read()
+
+
+def count_json_array(fileobj, key):
+    """Returns the number of items of an array in a JSON object, decoding the
+    items one at a time.
+
+    Args:
+        fileobj: binary file object of the JSON document
+        key: key of the array in the JSON object
+    """
+    stream = _JSONStream(fileobj)
+    count = None
+    stream.expect('{')
+    if stream.peek() == '}':
+        stream.expect('}')
+    else:
+        while True:
+            name = stream.value()
+            stream.expect(':')
+            if name == key and stream.peek() == '[':
+                stream.expect('[')
+                count = 0
+                if stream.peek() == ']':
+                    stream.expect(']')
+                else:
+                    while True:
+                        stream.value()
+                        count += 1
+                        if stream.expect(',]') == ']':
+                            break
+            else:
+                stream.value()
+            if stream.expect(',}') == '}':
+                break
+    if stream.peek():
+        raise json.JSONDecodeError('Extra data', '', 0)
+    if count is None:
+        raise KeyError(key)
+    return count
+
 
 def get_host_counts(tarobj):
     """Returns hosts count from tar file.
 
+    The hosts of the report slices are counted without loading the slices.
+    The tar file may be opened in stream mode.
+
     Args:
         tarobj: tar file to get host count from
     """
     metadata_counts = {}
     slices_counts = {}
-    for file_ in tarobj.getmembers():
+    for file_ in tarobj:
         file_name = os.path.basename(file_.name)
         if not file_name.endswith('.json'):
             continue
-        json_data = json.load(tarobj.extractfile(file_))
         if file_name == 'metadata.json':
+            json_data = json.load(tarobj.extractfile(file_))
             metadata_counts = {
                 f'{key}.json': value['number_hosts']
                 for key, value in json_data['report_slices'].items()
             }
         else:
-            slices_counts[file_name] = len(json_data['hosts'])
+            slices_counts[file_name] = count_json_array(tarobj.extractfile(file_), 'hosts')
 
     return {
         'metadata_counts': metadata_counts,
@@ -42,20 +171,26 @@ def get_local_file_data(path):
     """
     size = os.path.getsize(path)
 
+    # the file is read once, by chunks, to hash it and walk the tar members
     with open(path, 'rb') as fh:
-        file_content = fh.read()
-    checksum = hashlib.sha256(file_content).hexdigest()
-
-    try:
-        tarobj = tarfile.open(path, mode='r')
-        host_counts = get_host_counts(tarobj)
-        tarobj.close()
-        extractable = True
-        json_files_parsable = True
-    except (tarfile.TarError, json.JSONDecodeError):
-        host_counts = {}
-        extractable = False
-        json_files_parsable = False
+        magic = fh.read(6)
+        fh.seek(0)
+        reader = _HashingReader(fh, hashlib.sha256())
+        decompressor = next(
+            (value for key, value in _DECOMPRESSORS.items() if magic.startswith(key)), None
+        )
+        try:
+            tar_fileobj = decompressor(reader) if decompressor else reader
+            with tarfile.open(fileobj=tar_fileobj, mode='r|') as tarobj:
+                host_counts = get_host_counts(tarobj)
+            extractable = True
+            json_files_parsable = True
+        except (tarfile.TarError, lzma.LZMAError, OSError, EOFError, json.JSONDecodeError):
+            host_counts = {}
+            extractable = False
+            json_files_parsable = False
+        reader.read_all()
+    checksum = reader.hash.hexdigest()
 
     return {
         'size': size,
@@ -2,7 +2,9 @@
 import base64
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from fnmatch import fnmatch
 from io import StringIO
@@ -14,12 +16,32 @@ from robottelo.config import settings
 from robottelo.logging import logger
 
 
+# Escape codes for colors displayed in the output
+COLOR_CODES_REGEX = re.compile(r'\x1b\[\d\d?m')
+STREAM_CHUNK_SIZE = 32768
+
+
 class SSHCommandTimeoutError(Exception):
     """Raised when the SSH command has not finished executing after a
     predefined period of time.
     """
 
 
+class SSHRunManyError(Exception):
+    """Raised by :func:`run_many` when one or more commands could not be run.
+
+    ``results`` holds, in input order, the :class:`SSHCommandResult` of each
+    command or the exception it raised, and ``errors`` holds the
+    ``(index, cmd, exception)`` of each failed command, also in input order.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+        details = '\n'.join(f'[{index}] {cmd}: {error!r}' for index, cmd, error in errors)
+        super().__init__(f'{len(errors)} of {len(results)} ssh commands failed:\n{details}')
+
+
 def decode_to_utf8(text):  # pragma: no cover
     """Paramiko returns bytes object and we need to ensure it is utf-8 before
     parsing
@@ -53,6 +75,90 @@ class SSHCommandResult:
         return tmpl.format(**self.__dict__)
 
 
+class SSHCommandStream:
+    """Iterate over the stdout lines of a ssh command as they are received.
+
+    The command runs when the stream is iterated. Once the iteration is over
+    ``return_code`` and ``stderr`` are set, and ``stdout`` is always ``None``
+    as lines are not kept, so the stream can be handled like a
+    :class:`SSHCommandResult` afterwards.
+
+    When no connection is given, a pooled connection is held until the
+    iteration is over. kwargs are passed through to get_pooled_connection
+    """
+
+    def __init__(
+        self,
+        cmd,
+        connection=None,
+        output_format=None,
+        timeout=None,
+        connection_timeout=None,
+        **connection_kwargs,
+    ):
+        self.cmd = cmd
+        self.output_format = output_format
+        self.timeout = timeout
+        self.connection_timeout = connection_timeout
+        self.stdout = None
+        self.stderr = None
+        self.return_code = None
+        self._connection = connection
+        self._connection_kwargs = connection_kwargs
+
+    def __iter__(self):
+        if self._connection is not None:
+            yield from self._iter_lines(self._connection)
+        else:
+            with get_pooled_connection(
+                timeout=self.connection_timeout, **self._connection_kwargs
+            ) as connection:
+                yield from self._iter_lines(connection)
+
+    def _clean_line(self, line):
+        line = decode_to_utf8(line)
+        if self.output_format in ('json', 'base', 'plain'):
+            return line
+        return COLOR_CODES_REGEX.sub('', line.replace('""', ''))
+
+    def _iter_lines(self, connection):
+        timeout = self.timeout or settings.ssh_client.command_timeout
+        connection_timeout = self.connection_timeout or settings.ssh_client.connection_timeout
+        logger.info('>>> %s', self.cmd)
+        _, stdout, stderr = connection.exec_command(self.cmd, timeout=connection_timeout)
+        channel = stdout.channel
+        end_time = time.time() + timeout
+        pending = b''
+        stderr_data = b''
+        while True:
+            if channel.recv_ready():
+                pending += channel.recv(STREAM_CHUNK_SIZE)
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    line = self._clean_line(line)
+                    if self.output_format in ('json', 'base', 'plain') or not line.startswith('['):
+                        yield line
+            elif channel.recv_stderr_ready():
+                stderr_data += channel.recv_stderr(STREAM_CHUNK_SIZE)
+            elif channel.exit_status_ready() and not channel.recv_ready():
+                break
+            elif time.time() > end_time:
+                channel.close()
+                raise SSHCommandTimeoutError(
+                    'ssh command: {} \n did not respond in the predefined time '
+                    '(timeout={})'.format(self.cmd, timeout)
+                )
+            else:
+                time.sleep(0.01)
+        if pending:
+            yield self._clean_line(pending)
+        stderr_data += stderr.read()
+        self.return_code = channel.recv_exit_status()
+        self.stderr = COLOR_CODES_REGEX.sub('', decode_to_utf8(stderr_data))
+        if self.stderr:
+            logger.info('<<< stderr\n%s', self.stderr)
+
+
 class SSHClient(paramiko.SSHClient):
     """Extended SSHClient allowing custom methods"""
 
@@ -72,6 +178,13 @@ class SSHClient(paramiko.SSHClient):
         """
         return execute_command(cmd, self, *args, **kwargs)
 
+    def run_many(self, cmds, *args, **kwargs):
+        """Run several commands concurrently over this connection's transport.
+
+        See :func:`run_many` for the accepted arguments.
+        """
+        return run_many(cmds, *args, connection=self, **kwargs)
+
 
 def _call_paramiko_sshclient():  # pragma: no cover
     """Call ``paramiko.SSHClient``.
@@ -168,6 +281,208 @@ def get_connection(
         logger.debug(f'Destroyed Paramiko client {client._id}')
 
 
+class SSHConnectionPool:
+    """Keep idle SSH connections open so they can be reused by later calls.
+
+    Connections are grouped by ``(hostname, port, username, credentials)``
+    and at most ``settings.ssh_client.pool_size`` idle connections are kept
+    for each group. A connection is only handed out again if its transport is
+    still active and it was not idle for longer than
+    ``settings.ssh_client.pool_idle_timeout`` seconds.
+
+    The pool is reset in forked processes (e.g. xdist workers) so a child
+    never writes to a socket owned by its parent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _after_fork(self):
+        """Reset the pool in a forked child, where the lock may have been
+        copied while held by a thread of the parent.
+        """
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _check_pid(self):
+        """Drop connections inherited from the parent process, without
+        closing them as they are still in use by the parent.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+
+    @staticmethod
+    def is_healthy(client):
+        """Return whether the client transport is still usable"""
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def _evict_idle(self, now):
+        idle_timeout = settings.ssh_client.pool_idle_timeout
+        for key, entries in list(self._idle.items()):
+            alive = []
+            for client, last_used in entries:
+                if now - last_used > idle_timeout:
+                    self.evictions += 1
+                    client.close()
+                    logger.debug(f'Evicted idle pooled Paramiko client {client._id}')
+                else:
+                    alive.append((client, last_used))
+            if alive:
+                self._idle[key] = alive
+            else:
+                del self._idle[key]
+
+    def acquire(self, key, **kwargs):
+        """Return a healthy pooled client for ``key`` or connect a new one.
+
+        kwargs are passed through to get_client
+        """
+        client = None
+        with self._lock:
+            self._check_pid()
+            self._evict_idle(time.time())
+            entries = self._idle.get(key, [])
+            while entries:
+                candidate, _ = entries.pop()
+                if self.is_healthy(candidate):
+                    client = candidate
+                    break
+                self.evictions += 1
+                candidate.close()
+            if client is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if client is None:
+            client = get_client(**kwargs)
+            keepalive = settings.ssh_client.keepalive_interval
+            transport = client.get_transport()
+            if keepalive and transport is not None:
+                transport.set_keepalive(keepalive)
+            logger.debug(f'Instantiated pooled Paramiko client {client._id}')
+        return client
+
+    def release(self, key, client):
+        """Return ``client`` to the pool, closing it if the pool is full"""
+        with self._lock:
+            self._check_pid()
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < settings.ssh_client.pool_size and self.is_healthy(client):
+                entries.append((client, time.time()))
+                return
+            if not entries:
+                del self._idle[key]
+        client.close()
+        logger.debug(f'Destroyed pooled Paramiko client {client._id}')
+
+    def discard(self, client):
+        """Close a client that must not be reused"""
+        client.close()
+        logger.debug(f'Destroyed pooled Paramiko client {client._id}')
+
+    def close_all(self):
+        """Close every idle connection held by the pool"""
+        with self._lock:
+            self._check_pid()
+            for entries in self._idle.values():
+                for client, _ in entries:
+                    client.close()
+            self._idle = {}
+
+    def stats(self):
+        """Return the pool counters and the number of idle connections"""
+        with self._lock:
+            self._check_pid()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'idle': sum(len(entries) for entries in self._idle.values()),
+            }
+
+
+_connection_pool = SSHConnectionPool()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_connection_pool._after_fork)
+
+
+def pool_stats():
+    """Return hit/miss/eviction counters of the shared connection pool"""
+    return _connection_pool.stats()
+
+
+def close_pooled_connections():
+    """Close all idle connections of the shared connection pool"""
+    _connection_pool.close_all()
+
+
+@contextmanager
+def get_pooled_connection(
+    hostname=None,
+    username=None,
+    password=None,
+    key_filename=None,
+    key_string=None,
+    timeout=None,
+    port=22,
+):
+    """Yield an ssh connection object taken from the shared connection pool.
+
+    Behaves like :func:`get_connection`, except that the connection is given
+    back to the pool instead of being closed when the caller is done with it.
+    A connection is closed instead when an exception is raised while it is in
+    use, or when ``settings.ssh_client.pool_size`` is 0.
+
+        with get_pooled_connection() as connection:
+            ...
+
+    kwargs are passed through to get_client
+
+    :return: An SSH connection.
+    :rtype: ``paramiko.SSHClient``
+    """
+    if not settings.ssh_client.pool_size:
+        with get_connection(
+            hostname=hostname,
+            username=username,
+            password=password,
+            key_filename=key_filename,
+            key_string=key_string,
+            timeout=timeout,
+            port=port,
+        ) as connection:
+            yield connection
+        return
+    hostname = hostname or settings.server.hostname
+    username = username or settings.server.ssh_username
+    key = (hostname, port, username, password, key_filename, key_string)
+    client = _connection_pool.acquire(
+        key,
+        hostname=hostname,
+        username=username,
+        password=password,
+        key_filename=key_filename,
+        key_string=key_string,
+        timeout=timeout,
+        port=port,
+    )
+    try:
+        yield client
+    except BaseException:
+        _connection_pool.discard(client)
+        raise
+    _connection_pool.release(key, client)
+
+
 @contextmanager
 def get_sftp_session(
     hostname=None, username=None, password=None, key_filename=None, key_string=None, timeout=None
@@ -185,9 +500,9 @@ def get_sftp_session(
       with get_sftp_session() as session:
       ...
 
-    kwargs are passed through to get_connection
+    kwargs are passed through to get_pooled_connection
     """
-    with get_connection(
+    with get_pooled_connection(
         hostname=hostname,
         username=username,
         password=password,
@@ -195,8 +510,8 @@ def get_sftp_session(
         key_string=key_string,
         timeout=timeout,
     ) as connection:
+        sftp = connection.open_sftp()
         try:
-            sftp = connection.open_sftp()
             yield sftp
         finally:
             sftp.close()
@@ -331,12 +646,8 @@ def download_file(remote_file, local_file=None, hostname=None):
     """
     if local_file is None:  # pragma: no cover
         local_file = remote_file
-    with get_connection(hostname=hostname) as connection:  # pragma: no cover
-        try:
-            sftp = connection.open_sftp()
-            sftp.get(remote_file, local_file)
-        finally:
-            sftp.close()
+    with get_sftp_session(hostname=hostname) as sftp:  # pragma: no cover
+        sftp.get(remote_file, local_file)
 
 
 def command(
@@ -350,20 +661,36 @@ def command(
     timeout=None,
     connection_timeout=None,
     port=22,
+    stream=False,
 ):
     """Executes SSH command(s) on remote hostname.
 
-    kwargs are passed through to get_connection
+    kwargs are passed through to get_pooled_connection
 
     :param str cmd: The command to run
     :param str output_format: json, csv or None
     :param int timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
+    :param bool stream: return a SSHCommandStream yielding the stdout lines
+        as they are received instead of a SSHCommandResult.
     """
     hostname = hostname or settings.server.hostname
     timeout = timeout or settings.ssh_client.command_timeout
     connection_timeout = connection_timeout or settings.ssh_client.connection_timeout
-    with get_connection(
+    if stream:
+        return SSHCommandStream(
+            cmd,
+            output_format=output_format,
+            timeout=timeout,
+            connection_timeout=connection_timeout,
+            hostname=hostname,
+            username=username,
+            password=password,
+            key_filename=key_filename,
+            key_string=key_string,
+            port=port,
+        )
+    with get_pooled_connection(
         hostname=hostname,
         username=username,
         password=password,
@@ -375,20 +702,36 @@ def command(
         return execute_command(cmd, connection, output_format, timeout, connection_timeout)
 
 
-def execute_command(cmd, connection, output_format=None, timeout=None, connection_timeout=None):
+def execute_command(
+    cmd, connection=None, output_format=None, timeout=None, connection_timeout=None, stream=False
+):
     """Execute a command via ssh in the given connection
 
     :param cmd: a command to be executed via ssh
-    :param connection: SSH Paramiko client connection
+    :param connection: SSH Paramiko client connection. If not provided a
+        pooled connection to ``server.hostname`` is used.
     :param output_format: base|json|csv|list valid only for hammer commands
     :param timeout: Time to wait for the ssh command to finish.
     :param connection_timeout: Time to wait for establishing the connection.
-    :return: SSHCommandResult
+    :param stream: return a SSHCommandStream yielding the stdout lines as they
+        are received instead of a SSHCommandResult.
+    :return: SSHCommandResult or SSHCommandStream
     """
+    if stream:
+        return SSHCommandStream(
+            cmd,
+            connection=connection,
+            output_format=output_format,
+            timeout=timeout,
+            connection_timeout=connection_timeout,
+        )
     if timeout is None:
         timeout = settings.ssh_client.command_timeout
     if connection_timeout is None:
         connection_timeout = settings.ssh_client.connection_timeout
+    if connection is None:
+        with get_pooled_connection(timeout=connection_timeout) as connection:
+            return execute_command(cmd, connection, output_format, timeout, connection_timeout)
     logger.info('>>> %s', cmd)
     _, stdout, stderr = connection.exec_command(cmd, timeout=connection_timeout)
     if timeout:
@@ -415,10 +758,20 @@ def execute_command(cmd, connection, output_format=None, timeout=None, connectio
 
     errorcode = stdout.channel.recv_exit_status()
 
-    stdout = stdout.read()
-    stderr = stderr.read()
+    return build_command_result(stdout.read(), stderr.read(), errorcode, output_format)
+
+
+def build_command_result(stdout, stderr, return_code, output_format=None):
+    """Build a SSHCommandResult from the raw output of a command
+
+    :param stdout: the command stdout, bytes or str
+    :param stderr: the command stderr, bytes or str
+    :param return_code: the command return code
+    :param output_format: base|json|csv|list valid only for hammer commands
+    :return: SSHCommandResult
+    """
     # Remove escape code for colors displayed in the output
-    regex = re.compile(r'\x1b\[\d\d?m')
+    regex = COLOR_CODES_REGEX
     if stdout:
         # Convert to unicode string
         stdout = decode_to_utf8(stdout)
@@ -436,7 +789,92 @@ def execute_command(cmd, connection, output_format=None, timeout=None, connectio
         stdout = stdout.replace('""', '')
         stdout = ''.join(stdout).split('\n')
         stdout = [regex.sub('', line) for line in stdout if not line.startswith('[')]
-    return SSHCommandResult(stdout, stderr, errorcode, output_format)
+    return SSHCommandResult(stdout, stderr, return_code, output_format)
+
+
+def run_many(
+    cmds,
+    hostname=None,
+    output_format=None,
+    username=None,
+    password=None,
+    key_filename=None,
+    key_string=None,
+    timeout=None,
+    connection_timeout=None,
+    port=22,
+    concurrency=8,
+    connection=None,
+):
+    """Executes several SSH commands concurrently on remote hostname.
+
+    Every command runs in its own channel, all channels are multiplexed over a
+    single transport so only one connection is established. Keep
+    ``concurrency`` below the ``MaxSessions`` setting of the remote sshd
+    (10 by default).
+
+    kwargs are passed through to get_pooled_connection
+
+    :param list cmds: The commands to run
+    :param str output_format: json, csv or None, applied to every command
+    :param timeout: Time to wait for each ssh command to finish, either one
+        value for all the commands or a list with one value per command.
+    :param connection_timeout: Time to wait for establishing the connection.
+    :param int concurrency: Maximum number of channels open at the same time.
+    :param connection: SSH Paramiko client connection to use instead of a
+        pooled one.
+    :return: list of SSHCommandResult, in the same order as ``cmds``
+    :raises SSHRunManyError: if any command failed to run or timed out. The
+        results of the other commands are available on the exception.
+    """
+    cmds = list(cmds)
+    if not cmds:
+        return []
+    if isinstance(timeout, (list, tuple)):
+        if len(timeout) != len(cmds):
+            raise ValueError('timeout list should have one value per command')
+        timeouts = list(timeout)
+    else:
+        timeouts = [timeout] * len(cmds)
+    connection_timeout = connection_timeout or settings.ssh_client.connection_timeout
+    if connection is None:
+        with get_pooled_connection(
+            hostname=hostname,
+            username=username,
+            password=password,
+            key_filename=key_filename,
+            key_string=key_string,
+            timeout=connection_timeout,
+            port=port,
+        ) as connection:
+            return run_many(
+                cmds,
+                output_format=output_format,
+                timeout=timeouts,
+                connection_timeout=connection_timeout,
+                concurrency=concurrency,
+                connection=connection,
+            )
+
+    def _run(cmd, cmd_timeout):
+        return execute_command(cmd, connection, output_format, cmd_timeout, connection_timeout)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(cmds)))) as executor:
+        futures = [
+            executor.submit(_run, cmd, cmd_timeout) for cmd, cmd_timeout in zip(cmds, timeouts)
+        ]
+    results = []
+    errors = []
+    for index, (cmd, future) in enumerate(zip(cmds, futures)):
+        error = future.exception()
+        if error is None:
+            results.append(future.result())
+        else:
+            results.append(error)
+            errors.append((index, cmd, error))
+    if errors:
+        raise SSHRunManyError(results, errors)
+    return results
 
 
 def is_ssh_pub_key(key):
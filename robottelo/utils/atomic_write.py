@@ -0,0 +1,22 @@
+"""Write files shared by processes, like the xdist workers, atomically."""
+import os
+import tempfile
+
+
+def write_atomic(path, content):
+    """Write content to path through a temporary file in the same directory,
+    which then replaces path, so other processes never read a partial file.
+
+    :param path: the path of the file to write
+    :param content: the content, bytes or str encoded as UTF-8
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.partial-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,249 @@
+"""Parse test modules once with :mod:`ast` and index, for the module, its
+classes and functions, the testimony tokens (CaseComponent, CaseImportance,
+Assignee and BZ) of their docstrings and their ``is_open`` usages.
+
+The index of a module is cached with the module mtime, size and hash so
+unchanged modules are not parsed again. When a pytest ``cache`` is given the
+index is persisted across sessions.
+"""
+import ast
+import hashlib
+import inspect
+import os
+import re
+import sys
+import weakref
+
+INDEX_VERSION = 1
+CACHE_KEY = f'robottelo/docstring_index/v{INDEX_VERSION}'
+
+COMPONENT = re.compile(
+    # To match :CaseComponent: FooBar
+    r"\s*:CaseComponent:\s*(?P<component>\S*)",
+    re.IGNORECASE,
+)
+
+IMPORTANCE = re.compile(
+    # To match :CaseImportance: Critical
+    r"\s*:CaseImportance:\s*(?P<importance>\S*)",
+    re.IGNORECASE,
+)
+
+ASSIGNEE = re.compile(
+    # To match :Assignee: jsmith
+    r"\s*:Assignee:\s*(?P<assignee>\S*)",
+    re.IGNORECASE,
+)
+
+BZ = re.compile(
+    # To match :BZ: 123456, 456789
+    r"\s*:BZ:\s*(?P<bz>.*\S*)",
+    re.IGNORECASE,
+)
+
+IS_OPEN = re.compile(
+    # To match `if is_open('BZ:123456'):`
+    r"\s*if\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
+)
+
+NOT_IS_OPEN = re.compile(
+    # To match `if not is_open('BZ:123456'):`
+    r"\s*if\snot\sis_open\(\S(?P<src>\D{2})\s*:\s*(?P<num>\d*)\S\)\d*"
+)
+
+
+def extract_tokens(docstring):
+    """Return the testimony tokens of a docstring, or None without docstring"""
+    if docstring is None:
+        return None
+    tokens = {}
+    for name, regex in (
+        ('component', COMPONENT),
+        ('importance', IMPORTANCE),
+        ('assignee', ASSIGNEE),
+    ):
+        matches = regex.findall(docstring)
+        tokens[name] = matches[0] if matches else None
+    bz_matches = BZ.findall(docstring)
+    tokens['bz'] = [bz.strip() for bz in bz_matches[-1].split(',')] if bz_matches else []
+    return tokens
+
+
+def extract_is_open(source):
+    """Return the ``is_open`` and ``not is_open`` usages of a source code"""
+    if 'is_open(' not in source:
+        return {'is_open': [], 'not_is_open': []}
+    return {'is_open': IS_OPEN.findall(source), 'not_is_open': NOT_IS_OPEN.findall(source)}
+
+
+def parse_module(source):
+    """Index a module source code.
+
+    :return: a dict with the module ``tokens``, ``is_open`` usages and
+        first ``component`` match, and the ``classes`` and ``functions``
+        indexed by qualified name.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    component = COMPONENT.findall(source)
+    index = {
+        'tokens': extract_tokens(ast.get_docstring(tree)),
+        'component': component[0] if component else None,
+        'classes': {},
+        'functions': {},
+        **extract_is_open(source),
+    }
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                qualname = f'{prefix}{child.name}'
+                index['classes'][qualname] = extract_tokens(ast.get_docstring(child))
+                visit(child, f'{qualname}.')
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                first_line = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                function_source = ''.join(lines[first_line - 1 : child.end_lineno])  # noqa: E203
+                index['functions'][f'{prefix}{child.name}'] = {
+                    'tokens': extract_tokens(ast.get_docstring(child)),
+                    **extract_is_open(function_source),
+                }
+
+    visit(tree, '')
+    return index
+
+
+class DocstringIndex:
+    """Index of test modules, parsed on first use.
+
+    :param cache: a pytest ``config.cache`` to persist the index, optional.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._entries = cache.get(CACHE_KEY, {}) if cache is not None else {}
+        self._checked = {}
+        self._dirty = False
+
+    def module(self, path):
+        """Return the index of the module at ``path``, or None when the module
+        can not be read or parsed.
+        """
+        path = os.path.abspath(path)
+        if path in self._checked:
+            return self._checked[path]
+        index = None
+        try:
+            stat = os.stat(path)
+            entry = self._entries.get(path)
+            if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                index = entry['index']
+            else:
+                with open(path, 'rb') as module_file:
+                    content = module_file.read()
+                digest = hashlib.sha1(content).hexdigest()
+                if not entry or entry['sha1'] != digest:
+                    entry = {'sha1': digest, 'index': parse_module(content.decode('utf-8'))}
+                entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+                self._entries[path] = entry
+                self._dirty = True
+                index = entry['index']
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+            index = None
+        self._checked[path] = index
+        return index
+
+    def _module_of(self, obj):
+        return self._module_entry(sys.modules.get(getattr(obj, '__module__', None)))
+
+    def module_tokens(self, module):
+        """Return the testimony tokens of a module docstring"""
+        index = self._module_entry(module)
+        if index is None:
+            return extract_tokens(inspect.getdoc(module))
+        return index['tokens']
+
+    def _module_entry(self, module):
+        path = getattr(module, '__file__', None)
+        return self.module(path) if path else None
+
+    def module_component(self, module):
+        """Return the first CaseComponent token found in a module source"""
+        index = self._module_entry(module)
+        if index is None:
+            component = COMPONENT.findall(inspect.getsource(module))
+            return component[0] if component else None
+        return index['component']
+
+    def module_is_open(self, module):
+        """Return the ``is_open`` and ``not is_open`` usages of a module"""
+        index = self._module_entry(module)
+        if index is None:
+            return extract_is_open(inspect.getsource(module))
+        return {'is_open': index['is_open'], 'not_is_open': index['not_is_open']}
+
+    def class_tokens(self, cls):
+        """Return the testimony tokens of a class docstring"""
+        index = self._module_of(cls)
+        if index is None or cls.__qualname__ not in index['classes']:
+            return extract_tokens(inspect.getdoc(cls))
+        tokens = index['classes'][cls.__qualname__]
+        if tokens is None:
+            # inspect.getdoc falls back to the docstring of the base classes
+            return extract_tokens(inspect.getdoc(cls))
+        return tokens
+
+    def _function_entry(self, function):
+        function = inspect.unwrap(function)
+        code = getattr(function, '__code__', None)
+        if code is None:
+            return function, None
+        index = self.module(code.co_filename)
+        if index is None:
+            return function, None
+        return function, index['functions'].get(function.__qualname__)
+
+    def function_tokens(self, function):
+        """Return the testimony tokens of a function docstring"""
+        function, entry = self._function_entry(function)
+        if entry is None or entry['tokens'] is None:
+            # inspect.getdoc falls back to the docstring of the overridden method
+            return extract_tokens(inspect.getdoc(function))
+        return entry['tokens']
+
+    def function_is_open(self, function):
+        """Return the ``is_open`` and ``not is_open`` usages of a function"""
+        function, entry = self._function_entry(function)
+        if entry is None:
+            try:
+                return extract_is_open(inspect.getsource(function))
+            except (OSError, TypeError):
+                return {'is_open': [], 'not_is_open': []}
+        return {'is_open': entry['is_open'], 'not_is_open': entry['not_is_open']}
+
+    def item_tokens(self, item):
+        """Return the tokens of the function, class and module docstrings of a
+        pytest item, smallest scope first, skipping the missing docstrings.
+        """
+        scopes = [
+            self.function_tokens(item.function),
+            self.class_tokens(item.cls) if getattr(item, 'cls', None) else None,
+            self.module_tokens(item.module),
+        ]
+        return [tokens for tokens in scopes if tokens is not None]
+
+    def save(self):
+        """Persist the index in the pytest cache, when modules were parsed"""
+        if self.cache is not None and self._dirty:
+            self.cache.set(CACHE_KEY, self._entries)
+            self._dirty = False
+
+
+_indexes = weakref.WeakKeyDictionary()
+
+
+def get_index(config):
+    """Return the index shared by the collection hooks of a pytest session"""
+    index = _indexes.get(config)
+    if index is None:
+        index = _indexes[config] = DocstringIndex(getattr(config, 'cache', None))
+    return index
@@ -0,0 +1,289 @@
+"""Caches of the files downloaded by the tests.
+
+:class:`DownloadCache` keeps the downloaded files in the
+``robottelo.download_cache_dir`` directory, shared by the xdist workers. A
+file is downloaded in chunks, straight to the cache, and is downloaded again
+only when the server tells it changed, using the ETag and Last-Modified
+headers of the previous response. The directory holds:
+
+* ``urls/<sha256 of the url>.json``: the url, its ETag and Last-Modified,
+  and the sha256 of its content;
+* ``blobs/<sha256 of the content>``: the content, which modification time is
+  its last use. The least recently used contents are removed once the cache
+  is larger than ``robottelo.download_cache_size`` megabytes.
+
+:class:`RemoteDownloadCache` keeps the same kind of cache on a remote host,
+in the ``robottelo.remote_download_cache_dir`` directory, where the files are
+downloaded by ``wget -N``. Each url has its own directory, holding only the
+file downloaded by wget, whatever name wget gives it.
+"""
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import tempfile
+from pathlib import Path
+
+import requests
+
+from robottelo import ssh
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils.atomic_write import write_atomic
+from robottelo.utils.file_lock import file_lock
+
+# time in seconds to wait for a download, or for another process downloading
+# the same url
+DOWNLOAD_TIMEOUT = 600
+CHUNK_SIZE = 1024 * 1024
+MEGABYTE = 1024 * 1024
+# the cached file of url is refreshed, the command using it is run, then the
+# least recently used files are removed, skipping the files in use
+REMOTE_FETCH_SCRIPT = '''entry={entry}
+mkdir -p "$entry"
+exec 9>"$entry.lock"
+flock -w {timeout} 9 || exit 1
+file=$(find "$entry" -mindepth 1 -maxdepth 1 -type f | head -n 1)
+before=$(stat -c '%Y %s' "$file" 2>/dev/null)
+wget -q -N -P "$entry" {url}
+rc=$?
+file=$(find "$entry" -mindepth 1 -maxdepth 1 -type f | head -n 1)
+# the cached file is used when the server can not be reached
+[ $rc -eq 0 ] || {{ [ $rc -eq 4 ] && [ -n "$file" ]; }} || exit $rc
+[ "$(stat -c '%Y %s' "$file")" = "$before" ] || rm -f "$entry.md5"
+touch "$entry.used"
+{command}
+rc=$?
+exec 9>&-
+total=0
+for used in $(ls -t {cache_dir}/*.used); do
+  other=${{used%.used}}
+  size=$(du -sb "$other" 2>/dev/null | cut -f1)
+  total=$((total + ${{size:-0}}))
+  if [ $total -gt {max_size} ] && [ "$other" != "$entry" ]; then
+    (flock -n 9 && rm -rf "$other" "$other.md5" "$used") 9>"$other.lock"
+  fi
+done
+exit $rc'''
+
+
+def _url_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class DownloadCache:
+    """Local cache of downloaded files, shared by the processes using the
+    same cache directory.
+
+    :param str cache_dir: the cache directory, by default
+        ``robottelo.download_cache_dir``
+    :param int max_size: the cache size in megabytes, by default
+        ``robottelo.download_cache_size``
+    """
+
+    def __init__(self, cache_dir=None, max_size=None):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+    @property
+    def cache_dir(self):
+        return Path(self._cache_dir or settings.robottelo.download_cache_dir)
+
+    @property
+    def max_size(self):
+        """The cache size in bytes"""
+        if self._max_size is None:
+            return settings.robottelo.download_cache_size * MEGABYTE
+        return self._max_size * MEGABYTE
+
+    def _read_meta(self, meta_path):
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not (self.cache_dir / 'blobs' / meta['sha256']).exists():
+            # the content was evicted
+            return {}
+        return meta
+
+    def _store(self, response):
+        """Write the content of response to the cache in chunks, return its
+        sha256
+        """
+        blobs_dir = self.cache_dir / 'blobs'
+        sha256 = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=blobs_dir, prefix='.partial-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    sha256.update(chunk)
+                    temp_file.write(chunk)
+            os.replace(temp_path, blobs_dir / sha256.hexdigest())
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return sha256.hexdigest()
+
+    def fetch(self, url, timeout=DOWNLOAD_TIMEOUT):
+        """Return the path of the cached content of url, downloaded first when
+        missing or changed on the server.
+
+        The cached content is used when the server can not be reached.
+
+        :param str url: the url of the file
+        :param int timeout: the time in seconds to wait for the download
+        :return: the path of the content in the cache, not to be modified
+        :rtype: pathlib.Path
+        """
+        urls_dir = self.cache_dir / 'urls'
+        blobs_dir = self.cache_dir / 'blobs'
+        urls_dir.mkdir(parents=True, exist_ok=True)
+        blobs_dir.mkdir(parents=True, exist_ok=True)
+        key = _url_key(url)
+        meta_path = urls_dir / f'{key}.json'
+        with file_lock(str(urls_dir / f'{key}.lock'), timeout=timeout, name='download_cache'):
+            meta = self._read_meta(meta_path)
+            headers = {}
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+            try:
+                with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                        meta = {
+                            'url': url,
+                            'sha256': self._store(response),
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified'),
+                        }
+                        write_atomic(meta_path, json.dumps(meta))
+            except requests.exceptions.RequestException as err:
+                if not meta or isinstance(err, requests.exceptions.HTTPError):
+                    raise
+                logger.warning(f'Using the cached {url}, unable to validate it: {err}')
+            path = blobs_dir / meta['sha256']
+            os.utime(path)
+        self.evict(keep=path)
+        return path
+
+    def read(self, url, timeout=DOWNLOAD_TIMEOUT):
+        """Return the cached content of url, see :meth:`fetch`
+
+        :rtype: bytes
+        """
+        try:
+            return self.fetch(url, timeout=timeout).read_bytes()
+        except FileNotFoundError:
+            # evicted by another process meanwhile
+            return self.fetch(url, timeout=timeout).read_bytes()
+
+    def copy(self, url, destination, timeout=DOWNLOAD_TIMEOUT):
+        """Copy the cached content of url to destination, see :meth:`fetch`
+
+        :return: destination
+        """
+        try:
+            shutil.copyfile(self.fetch(url, timeout=timeout), destination)
+        except FileNotFoundError:
+            # evicted by another process meanwhile
+            shutil.copyfile(self.fetch(url, timeout=timeout), destination)
+        return destination
+
+    def evict(self, keep=None):
+        """Remove the least recently used contents until the cache fits in its
+        size
+
+        :param keep: the path of a content not to remove
+        """
+        blobs_dir = self.cache_dir / 'blobs'
+        with file_lock(str(self.cache_dir / 'evict.lock'), name='download_cache_evict'):
+            blobs = []
+            for path in blobs_dir.iterdir():
+                if path.name.startswith('.'):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, path))
+            total = 0
+            for _, size, path in sorted(blobs, reverse=True):
+                total += size
+                if total > self.max_size and path != keep:
+                    logger.debug(f'Removing {path.name} from the download cache')
+                    path.unlink()
+
+
+class RemoteDownloadCache:
+    """Cache of downloaded files on a remote host, shared by the processes
+    using the same cache directory.
+
+    :param str hostname: the remote host, by default ``server.hostname``
+    :param str cache_dir: the cache directory on the remote host, by default
+        ``robottelo.remote_download_cache_dir``
+    :param int max_size: the cache size in megabytes, by default
+        ``robottelo.remote_download_cache_size``
+    """
+
+    def __init__(self, hostname=None, cache_dir=None, max_size=None):
+        self.hostname = hostname
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir or settings.robottelo.remote_download_cache_dir
+
+    @property
+    def max_size(self):
+        """The cache size in bytes"""
+        if self._max_size is None:
+            return settings.robottelo.remote_download_cache_size * MEGABYTE
+        return self._max_size * MEGABYTE
+
+    def script(self, url, command, timeout=DOWNLOAD_TIMEOUT):
+        """Return the shell script refreshing the cached file of url, then
+        running command, where ``$file`` is the path of the cached file
+        """
+        entry = f'{self.cache_dir}/{_url_key(url)}'
+        return REMOTE_FETCH_SCRIPT.format(
+            entry=shlex.quote(entry),
+            url=shlex.quote(url),
+            timeout=timeout,
+            cache_dir=shlex.quote(self.cache_dir),
+            max_size=self.max_size,
+            command=command,
+        )
+
+    def copy(self, url, destination, timeout=DOWNLOAD_TIMEOUT):
+        """Copy the cached file of url to destination on the remote host
+
+        :return: the result of the ssh command
+        :rtype: robottelo.ssh.SSHCommandResult
+        """
+        return ssh.command(
+            self.script(url, f'cp "$file" {shlex.quote(destination)}', timeout=timeout),
+            hostname=self.hostname,
+            timeout=timeout,
+        )
+
+    def md5(self, url, timeout=DOWNLOAD_TIMEOUT):
+        """Output the md5 checksum of the cached file of url, computed once
+        by download
+
+        :return: the result of the ssh command
+        :rtype: robottelo.ssh.SSHCommandResult
+        """
+        command = (
+            '[ -s "$entry.md5" ] || md5sum "$file" | cut -d" " -f1 > "$entry.md5"\ncat "$entry.md5"'
+        )
+        return ssh.command(
+            self.script(url, command, timeout=timeout), hostname=self.hostname, timeout=timeout
+        )
+
+
+#: The local download cache used by :mod:`robottelo.helpers`
+download_cache = DownloadCache()
@@ -0,0 +1,142 @@
+"""Inter-process locks on files, using :func:`fcntl.flock`.
+
+A process waiting for a lock retries to lock the file without blocking, at
+intervals growing from a few milliseconds up to a tenth of a second, so it
+takes the lock soon after its release and gives up at the timeout without
+leaving a thread blocked on the file. The time spent waiting for and holding
+the locks is recorded by lock name, see :func:`lock_wait_stats`.
+"""
+import fcntl
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from robottelo.logging import logger
+
+# the bounds in seconds of the interval between two attempts to lock
+_MIN_DELAY = 0.005
+_MAX_DELAY = 0.1
+_wait_stats = {}
+_wait_stats_lock = threading.Lock()
+
+
+class LockTimeoutError(Exception):
+    """Raised when a file lock is not acquired before the timeout"""
+
+
+def _stats(name):
+    return _wait_stats.setdefault(
+        name,
+        {'count': 0, 'waited': 0, 'total': 0.0, 'max': 0.0, 'held': 0.0, 'max_held': 0.0},
+    )
+
+
+def _record_wait(name, duration):
+    with _wait_stats_lock:
+        stats = _stats(name)
+        stats['count'] += 1
+        if duration:
+            stats['waited'] += 1
+            stats['total'] += duration
+            stats['max'] = max(stats['max'], duration)
+
+
+def _record_hold(name, duration):
+    with _wait_stats_lock:
+        stats = _stats(name)
+        stats['held'] += duration
+        stats['max_held'] = max(stats['max_held'], duration)
+
+
+def lock_wait_stats():
+    """Return the time spent by this process waiting for and holding locks
+
+    :returns dict: keyed by lock name, the number of acquisitions, the number
+        of acquisitions that had to wait, the total and max wait in seconds,
+        and the total and max hold time in seconds
+    """
+    with _wait_stats_lock:
+        return {name: dict(stats) for name, stats in _wait_stats.items()}
+
+
+def _try_lock(filenames):
+    """Lock the first of filenames which is not locked, without blocking
+
+    :returns: the locked file handler, None when all of them are locked
+    """
+    for filename in filenames:
+        handler = open(filename, 'a+')
+        try:
+            fcntl.flock(handler.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handler
+        except BlockingIOError:
+            handler.close()
+    return None
+
+
+def _wait_lock(filenames, timeout):
+    """Retry to lock one of filenames until one of them is locked, or
+    timeout
+
+    :returns: the locked file handler, None on timeout
+    """
+    deadline = time.monotonic() + timeout
+    delay = _MIN_DELAY
+    while True:
+        handler = _try_lock(filenames)
+        if handler is not None:
+            return handler
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _MAX_DELAY)
+
+
+@contextmanager
+def file_lock(filename, timeout=20, name=None):
+    """Lock filename exclusively across processes.
+
+    :param str filename: the path of the file to lock, created if missing
+    :param int timeout: the time in seconds to wait for the lock
+    :param str name: the name of the lock in the wait statistics,
+        by default the file name
+    :returns: the file handler, opened in 'a+' mode
+    :raises LockTimeoutError: when the lock is not acquired in time
+    """
+    with file_semaphore([filename], timeout=timeout, name=name) as handler:
+        yield handler
+
+
+@contextmanager
+def file_semaphore(filenames, timeout=20, name=None):
+    """Lock one of filenames exclusively across processes, so that at most
+    as many processes as filenames hold the semaphore at once.
+
+    :param list filenames: the paths of the files to lock, created if missing
+    :param int timeout: the time in seconds to wait for a lock
+    :param str name: the name of the lock in the wait statistics,
+        by default the name of the first file
+    :returns: the file handler of the locked file, opened in 'a+' mode
+    :raises LockTimeoutError: when no lock is acquired in time
+    """
+    if name is None:
+        name = os.path.basename(filenames[0])
+    handler = _try_lock(filenames)
+    waited = 0
+    if handler is None:
+        start = time.monotonic()
+        handler = _wait_lock(filenames, timeout)
+        waited = time.monotonic() - start
+        if handler is None:
+            _record_wait(name, waited)
+            raise LockTimeoutError(f'Unable to lock {", ".join(filenames)} in {timeout} seconds')
+        logger.debug(f'waited {waited:.2f} seconds for lock {name}')
+    _record_wait(name, waited)
+    locked = time.monotonic()
+    try:
+        yield handler
+    finally:
+        handler.close()
+        _record_hold(name, time.monotonic() - locked)
@@ -1,18 +1,27 @@
+import copy
+import json
+import os
 import re
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import requests
 from packaging.version import Version
+from requests.adapters import HTTPAdapter
 from tenacity import retry
 from tenacity import stop_after_attempt
-from tenacity import wait_fixed
+from tenacity import wait_exponential
 
 from robottelo.config import settings
 from robottelo.constants import CLOSED_STATUSES
 from robottelo.constants import OPEN_STATUSES
 from robottelo.constants import WONTFIX_RESOLUTIONS
 from robottelo.logging import logger
+from robottelo.utils.atomic_write import write_atomic
+from robottelo.utils.file_lock import file_lock
 
 
 # match any version as in `sat-6.2.x` or `sat-6.2.0` or `6.2.9`
@@ -132,6 +141,9 @@ def collect_data_bz(collected_data, cached_data):  # pragma: no cover
         [item.partition(':')[-1] for item in collected_data if item.startswith('BZ:')],
         cached_data=cached_data,
     )
+    if not cached_data:
+        # fetch all the duplicates and clones before walking them one by one
+        prefetch_related_bz(bz_data)
     for data in bz_data:
         # If BZ is CLOSED/DUPLICATE collect the duplicate
         collect_dupes(data, collected_data, cached_data=cached_data)
@@ -181,19 +193,161 @@ def collect_clones(bz, collected_data, cached_data=None):  # pragma: no cover
                 collect_clones(clone_data, collected_data, cached_data)
 
 
+def related_bz_numbers(bz):
+    """Return the numbers of the duplicate and clones of a BZ"""
+    numbers = {str(clone) for clone in bz.get('clone_ids') or []}
+    if bz.get('cf_clone_of'):
+        numbers.add(str(bz['cf_clone_of']))
+    if bz.get('resolution') == 'DUPLICATE' and bz.get('dupe_of'):
+        numbers.add(str(bz['dupe_of']))
+    return numbers
+
+
+def prefetch_related_bz(bz_data):  # pragma: no cover
+    """Fetch the duplicates and clones of the given BZs, and theirs, one level
+    at a time so every level is a single batch of concurrent requests.
+
+    Arguments:
+        bz_data {list of dicts} -- BZ data as returned by `get_data_bz`
+    """
+    seen = {str(bz['id']) for bz in bz_data}
+    level = bz_data
+    while level:
+        related = set().union(*map(related_bz_numbers, level)) - seen
+        seen |= related
+        level = get_data_bz(sorted(related)) if related else []
+
+
 # --- API Calls ---
 
 # cannot use lru_cache in functions that has unhashable args
+# BZ data is cached by number in `get_data`
 CACHED_RESPONSES = defaultdict(dict)
 
+BZ_FIELDS = [
+    "id",
+    "summary",
+    "status",
+    "resolution",
+    "cf_last_closed",
+    "last_change_time",
+    "creation_time",
+    "flags",
+    "keywords",
+    "dupe_of",
+    "target_milestone",
+    "cf_clone_of",
+    "clone_ids",
+    "depends_on",
+]
+
+_session = None
+_session_lock = threading.Lock()
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_session():
+    """Return the HTTP session shared by the threads fetching the bugzilla
+    data, its connection pool is sized for the concurrent chunk requests.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=settings.bugzilla.workers)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def _read_cache_file(cache_file):
+    """Return the entries of the BZ cache file younger than
+    `bugzilla.cache_ttl` seconds, indexed by BZ number
+    """
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as cache:
+            entries = json.load(cache)
+    except ValueError:
+        logger.warning(f"Ignoring invalid BZ cache file {cache_file}")
+        return {}
+    expiration = time.time() - settings.bugzilla.cache_ttl
+    return {
+        number: entry for number, entry in entries.items() if entry.get('fetched', 0) > expiration
+    }
+
+
+def load_disk_cache():
+    """Load the BZ data persisted on disk which is younger than
+    `bugzilla.cache_ttl` seconds.
+
+    Returns:
+        {dict} -- BZ data indexed by BZ number
+    """
+    global _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            _disk_cache = _read_cache_file(settings.bugzilla.cache_file)
+        return _disk_cache
+
+
+def save_disk_cache(bz_data):
+    """Add freshly fetched BZ data to the disk cache and write it to
+    `bugzilla.cache_file`, merged with the BZ data written meanwhile by the
+    other processes.
+
+    Arguments:
+        bz_data {list of dicts} -- BZ data as returned by the API
+    """
+    cache_file = settings.bugzilla.cache_file
+    disk_cache = load_disk_cache()
+    with _disk_cache_lock:
+        fetched = time.time()
+        for data in bz_data:
+            disk_cache[str(data['id'])] = {'fetched': fetched, 'data': copy.deepcopy(data)}
+        if not cache_file:
+            return
+        with file_lock(f'{cache_file}.lock', name='bz_cache'):
+            for number, entry in _read_cache_file(cache_file).items():
+                if entry['fetched'] > disk_cache.get(number, {}).get('fetched', 0):
+                    disk_cache[number] = entry
+            write_atomic(cache_file, json.dumps(disk_cache))
+
 
 @retry(
     stop=stop_after_attempt(4),  # Retry 3 times before raising
-    wait=wait_fixed(20),  # Wait seconds between retries
+    wait=wait_exponential(multiplier=1, max=20),  # Wait 1, 2, 4 seconds between retries
 )
+def get_chunk_bz(bz_numbers):  # pragma: no cover
+    """Query Bugzilla REST API for a chunk of BZ numbers.
+
+    Arguments:
+        bz_numbers {list of str} -- ['123456', ...]
+
+    Returns:
+        [list of dicts] -- [{'id':..., 'status':..., 'resolution': ...}]
+    """
+    response = get_session().get(
+        f"{settings.bugzilla.url}/rest/bug",
+        params={
+            "id": ",".join(bz_numbers),
+            "api_key": settings.bugzilla.api_key,
+            "include_fields": ",".join(BZ_FIELDS),
+        },
+    )
+    response.raise_for_status()
+    return response.json().get('bugs')
+
+
 def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
     """Get a list of marked BZ data and query Bugzilla REST API.
 
+    BZ data is cached by number in memory and on disk, only the numbers
+    missing from the caches are requested, in concurrent chunks of
+    `bugzilla.chunk_size` numbers.
+
     Arguments:
         bz_numbers {list of str} -- ['123456', ...]
         cached_data
@@ -204,9 +358,10 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
     if not bz_numbers:
         return []
 
-    cached_by_call = CACHED_RESPONSES['get_data'].get(str(sorted(bz_numbers)))
-    if cached_by_call:
-        return cached_by_call
+    bz_numbers = list(dict.fromkeys(str(number) for number in bz_numbers))
+    cached_by_number = CACHED_RESPONSES['get_data']
+    if all(number in cached_by_number for number in bz_numbers):
+        return [cached_by_number[number] for number in bz_numbers]
 
     if cached_data:
         logger.debug(f"Using cached data for {set(bz_numbers)}")
@@ -224,40 +379,32 @@ def get_data_bz(bz_numbers, cached_data=None):  # pragma: no cover
         # Provide default data for collected BZs
         return [get_default_bz(number) for number in bz_numbers]
 
-    # No cached data so Call Bugzilla API
-    logger.debug(f"Calling Bugzilla API for {set(bz_numbers)}")
-    bz_fields = [
-        "id",
-        "summary",
-        "status",
-        "resolution",
-        "cf_last_closed",
-        "last_change_time",
-        "creation_time",
-        "flags",
-        "keywords",
-        "dupe_of",
-        "target_milestone",
-        "cf_clone_of",
-        "clone_ids",
-        "depends_on",
-    ]
-    # Following fields are dynamically calculated/loaded
-    for field in ('is_open', 'clones', 'version'):
-        assert field not in bz_fields
-
-    response = requests.get(
-        f"{settings.bugzilla.url}/rest/bug",
-        params={
-            "id": ",".join(set(bz_numbers)),
-            "api_key": settings.bugzilla.api_key,
-            "include_fields": ",".join(bz_fields),
-        },
-    )
-    response.raise_for_status()
-    data = response.json().get('bugs')
-    CACHED_RESPONSES['get_data'][str(sorted(bz_numbers))] = data
-    return data
+    # Use the data persisted on disk by previous sessions
+    disk_cache = load_disk_cache()
+    for number in bz_numbers:
+        if number not in cached_by_number and number in disk_cache:
+            cached_by_number[number] = copy.deepcopy(disk_cache[number]['data'])
+
+    missing = [number for number in bz_numbers if number not in cached_by_number]
+    if missing:
+        # No cached data so Call Bugzilla API
+        logger.debug(f"Calling Bugzilla API for {set(missing)}")
+        # Following fields are dynamically calculated/loaded
+        for field in ('is_open', 'clones', 'version'):
+            assert field not in BZ_FIELDS
+
+        chunk_size = settings.bugzilla.chunk_size
+        chunks = [
+            missing[index : index + chunk_size]  # noqa: E203
+            for index in range(0, len(missing), chunk_size)
+        ]
+        with ThreadPoolExecutor(max_workers=settings.bugzilla.workers) as executor:
+            fetched = [bz for chunk in executor.map(get_chunk_bz, chunks) for bz in chunk or []]
+        save_disk_cache(fetched)
+        for data in fetched:
+            cached_by_number[str(data['id'])] = data
+
+    return [cached_by_number[number] for number in bz_numbers if number in cached_by_number]
 
 
 def get_single_bz(number, cached_data=None):  # pragma: no cover
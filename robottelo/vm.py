@@ -9,9 +9,15 @@ make sure that the server have in place: the base images for rhel66 and rhel71,
 snap-guest and its dependencies and the ``image_dir`` path created.
 
 """
+import atexit
 import json
 import os
 import sys
+import threading
+from collections import defaultdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
 from time import sleep
 from urllib.parse import urljoin
 from urllib.parse import urlunsplit
@@ -31,6 +37,7 @@ from robottelo.constants import REPOS
 from robottelo.helpers import install_katello_ca
 from robottelo.helpers import remove_katello_ca
 from robottelo.host_info import get_host_os_version
+from robottelo.libvirt_watch import wait_for_guest_ip
 from robottelo.logging import logger
 
 
@@ -58,6 +65,11 @@ class VirtualMachine:
     as per virtual machine basis. Just set the wanted values when
     instantiating.
 
+    When ``clients.pool_size`` is set, :meth:`create` hands out a virtual
+    machine booted ahead by :data:`vm_pool`, unless a hostname, domain, tag,
+    source or target image is given. The hostname is then the one of the
+    pooled virtual machine.
+
     """
 
     def __init__(
@@ -143,6 +155,19 @@ class VirtualMachine:
             self._target_image = tag + self._target_image
         self.bridge = bridge
         self.network = network
+        self._pool_key = None
+        if type(self) is VirtualMachine and not any(
+            (hostname, domain, tag, source_image, target_image)
+        ):
+            self._pool_key = (
+                self.distro,
+                self.cpu,
+                self.ram,
+                self.provisioning_server,
+                self.image_dir,
+                self.bridge,
+                self.network,
+            )
         if len(self.hostname) > 59:
             raise VirtualMachineError(
                 'Max virtual machine name is 59 chars (see BZ1289363). Name '
@@ -201,7 +226,14 @@ class VirtualMachine:
         """
         if self._created:
             return
+        if self._pool_key is not None and vm_pool.take(self):
+            return
+        start = monotonic()
+        self._boot()
+        vm_pool.record_boot(monotonic() - start)
 
+    def _boot(self):
+        """Run snap-guest and wait for the virtual machine to be reachable"""
         command_args = [
             'snap-guest',
             '-b {source_image}',
@@ -252,46 +284,50 @@ class VirtualMachine:
         else:
             ping_from_hostname = settings.server.hostname
 
-        # Give some time to machine boot
-        for i in range(60):
-            qemu_ga_check = ssh.command(
-                'virsh qemu-agent-command {0} '
-                '\'{{"execute":"guest-network-get-interfaces"}}\''.format(self.hostname),
-                ping_from_hostname,
-                connection_timeout=30,
-            )
-            if qemu_ga_check.return_code != 0:
-                if 'guest agent is not connected' in qemu_ga_check.stderr:
-                    # this means the agent wasn't started yet (vm still booting)
-                    sleep(1)
-                else:
-                    # this means there's another error with agent, e.g. it is not configured
-                    break
-            else:
-                ifaces = json.loads(qemu_ga_check.stdout[0])
-                mgmt_if = next(
-                    (
-                        i
-                        for i in ifaces['return']
-                        if i['hardware-address'].lower() == self.mac.lower()
-                    ),
-                    {},
+        if settings.clients.ip_discovery == 'watch':
+            # a single ssh command watches the addresses of all the guests
+            self.ip_addr = wait_for_guest_ip(ping_from_hostname, self.mac)
+        else:
+            # Give some time to machine boot
+            for i in range(60):
+                qemu_ga_check = ssh.command(
+                    'virsh qemu-agent-command {0} '
+                    '\'{{"execute":"guest-network-get-interfaces"}}\''.format(self.hostname),
+                    ping_from_hostname,
+                    connection_timeout=30,
                 )
-                try:
-                    # get only the ipv4 addresses
-                    self.ip_addr = next(
-                        i['ip-address']
-                        for i in mgmt_if['ip-addresses']
-                        if i['ip-address-type'] == 'ipv4'
+                if qemu_ga_check.return_code != 0:
+                    if 'guest agent is not connected' in qemu_ga_check.stderr:
+                        # this means the agent wasn't started yet (vm still booting)
+                        sleep(1)
+                    else:
+                        # this means there's another error with agent, e.g. it is not configured
+                        break
+                else:
+                    ifaces = json.loads(qemu_ga_check.stdout[0])
+                    mgmt_if = next(
+                        (
+                            i
+                            for i in ifaces['return']
+                            if i['hardware-address'].lower() == self.mac.lower()
+                        ),
+                        {},
                     )
-                    break
-                except (KeyError, StopIteration):
-                    sleep(1)
-                    continue
+                    try:
+                        # get only the ipv4 addresses
+                        self.ip_addr = next(
+                            i['ip-address']
+                            for i in mgmt_if['ip-addresses']
+                            if i['ip-address-type'] == 'ipv4'
+                        )
+                        break
+                    except (KeyError, StopIteration):
+                        sleep(1)
+                        continue
 
         if not self.ip_addr:
             # fallback to avahi in case of any issue with qemu-guest-agent
-            logger.warning('Failed to parse the mgmt IPv4 using qemu-guest-agent, trying Avahi')
+            logger.warning('Failed to get the mgmt IPv4 from libvirt, trying Avahi')
             result = ssh.command(
                 'for i in {{1..60}}; do ping -c1 {0}.local && exit 0; sleep 1;'
                 ' done; exit 1'.format(self._target_image),
@@ -792,3 +828,162 @@ gpgcheck=0'''.format(
 
     def __exit__(self, *exc):
         self.destroy()
+
+
+class VMPool:
+    """Virtual machines booted ahead on the provisioning server
+
+    The first :meth:`VirtualMachine.create` call for a distro, size and
+    network boots the virtual machine as usual, and starts booting
+    ``clients.pool_size`` more of them in background threads. The next
+    calls take a booted virtual machine from the pool, which is refilled
+    at once. The virtual machines taken are destroyed by
+    :meth:`VirtualMachine.destroy` as before, the ones left in the pool by
+    :meth:`shutdown`.
+    """
+
+    def __init__(self, size=None):
+        self._size = size
+        self._lock = threading.Lock()
+        self._ready = defaultdict(deque)
+        self._pending = defaultdict(int)
+        self._futures = set()
+        self._executor = None
+        self._closed = False
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'boots': 0,
+            'failures': 0,
+            'boot_time': 0.0,
+            'max_boot_time': 0.0,
+        }
+
+    @property
+    def size(self):
+        """The number of virtual machines kept booted by pool key"""
+        if self._size is None:
+            return settings.clients.pool_size or 0
+        return self._size
+
+    def take(self, vm):
+        """Give vm the identity of a booted virtual machine of its pool
+
+        :param VirtualMachine vm: the virtual machine to create
+        :returns bool: True when vm was taken from the pool, False when it
+            has to be booted
+        """
+        if not self.size or self._closed:
+            return False
+        with self._lock:
+            ready = self._ready[vm._pool_key]
+            booted = ready.popleft() if ready else None
+            self._stats['misses' if booted is None else 'hits'] += 1
+        self._refill(vm._pool_key)
+        if booted is None:
+            return False
+        for attr in ('_target_image', 'mac', 'ip_addr', 'nw_type', 'bridge', 'network'):
+            setattr(vm, attr, getattr(booted, attr))
+        vm._created = True
+        logger.info(f'Took virtual machine {vm.hostname} from the pool')
+        return True
+
+    def record_boot(self, duration):
+        """Record the time spent booting a virtual machine"""
+        with self._lock:
+            self._stats['boots'] += 1
+            self._stats['boot_time'] += duration
+            self._stats['max_boot_time'] = max(self._stats['max_boot_time'], duration)
+
+    def _refill(self, key):
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.size - len(self._ready[key]) - self._pending[key]
+            if missing <= 0:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix='vm_pool'
+                )
+                atexit.register(self.shutdown)
+            self._pending[key] += missing
+            for _ in range(missing):
+                future = self._executor.submit(self._boot, key)
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+
+    def _boot(self, key):
+        distro, cpu, ram, provisioning_server, image_dir, bridge, network = key
+        vm = None
+        try:
+            vm = VirtualMachine(
+                cpu=cpu,
+                ram=ram,
+                distro=distro,
+                provisioning_server=provisioning_server,
+                image_dir=image_dir,
+                bridge=bridge,
+                network=network,
+            )
+            start = monotonic()
+            vm._boot()
+            self.record_boot(monotonic() - start)
+        except Exception as err:
+            logger.warning(f'Failed to boot a virtual machine for the pool: {err}')
+            with self._lock:
+                self._pending[key] -= 1
+                self._stats['failures'] += 1
+            return
+        with self._lock:
+            self._pending[key] -= 1
+            if not self._closed:
+                self._ready[key].append(vm)
+                return
+        vm.destroy()
+
+    def stats(self):
+        """Return the pool statistics
+
+        :returns dict: the number of virtual machines taken from the pool
+            (hits) and booted on create (misses), the hit rate, the number of
+            boots and failed background boots, the total and max boot time in
+            seconds, and the number of booted virtual machines by distro
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            depth = defaultdict(int)
+            for key, ready in self._ready.items():
+                depth[key[0]] += len(ready)
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+        stats['depth'] = dict(depth)
+        return stats
+
+    def shutdown(self):
+        """Stop booting and destroy the virtual machines left in the pool"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            executor, self._executor = self._executor, None
+            booted = [vm for ready in self._ready.values() for vm in ready]
+            self._ready.clear()
+        if executor is None:
+            return
+        for future in list(self._futures):
+            future.cancel()
+        stats = self.stats()
+        logger.info(
+            f'VM pool: {stats["hits"]} hits, {stats["misses"]} misses '
+            f'({stats["hit_rate"]:.0%}), {stats["boots"]} boots in '
+            f'{stats["boot_time"]:.1f}s, {stats["max_boot_time"]:.1f}s at most, '
+            f'{stats["failures"]} failed, {len(booted)} left in the pool'
+        )
+        for vm in booted:
+            vm.destroy()
+        executor.shutdown(wait=True)
+
+
+#: The virtual machines pool used by :meth:`VirtualMachine.create`
+vm_pool = VMPool()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Compare the CSV and JSON create paths of the CLI factories.
+
+Every ``make_*`` factory of ``robottelo.cli.factory`` that can run without
+options, or with only an organization id, is called ``--rounds`` times with
+``performance.create_from_json`` disabled and then enabled. Each mode runs in
+its own process as settings are read once per process.
+
+For each factory the mean time, the number of hammer commands and, for the
+JSON mode, the fields that only the follow-up ``info`` command provides are
+printed. A factory using missing fields must create its entity with
+``fetch_info=True``.
+
+Usage::
+
+    $ python scripts/benchmark_cli_create.py --rounds 5
+
+"""
+import argparse
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+
+SKIPPED_FACTORIES = ('make_fake_host', 'make_host', 'make_job_invocation', 'make_virt_who_config')
+
+
+def run_factories(rounds):
+    """Run the factories in the mode configured by the environment and print
+    the measurements as JSON.
+    """
+    from robottelo.cli import factory
+    from robottelo.cli.base import Base
+    from robottelo.cli.factory import CLIFactoryError
+
+    calls = Counter()
+    created_fields = {}
+    missing_fields = {}
+    execute = Base.execute.__func__
+    info_after_create = Base._info_after_create.__func__
+
+    def counting_execute(cls, *args, **kwargs):
+        calls[cls.command_sub] += 1
+        result = execute(cls, *args, **kwargs)
+        if cls.command_sub == 'create' and kwargs.get('output_format') == 'json':
+            created_fields[cls.__name__] = set(result)
+        return result
+
+    def comparing_info_after_create(cls, obj_id, options):
+        new_obj = info_after_create(cls, obj_id, options)
+        if cls.__name__ in created_fields:
+            missing_fields[cls.__name__] = sorted(set(new_obj) - created_fields[cls.__name__])
+        return new_obj
+
+    Base.execute = classmethod(counting_execute)
+    Base._info_after_create = classmethod(comparing_info_after_create)
+
+    org = factory.make_org()
+    results = {}
+    for name, make in inspect.getmembers(factory, inspect.isfunction):
+        if not name.startswith('make_') or name in SKIPPED_FACTORIES:
+            continue
+        calls.clear()
+        durations = []
+        try:
+            for _ in range(rounds):
+                start = time.time()
+                try:
+                    make()
+                except CLIFactoryError:
+                    make({'organization-id': org['id']})
+                durations.append(time.time() - start)
+        except Exception as err:
+            results[name] = {'error': repr(err)}
+            continue
+        results[name] = {
+            'mean': sum(durations) / len(durations),
+            'commands': sum(calls.values()) / rounds,
+        }
+    print(json.dumps({'results': results, 'missing_fields': missing_fields}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rounds', type=int, default=3, help='calls per factory and mode')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_factories(args.rounds)
+        return
+
+    modes = {}
+    for mode in ('false', 'true'):
+        env = dict(os.environ, ROBOTTELO_PERFORMANCE__CREATE_FROM_JSON=f'@bool {mode}')
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--run', '--rounds', str(args.rounds)], env=env
+        )
+        modes[mode] = json.loads(output.decode('utf-8').splitlines()[-1])
+
+    csv_results = modes['false']['results']
+    json_results = modes['true']['results']
+    print(f'{"factory":40} {"csv (s)":>9} {"json (s)":>9} {"csv cmds":>9} {"json cmds":>9}')
+    for name in sorted(csv_results):
+        csv_result, json_result = csv_results[name], json_results.get(name, {})
+        if 'error' in csv_result or 'error' in json_result:
+            print(f'{name:40} error: {csv_result.get("error") or json_result.get("error")}')
+            continue
+        print(
+            f'{name:40} {csv_result["mean"]:9.2f} {json_result["mean"]:9.2f} '
+            f'{csv_result["commands"]:9.1f} {json_result["commands"]:9.1f}'
+        )
+    print('\nFields only provided by info after a JSON create:')
+    for cli_class, fields in sorted(modes['true']['missing_fields'].items()):
+        print(f'{cli_class:40} {", ".join(fields) or "-"}')
+
+
+if __name__ == '__main__':
+    main()
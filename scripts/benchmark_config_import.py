@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Measure the cost of importing ``robottelo.config`` and of the first settings
+access, which reads and validates the configuration.
+
+Every round runs in a new process, as the import cost is paid once per
+process: by pytest, every xdist worker and every script.
+
+Usage::
+
+    $ python scripts/benchmark_config_import.py --rounds 10 --setting server.hostname
+
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MEASURE = '''
+import json, time
+start = time.perf_counter()
+import robottelo.config
+imported = time.perf_counter()
+value = robottelo.config.settings
+for name in {setting!r}.split('.'):
+    value = getattr(value, name)
+accessed = time.perf_counter()
+print(json.dumps([imported - start, accessed - imported]))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rounds', type=int, default=5, help='number of processes to run')
+    parser.add_argument(
+        '--setting', default='server.hostname', help='setting read after the import'
+    )
+    args = parser.parse_args()
+    imports, accesses = [], []
+    for _ in range(args.rounds):
+        output = subprocess.check_output(
+            [sys.executable, '-c', MEASURE.format(setting=args.setting)],
+            stderr=subprocess.DEVNULL,
+        )
+        import_time, access_time = json.loads(output.decode('utf-8').splitlines()[-1])
+        imports.append(import_time)
+        accesses.append(access_time)
+    print(f'{"step":20} {"mean (s)":>9} {"max (s)":>9}')
+    print(f'{"import":20} {sum(imports) / len(imports):9.3f} {max(imports):9.3f}')
+    print(f'{"first access":20} {sum(accesses) / len(accesses):9.3f} {max(accesses):9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Compare the peak memory of the full and streaming hammer output parsers.
+
+A hammer ``list`` output of ``--rows`` rows is generated locally, in CSV and
+JSON, and parsed as ``Base.list`` does it:
+
+* full: the whole stdout is read, split in lines and parsed to a list, as
+  ``ssh.execute_command`` and ``hammer.parse_csv``/``hammer.parse_json`` do;
+* stream: lines are produced one by one and consumed through
+  ``hammer.parse_csv_iter``/``hammer.parse_json_iter``, as
+  ``Base.list(stream=True)`` does.
+
+Usage::
+
+    $ python scripts/benchmark_hammer_parsing.py --rows 100000
+
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from robottelo.cli import hammer
+
+
+def generate_rows(count):
+    for index in range(count):
+        yield {
+            'Id': index,
+            'Name': f'host-{index}.example.com',
+            'Operating System': 'RedHat 7.9',
+            'Host Group': 'hostgroup/with/a/long/title',
+            'IP': f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}',
+            'MAC': f'52:54:00:00:{index // 256 % 256:02x}:{index % 256:02x}',
+            'Global Status': 'OK',
+        }
+
+
+def csv_lines(count):
+    header = None
+    for row in generate_rows(count):
+        if header is None:
+            header = list(row)
+            yield ','.join(header)
+        yield ','.join(str(row[key]) for key in header)
+
+
+def json_lines(count):
+    yield '['
+    for index, row in enumerate(generate_rows(count)):
+        item = json.dumps(row, indent=2) + (',' if index < count - 1 else '')
+        for line in item.splitlines():
+            yield f'  {line}'
+    yield ']'
+
+
+def full_csv(count):
+    stdout = '\n'.join(csv_lines(count))
+    return len(hammer.parse_csv(stdout.split('\n')))
+
+
+def stream_csv(count):
+    return sum(1 for _ in hammer.parse_csv_iter(csv_lines(count)))
+
+
+def full_json(count):
+    stdout = '\n'.join(json_lines(count))
+    return len(hammer.parse_json(stdout))
+
+
+def stream_json(count):
+    return sum(1 for _ in hammer.parse_json_iter(json_lines(count)))
+
+
+def measure(parse, count):
+    tracemalloc.start()
+    start = time.time()
+    rows = parse(count)
+    duration = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert rows == count, f'{parse.__name__} parsed {rows} rows out of {count}'
+    return duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=50000, help='number of rows to parse')
+    args = parser.parse_args()
+    print(f'{"parser":12} {"time (s)":>9} {"peak (MiB)":>11}')
+    for parse in (full_csv, stream_csv, full_json, stream_json):
+        duration, peak = measure(parse, args.rows)
+        print(f'{parse.__name__:12} {duration:9.2f} {peak / 2 ** 20:11.1f}')
+
+
+if __name__ == '__main__':
+    main()
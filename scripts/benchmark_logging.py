@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Measure the time the logging threads spend logging, with the file handler
+run synchronously or by the log listener thread.
+
+``--records`` debug records are logged to a file in a temporary directory, by
+``--threads`` threads at once:
+
+* off: the logger level is above DEBUG, the records are discarded at once;
+* sync: the file handler is attached to the logger, as before the log queue;
+* queued: the file handler is run by the log listener thread, as
+  ``robottelo.logging`` does it, with the queue size and policy of logging.yaml.
+
+The time to write the queued records to the file once logged is reported as
+drain. ``--latency`` adds a wait to each record written, as on a network file
+system or with ReportPortal: the logging threads do not wait for it as long as
+the records fit in the queue.
+
+Usage::
+
+    $ python scripts/benchmark_logging.py --records 100000 --threads 4
+    $ python scripts/benchmark_logging.py --records 10000 --latency 0.0001
+
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from robottelo.logging import defaultFormatter
+from robottelo.logging import LogListener
+from robottelo.logging import logging_yaml
+from robottelo.logging import LogQueueHandler
+
+
+class SlowFileHandler(logging.FileHandler):
+    """File handler waiting latency seconds for each record"""
+
+    latency = 0
+
+    def emit(self, record):
+        if self.latency:
+            time.sleep(self.latency)
+        super().emit(record)
+
+
+def log_records(logger, records, threads):
+    """Log records debug records from threads threads, return the time spent"""
+
+    def target():
+        for index in range(records // threads):
+            logger.debug('Executing command %s on host %s', index, 'sat.example.com')
+
+    workers = [threading.Thread(target=target) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--records', type=int, default=100000, help='number of records')
+    parser.add_argument('--threads', type=int, default=1, help='number of logging threads')
+    parser.add_argument(
+        '--latency', type=float, default=0, help='seconds to wait for each record written'
+    )
+    args = parser.parse_args()
+    SlowFileHandler.latency = args.latency
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        for mode in ('off', 'sync', 'queued'):
+            logger = logging.getLogger(f'robottelo.benchmark.{mode}')
+            logger.propagate = False
+            logger.setLevel(logging.INFO if mode == 'off' else logging.DEBUG)
+            file_handler = SlowFileHandler(os.path.join(log_dir, f'{mode}.log'))
+            file_handler.setFormatter(defaultFormatter)
+            listener = None
+            if mode == 'queued':
+                listener = LogListener(logging_yaml.queue.size, logging_yaml.queue.policy)
+                listener.start()
+                logger.addHandler(LogQueueHandler(listener, [file_handler]))
+            else:
+                logger.addHandler(file_handler)
+            elapsed = log_records(logger, args.records, args.threads)
+            start = time.perf_counter()
+            if listener is not None:
+                listener.stop()
+            drain = time.perf_counter() - start
+            file_handler.close()
+            results.append((mode, elapsed, drain, listener.dropped if listener else 0))
+    print(
+        f'{"mode":8} {"logging (s)":>12} {"per record (us)":>16} {"drain (s)":>10} {"dropped":>8}'
+    )
+    for mode, elapsed, drain, dropped in results:
+        print(
+            f'{mode:8} {elapsed:12.3f} {elapsed / args.records * 1e6:16.2f} '
+            f'{drain:10.3f} {dropped:8}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Measure the time of a settings lookup through ``SettingsFacade``, with an in
+memory configuration so only the facade itself is measured:
+
+* hit: ``SettingsFacade.get`` of a cached setting;
+* miss: ``SettingsFacade.get`` of a setting dropped from the cache, read from
+  the configuration provider;
+* computed: the same for a computed setting, found in the dispatch table;
+* section: the same for a setting of the robottelo section;
+* wrapper: ``settings.server.hostname``, through ``SettingsNodeWrapper``, as
+  the tests read the settings.
+
+Usage::
+
+    $ python scripts/benchmark_settings_lookup.py --lookups 1000000
+
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+from robottelo.config.facade import SettingsFacade
+from robottelo.config.facade import SettingsNodeWrapper
+
+
+class Section(SimpleNamespace):
+    def keys(self):
+        return self.__dict__.keys()
+
+
+def measure(lookup, lookups):
+    """Return the time in seconds spent by lookups calls of lookup"""
+    start = time.perf_counter()
+    for _ in range(lookups):
+        lookup()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lookups', type=int, default=100000, help='lookups per case')
+    args = parser.parse_args()
+    # the configuration providers of robottelo.config are not used
+    SettingsFacade._setup_hooks = []
+    facade = SettingsFacade()
+    facade.set_configs(
+        SimpleNamespace(
+            server=SimpleNamespace(hostname='sat.example.com', port=None, scheme='https'),
+            robottelo=Section(verbosity='info', tmp_dir='/tmp'),
+            repos=Section(capsule_repo='http://repo.example.com'),
+        )
+    )
+    settings = SettingsNodeWrapper(facade)
+
+    def miss(key):
+        def lookup():
+            facade.invalidate(key)
+            facade.get(key)
+
+        return lookup
+
+    cases = {
+        'hit': lambda: facade.get('server.hostname'),
+        'miss': miss('server.hostname'),
+        'computed': miss('configured'),
+        'section': miss('tmp_dir'),
+        'wrapper': lambda: settings.server.hostname,
+    }
+    print(f'{"case":10} {"total (s)":>10} {"per lookup (us)":>16}')
+    for name, lookup in cases.items():
+        lookup()
+        duration = measure(lookup, args.lookups)
+        print(f'{name:10} {duration:10.3f} {duration / args.lookups * 1e6:16.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+"""Tests for module ``robottelo.utils.atomic_write``."""
+from unittest import mock
+
+import pytest
+
+from robottelo.utils.atomic_write import write_atomic
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / 'cache.json'
+    write_atomic(str(path), '{"é": 1}')
+    assert path.read_text(encoding='utf-8') == '{"é": 1}'
+    write_atomic(path, b'replaced')
+    assert path.read_bytes() == b'replaced'
+    assert [child.name for child in tmp_path.iterdir()] == ['cache.json']
+
+
+def test_write_atomic_failure(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_bytes(b'kept')
+    with mock.patch('os.replace', side_effect=OSError('disk full')):
+        with pytest.raises(OSError):
+            write_atomic(path, b'lost')
+    assert path.read_bytes() == b'kept'
+    assert [child.name for child in tmp_path.iterdir()] == ['cache.json']
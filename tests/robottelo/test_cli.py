@@ -3,12 +3,16 @@ from unittest import mock
 
 import pytest
 import unittest2
+from wait_for import wait_for
 
 from robottelo.cli.base import Base
 from robottelo.cli.base import CLIBaseError
 from robottelo.cli.base import CLIDataBaseError
 from robottelo.cli.base import CLIError
 from robottelo.cli.base import CLIReturnCodeError
+from robottelo.cli.hammer_shell import HammerShell
+from robottelo.cli.hammer_shell import HammerShellError
+from robottelo.cli.hammer_shell import HammerShellStartError
 
 
 class CLIClass(Base):
@@ -18,6 +22,19 @@ class CLIClass(Base):
     foreman_admin_password = 'adminpassword'
 
 
+class ListCLIClass(Base):
+    """Class used for the list pagination tests"""
+
+    command_base = 'thing'
+    command_requires_org = False
+
+
+class OrgListCLIClass(ListCLIClass):
+    """Class used for the list pagination tests requiring an organization"""
+
+    command_requires_org = True
+
+
 class BaseCliTestCase(unittest2.TestCase):
     """Tests for the Base cli class"""
 
@@ -216,10 +233,59 @@ class BaseCliTestCase(unittest2.TestCase):
         construct.called_once_with({})
         execute.called_once_with(construct.return_value, output_format='csv')
 
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_from_json_with_info(self, construct, execute, info, settings):
+        """Check create from JSON output fetches the record when its create
+        output is incomplete
+        """
+        settings.performance.create_from_json = True
+        execute.return_value = {'message': 'Created.', 'id': 'foo', 'name': 'bar'}
+        info.return_value = {'id': 'foo', 'name': 'bar', 'label': 'baz'}
+        Base.command_requires_org = False
+        assert info.return_value == Base.create(fetch_info=True)
+        execute.assert_called_once_with(construct.return_value, output_format='json', timeout=None)
+        info.assert_called_once_with({'id': 'foo'})
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_from_json_without_info(self, construct, execute, info, settings):
+        """Check create from JSON output skips info unless asked to fetch it"""
+        settings.performance.create_from_json = True
+        execute.return_value = {'message': 'Created.', 'id': 'foo', 'name': 'bar'}
+        assert {'id': 'foo', 'name': 'bar'} == Base.create()
+        assert {'id': 'foo', 'name': 'bar'} == Base.create(fetch_info=False)
+        assert not info.called
+
+    @mock.patch('robottelo.cli.base.settings')
+    @mock.patch('robottelo.cli.base.Base.info')
+    @mock.patch('robottelo.cli.base.Base.execute')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_add_create_from_json_not_a_record(self, construct, execute, info, settings):
+        """Check create from JSON output handles a list of records or a
+        message the same way as a record
+        """
+        settings.performance.create_from_json = True
+        execute.return_value = [{'id': 'foo', 'name': 'bar'}]
+        info.return_value = {'id': 'foo', 'name': 'bar', 'label': 'baz'}
+        Base.command_requires_org = False
+        assert {'id': 'foo', 'name': 'bar'} == Base.create(fetch_info=False)
+        assert not info.called
+        assert info.return_value == Base.create(fetch_info=True)
+        info.assert_called_once_with({'id': 'foo'})
+        info.reset_mock()
+        execute.return_value = ''
+        assert '' == Base.create(fetch_info=True)
+        assert not info.called
+
     def assert_cmd_execution(
         self, construct, execute, base_method, cmd_sub, ignore_stderr=False, **base_method_kwargs
     ):
-        """Asssert Base class method successfully executed """
+        """Asssert Base class method successfully executed"""
         assert execute.return_value == base_method(**base_method_kwargs)
         assert cmd_sub == Base.command_sub
         construct.called_once_with({})
@@ -283,6 +349,62 @@ class BaseCliTestCase(unittest2.TestCase):
         handle_resp.assert_called_once_with(command.return_value, ignore_stderr=None)
         assert response is handle_resp.return_value
 
+    @mock.patch('robottelo.cli.hammer_shell.get_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_shell_backend(self, settings, command, get_session):
+        """Check command is sent to the hammer shell session"""
+        settings.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.hammer_backend = 'shell'
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        response = Base.execute('some_cmd', output_format='csv', return_raw_response=True)
+        get_session.assert_called_once_with(
+            settings.server.hostname, user='admin', password='password', locale='en_US'
+        )
+        get_session.return_value.run.assert_called_once_with(
+            'some_cmd', output_format='csv', timeout=None
+        )
+        command.assert_not_called()
+        assert response is get_session.return_value.run.return_value
+
+    @mock.patch('robottelo.cli.hammer_shell.get_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_shell_backend_fallback(self, settings, command, get_session):
+        """Check command falls back to one-shot execution when it could not be
+        sent to the shell
+        """
+        settings.locale = 'en_US'
+        settings.performance.time_hammer = False
+        settings.performance.hammer_backend = 'shell'
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        get_session.return_value.run.side_effect = HammerShellStartError('not usable')
+        response = Base.execute('some_cmd', return_raw_response=True)
+        ssh_cmd = 'LANG=en_US  hammer -v -u admin -p password  some_cmd'
+        command.assert_called_once_with(
+            ssh_cmd.encode('utf-8'),
+            hostname=None,
+            output_format=None,
+            timeout=None,
+            connection_timeout=None,
+        )
+        assert response is command.return_value
+
+    @mock.patch('robottelo.cli.hammer_shell.get_session')
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_with_shell_backend_desync(self, settings, command, get_session):
+        """Check command is not run again once sent to an out of sync shell"""
+        settings.performance.time_hammer = False
+        settings.performance.hammer_backend = 'shell'
+        get_session.return_value.run.side_effect = HammerShellError('out of sync')
+        with pytest.raises(HammerShellError):
+            Base.execute('some_cmd', return_raw_response=True)
+        command.assert_not_called()
+
     @mock.patch('robottelo.cli.base.Base.list')
     def test_exists_without_option_and_empty_return(self, lst_method):
         """Check exists method without options and empty return"""
@@ -360,6 +482,83 @@ class BaseCliTestCase(unittest2.TestCase):
         )
         self.assert_cmd_execution(construct, execute, list_with_per_page_false, 'list')
 
+    @mock.patch('robottelo.cli.base.Base.execute_stream')
+    @mock.patch('robottelo.cli.base.Base._construct_command')
+    def test_list_stream(self, construct, execute_stream):
+        """Check list returns the parsed output stream"""
+        Base.command_requires_org = False
+        assert execute_stream.return_value == Base.list(stream=True)
+        execute_stream.assert_called_once_with(construct.return_value, output_format='csv')
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_iter_list(self, execute):
+        """Check pages are requested lazily until a short page is returned"""
+        pages = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}, {'id': '4'}], [{'id': '5'}]]
+        execute.side_effect = pages
+        entities = ListCLIClass.iter_list({'search': 'name=foo'}, page_size=2)
+        execute.assert_not_called()
+        assert next(entities) == {'id': '1'}
+        assert execute.call_count == 1
+        assert [entity['id'] for entity in entities] == ['2', '3', '4', '5']
+        assert execute.call_args_list == [
+            mock.call(
+                f'thing list --search="name=foo" --per-page="2" --page="{page}"',
+                output_format='csv',
+            )
+            for page in (1, 2, 3)
+        ]
+
+    @mock.patch('robottelo.cli.base.Base.execute')
+    def test_iter_list_prefetch(self, execute):
+        """Check the next page is requested before the current one is consumed"""
+        execute.side_effect = [[{'id': '1'}, {'id': '2'}], [{'id': '3'}, {'id': '4'}], []]
+        entities = ListCLIClass.iter_list({'page': 3}, page_size=2, prefetch=True)
+        assert next(entities) == {'id': '1'}
+        wait_for(lambda: execute.call_count == 2, timeout=5, delay=0.01)
+        assert [entity['id'] for entity in entities] == ['2', '3', '4']
+        assert execute.call_count == 3
+        assert [call[0][0] for call in execute.call_args_list] == [
+            f'thing list --per-page="2" --page="{page}"' for page in (3, 4, 5)
+        ]
+
+    def test_iter_list_checks_options(self):
+        """Check iter_list validates its options before the iteration starts"""
+        with pytest.raises(CLIError):
+            OrgListCLIClass.iter_list()
+        with pytest.raises(CLIError):
+            ListCLIClass.iter_list(page_size=0)
+
+    @mock.patch('robottelo.cli.base.ssh.command')
+    @mock.patch('robottelo.cli.base.settings')
+    def test_execute_stream(self, settings, command):
+        """Check output is parsed lazily and the return code checked at the end"""
+        settings.locale = 'en_US'
+        settings.server.admin_username = 'admin'
+        settings.server.admin_password = 'password'
+        stream = mock.MagicMock()
+        stream.__iter__.return_value = iter(['Id,Name', '1,foo', '2,bar'])
+        stream.return_code = 0
+        stream.stderr = ''
+        command.return_value = stream
+        rows = Base.execute_stream('some_cmd')
+        assert next(rows) == {'id': '1', 'name': 'foo'}
+        assert list(rows) == [{'id': '2', 'name': 'bar'}]
+        ssh_cmd = 'LANG=en_US  hammer -v -u admin -p password --output=csv some_cmd'
+        command.assert_called_once_with(
+            ssh_cmd.encode('utf-8'),
+            hostname=None,
+            output_format='csv',
+            timeout=None,
+            connection_timeout=None,
+            stream=True,
+        )
+        stream.__iter__.return_value = iter([])
+        stream.return_code = 1
+        with pytest.raises(CLIReturnCodeError):
+            list(Base.execute_stream('some_cmd'))
+        with pytest.raises(CLIError):
+            Base.execute_stream('some_cmd', output_format='base')
+
     @mock.patch('robottelo.cli.base.Base.execute')
     @mock.patch('robottelo.cli.base.Base._construct_command')
     def test_puppet_classes(self, construct, execute):
@@ -428,3 +627,116 @@ class CLIBaseErrorTestCase(unittest2.TestCase):
         """Check if message is exposed to assertRaisesRegex"""
         with pytest.raises(CLIBaseError, match='msg'):
             raise CLIBaseError(1, 'stderr', 'msg')
+
+
+class FakeShellChannel:
+    """Emulates the ssh channel of a ``hammer shell`` session"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.closed = False
+        self.stdout = b''
+        self.stderr = b''
+
+    def exit_status_ready(self):
+        return False
+
+    def sendall(self, data):
+        _, first_token, second_token, _ = data.decode('utf-8').split('\n')
+        stdout, stderr = self.responses.pop(0)
+        self.stdout += f'hammer> {stdout}'.encode('utf-8')
+        for token in (first_token, second_token):
+            stderr += f'Error: unknown command {token}\nSee: hammer --help\n'
+        self.stderr += stderr.encode('utf-8')
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv(self, size):
+        data, self.stdout = self.stdout[:size], self.stdout[size:]
+        return data
+
+    def recv_stderr(self, size):
+        data, self.stderr = self.stderr[:size], self.stderr[size:]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class LateShellChannel(FakeShellChannel):
+    """Emulates a channel where the last stderr line of each command arrives
+    after the sync lines
+    """
+
+    late = b''
+
+    def sendall(self, data):
+        super().sendall(data)
+        self.stderr, self.late = self.stderr[:-20], self.stderr[-20:]
+
+    def recv_stderr_ready(self):
+        if not self.stderr and self.late:
+            # ready on the next poll
+            self.stderr, self.late = self.late, b''
+            return False
+        return bool(self.stderr)
+
+
+class HammerShellTestCase(unittest2.TestCase):
+    """Tests for the hammer shell session"""
+
+    def shell(self, responses):
+        shell = HammerShell('example.com', 'admin', 'password', 'en_US')
+        shell._channel = FakeShellChannel(responses)
+        return shell
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_run_frames_output(self, settings):
+        shell = self.shell([('Id,Name\n1,org\n', ''), ('', 'Warning: deprecated\n')])
+        result = shell.run('organization list', output_format='csv')
+        assert result.return_code == 0
+        assert result.stdout == [{'id': '1', 'name': 'org'}]
+        assert result.stderr == ''
+        result = shell.run('organization info --id 1', output_format='base')
+        assert result.return_code == 0
+        assert result.stderr == 'Warning: deprecated\n'
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_run_error_return_code(self, settings):
+        shell = self.shell([('', 'Could not find organization\n')])
+        result = shell.run('organization info --id 0')
+        assert result.return_code == 1
+        assert result.stderr == 'Could not find organization\n'
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_run_late_sync_error(self, settings):
+        """The error of the sync lines arriving late is not taken for the
+        error of the next command
+        """
+        shell = HammerShell('example.com', 'admin', 'password', 'en_US')
+        shell._channel = LateShellChannel([('', ''), ('', '')])
+        for _ in range(2):
+            result = shell.run('organization list')
+            assert result.return_code == 0
+            assert result.stderr == ''
+
+    def test_run_desync(self):
+        shell = self.shell([('', 'Error: unknown command __robottelo_sync_0\n')])
+        channel = shell._channel
+        with pytest.raises(HammerShellError):
+            shell.run('organization list')
+        assert channel.closed
+        assert shell._channel is None
+
+    @mock.patch('robottelo.cli.hammer_shell.ssh.get_client')
+    def test_run_start_failure(self, get_client):
+        shell = HammerShell('example.com', 'admin', 'password', 'en_US')
+        get_client.side_effect = OSError('connection refused')
+        with pytest.raises(HammerShellStartError):
+            shell.run('organization list')
+        with pytest.raises(HammerShellStartError):
+            shell.run('organization list\norganization info')
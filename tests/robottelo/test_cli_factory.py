@@ -0,0 +1,70 @@
+"""Tests for the batch functions of module ``robottelo.cli.factory``."""
+import pytest
+
+from robottelo.cli import factory
+
+
+def make_fake(options=None):
+    """A factory returning its options, as worker processes can only run
+    module level functions
+    """
+    if options.get('fail'):
+        raise factory.CLIFactoryError(f'Failed to create {options["name"]}')
+    return {'id': f'id-{options["name"]}', **options}
+
+
+class TestMakeMany:
+    """Tests for ``make_many`` and ``make_entity_graph``."""
+
+    def test_results_in_input_order(self):
+        results = factory.make_many(make_fake, [{'name': str(i)} for i in range(10)])
+        assert [result['id'] for result in results] == [f'id-{i}' for i in range(10)]
+
+    def test_errors_in_input_order(self):
+        options = [{'name': '0'}, {'name': '1', 'fail': True}, {'name': '2', 'fail': True}]
+        with pytest.raises(factory.CLIFactoryBatchError) as context:
+            factory.make_many(make_fake, options, concurrency=2)
+        error = context.value
+        assert [index for index, _ in error.errors] == [1, 2]
+        assert 'Failed to create 1' in str(error.errors[0][1])
+        assert error.results[0]['id'] == 'id-0'
+        assert isinstance(error.results[2], factory.CLIFactoryError)
+
+    def test_requirements(self):
+        results = factory.make_entity_graph(
+            [
+                {'factory': make_fake, 'options': {'name': 'repo'}, 'requires': {'product': 2}},
+                {'factory': make_fake, 'options': {'name': 'org'}},
+                {
+                    'factory': make_fake,
+                    'options': {'name': 'product'},
+                    'requires': {'org': 1, 'org-name': (1, 'name')},
+                },
+            ]
+        )
+        assert results[0]['product'] == 'id-product'
+        assert results[2]['org'] == 'id-org'
+        assert results[2]['org-name'] == 'org'
+
+    def test_failed_requirement(self):
+        with pytest.raises(factory.CLIFactoryBatchError) as context:
+            factory.make_entity_graph(
+                [
+                    {'factory': make_fake, 'options': {'name': 'org', 'fail': True}},
+                    {'factory': make_fake, 'options': {'name': 'product'}, 'requires': {'o': 0}},
+                    {'factory': make_fake, 'options': {'name': 'other'}},
+                ]
+            )
+        assert [index for index, _ in context.value.errors] == [0, 1]
+        assert context.value.results[2]['id'] == 'id-other'
+
+    def test_invalid_requirements(self):
+        with pytest.raises(ValueError):
+            factory.make_entity_graph([{'factory': make_fake, 'options': {}, 'requires': {'a': 1}}])
+        with pytest.raises(ValueError):
+            factory.make_entity_graph(
+                [
+                    {'factory': make_fake, 'options': {'name': '0'}, 'requires': {'a': 1}},
+                    {'factory': make_fake, 'options': {'name': '1'}, 'requires': {'a': 0}},
+                ]
+            )
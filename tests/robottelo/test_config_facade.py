@@ -0,0 +1,140 @@
+"""Tests for module ``robottelo.config.facade``."""
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from robottelo.config.facade import SettingsFacade
+from robottelo.config.facade import SettingsNodeWrapper
+
+
+class CountingConfig:
+    """Configuration provider counting the attribute reads"""
+
+    def __init__(self, **sections):
+        self.reads = 0
+        self._sections = sections
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        self.reads += 1
+        try:
+            return self._sections[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class Section(SimpleNamespace):
+    def keys(self):
+        return self.__dict__.keys()
+
+
+@pytest.fixture
+def facade():
+    configs, hooks = SettingsFacade._configs, SettingsFacade._setup_hooks
+    SettingsFacade._setup_hooks = []
+    config = CountingConfig(
+        server=SimpleNamespace(hostname='sat.example.com', port=None, scheme='https'),
+        robottelo=Section(verbosity='info', tmp_dir='/tmp'),
+        repos=Section(capsule_repo='http://repo.example.com'),
+    )
+    facade = SettingsFacade()
+    facade.set_configs(config)
+    yield facade
+    SettingsFacade.set_configs(*configs)
+    SettingsFacade._setup_hooks = hooks
+
+
+def test_get_caches_value(facade):
+    assert facade.get('server.hostname') == 'sat.example.com'
+    reads = facade._configs[0].reads
+    assert facade.get('server.hostname') == 'sat.example.com'
+    assert facade._configs[0].reads == reads
+
+
+def test_get_computed_value(facade):
+    assert facade.get('configured') is True
+    assert facade.get('server.get_url')() == 'https://sat.example.com'
+
+
+def test_get_section_value(facade):
+    assert facade.get('tmp_dir') == '/tmp'
+    assert facade.get('capsule_repo') == 'http://repo.example.com'
+
+
+def test_get_missing_value(facade):
+    with pytest.raises(AttributeError):
+        facade.get('server.missing')
+    reads = facade._configs[0].reads
+    with pytest.raises(AttributeError):
+        facade.get('server.missing')
+    assert facade._configs[0].reads == reads
+
+
+def test_invalidate(facade):
+    server = facade._configs[0]._sections['server']
+    assert facade.get('server.hostname') == 'sat.example.com'
+    with pytest.raises(AttributeError):
+        facade.get('server.missing')
+    server.hostname = 'sat2.example.com'
+    server.missing = 'found'
+    facade.invalidate('server.port')
+    assert facade.get('server.hostname') == 'sat.example.com'
+    facade.invalidate('server')
+    assert facade.get('server.hostname') == 'sat2.example.com'
+    assert facade.get('server.missing') == 'found'
+    server.hostname = 'sat3.example.com'
+    facade.invalidate()
+    assert SettingsNodeWrapper(facade).server.hostname == 'sat3.example.com'
+
+
+def test_on_first_access(facade):
+    hook = mock.Mock()
+    facade.on_first_access(hook)
+    facade.get('server.hostname')
+    facade.get('server.port')
+    hook.assert_called_once_with()
+
+
+def test_on_first_access_failure(facade):
+    hook = mock.Mock(side_effect=[RuntimeError('not ready'), None])
+    facade.on_first_access(hook)
+    with pytest.raises(RuntimeError):
+        facade.get('server.hostname')
+    assert facade.get('server.hostname') == 'sat.example.com'
+    assert hook.call_count == 2
+    facade.get('server.port')
+    assert hook.call_count == 2
+
+
+def test_on_first_access_reads_settings(facade):
+    """A hook reading the settings does not run the hooks again"""
+    hook = mock.Mock(side_effect=lambda: facade.get('server.hostname'))
+    facade.on_first_access(hook)
+    assert facade.get('server.port') is None
+    hook.assert_called_once_with()
+
+
+def test_on_first_access_threads(facade):
+    """The threads reading a setting wait for the hooks to run"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def hook():
+        started.set()
+        release.wait(5)
+        facade._configs[0]._sections['server'].hostname = 'sat2.example.com'
+
+    facade.on_first_access(hook)
+    first = threading.Thread(target=facade.get, args=('server.port',))
+    first.start()
+    assert started.wait(5)
+    results = []
+    second = threading.Thread(target=lambda: results.append(facade.get('server.hostname')))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert results == ['sat2.example.com']
@@ -54,6 +54,28 @@ class TestSettings:
             assert settings.server.hostname == 'example.com'
             assert settings.server.ssh_password == '1234'
 
+    @mock.patch(builtin_open, new_callable=lambda: get_valid_ini)
+    def test_configure_lazy(self, mock_open):
+        with mock.patch('os.path.isfile', return_value=True):
+            settings = Settings()
+            settings.configure(lazy=True)
+            assert settings.configured
+            assert 'server' in settings._unread_features
+            assert 'server' in dir(settings)
+            assert 'server' in settings.all_features
+            assert settings.server.hostname == 'example.com'
+            assert 'server' not in settings._unread_features
+            with pytest.raises(AttributeError):
+                settings.missing
+
+    @mock.patch(builtin_open, new_callable=lambda: get_invalid_ini)
+    def test_configure_lazy_validation_error(self, mock_open):
+        with mock.patch('os.path.isfile', return_value=True):
+            settings = Settings()
+            settings.configure(lazy=True)
+            assert settings.server.hostname is None
+            assert settings._validation_errors
+
 
 class FakeOpen:
     def __init__(self, lines, *args, **kwargs):
@@ -0,0 +1,116 @@
+"""Tests for module ``robottelo.utils.docstring_index``."""
+import os
+from unittest import mock
+
+from robottelo.utils import docstring_index
+from robottelo.utils.docstring_index import DocstringIndex
+
+MODULE_SOURCE = '''"""Module docstring
+
+:CaseComponent: Repositories
+
+:Assignee: jsmith
+"""
+from robottelo.utils.issue_handlers import is_open
+
+
+def setup_module():
+    if not is_open('BZ:111'):
+        pass
+
+
+class TestFoo:
+    """Class docstring
+
+    :CaseImportance: High
+    """
+
+    @decorator
+    def test_foo(self):
+        """Function docstring
+
+        :CaseImportance: Critical
+
+        :BZ: 123, 456
+        """
+        if is_open('BZ:789'):
+            pass
+
+    def test_bar(self):
+        pass
+'''
+
+
+class FakeCache(dict):
+    """pytest cache storing values in a dict"""
+
+    def get(self, key, default):
+        return super().get(key, default)
+
+    def set(self, key, value):
+        self[key] = value
+
+
+def test_parse_module():
+    index = docstring_index.parse_module(MODULE_SOURCE)
+    assert index['tokens'] == {
+        'component': 'Repositories',
+        'importance': None,
+        'assignee': 'jsmith',
+        'bz': [],
+    }
+    assert index['component'] == 'Repositories'
+    assert index['is_open'] == [('BZ', '789')]
+    assert index['not_is_open'] == [('BZ', '111')]
+    assert index['classes']['TestFoo']['importance'] == 'High'
+    test_foo = index['functions']['TestFoo.test_foo']
+    assert test_foo['tokens']['importance'] == 'Critical'
+    assert test_foo['tokens']['bz'] == ['123', '456']
+    assert test_foo['is_open'] == [('BZ', '789')]
+    assert test_foo['not_is_open'] == []
+    assert index['functions']['TestFoo.test_bar']['tokens'] is None
+    assert index['functions']['setup_module']['not_is_open'] == [('BZ', '111')]
+
+
+def test_index_cache(tmp_path):
+    module_path = tmp_path / 'test_module.py'
+    module_path.write_text(MODULE_SOURCE)
+    cache = FakeCache()
+    with mock.patch.object(
+        docstring_index, 'parse_module', wraps=docstring_index.parse_module
+    ) as parse_module:
+        index = DocstringIndex(cache)
+        assert index.module(str(module_path))['component'] == 'Repositories'
+        index.save()
+        assert parse_module.call_count == 1
+        assert cache[docstring_index.CACHE_KEY]
+
+        # a new session reuses the persisted index, even when only the mtime changed
+        os.utime(module_path, ns=(0, 0))
+        assert DocstringIndex(cache).module(str(module_path))['component'] == 'Repositories'
+        assert parse_module.call_count == 1
+
+        module_path.write_text(MODULE_SOURCE.replace('Repositories', 'Hosts'))
+        assert DocstringIndex(cache).module(str(module_path))['component'] == 'Hosts'
+        assert parse_module.call_count == 2
+
+
+def test_index_invalid_module(tmp_path):
+    module_path = tmp_path / 'test_module.py'
+    module_path.write_text('def broken(:\n')
+    assert DocstringIndex().module(str(module_path)) is None
+    assert DocstringIndex().module(str(tmp_path / 'missing.py')) is None
+
+
+def test_get_index_per_config():
+    class Config:
+        cache = None
+
+    first, second = Config(), Config()
+    indexes = len(docstring_index._indexes)
+    index = docstring_index.get_index(first)
+    assert docstring_index.get_index(first) is index
+    assert docstring_index.get_index(second) is not index
+    # the index of a config is dropped with it
+    del first
+    assert len(docstring_index._indexes) == indexes + 1
@@ -0,0 +1,167 @@
+"""Tests for module ``robottelo.utils.download_cache``."""
+import hashlib
+import os
+import subprocess
+import time
+from unittest import mock
+
+import pytest
+
+from robottelo import ssh
+from robottelo.utils import download_cache
+
+URL = 'http://example.com/pub/file.rpm'
+FAKE_WGET = '''#!/bin/bash
+# wget -q -N -P directory url, copying the newer files from FAKE_WGET_ROOT
+# named like wget does, with the query string
+path="${5%%\\?*}"
+src="$FAKE_WGET_ROOT/${path##*/}"
+[ -f "$src" ] || exit 8
+cp -p -u "$src" "$4/${5##*/}"
+'''
+
+
+@pytest.fixture
+def server():
+    """Serve the contents with an ETag, in chunks"""
+    contents = {URL: b'content' * 10}
+
+    def get(url, headers=None, timeout=None, stream=False):
+        content = contents[url]
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        response = mock.MagicMock(status_code=200, headers={'ETag': etag})
+        if headers.get('If-None-Match') == etag:
+            response.status_code = 304
+        elif content is None:
+            response.status_code = 404
+            response.raise_for_status.side_effect = download_cache.requests.HTTPError()
+        response.iter_content.side_effect = lambda size: iter([content[:8], content[8:]])
+        response.__enter__.return_value = response
+        return response
+
+    with mock.patch.object(download_cache.requests, 'get', side_effect=get) as server:
+        server.contents = contents
+        yield server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return download_cache.DownloadCache(cache_dir=str(tmp_path / 'cache'), max_size=1)
+
+
+def test_fetch(cache, server, tmp_path):
+    path = cache.fetch(URL)
+    assert path.read_bytes() == server.contents[URL]
+    assert path.name == hashlib.sha256(server.contents[URL]).hexdigest()
+    assert cache.fetch(URL) == path
+    assert 'If-None-Match' in server.call_args[1]['headers']
+    assert server.call_args[1]['stream']
+    server.contents[URL] = b'changed'
+    destination = str(tmp_path / 'file.rpm')
+    assert cache.copy(URL, destination) == destination
+    with open(destination, 'rb') as downloaded:
+        assert downloaded.read() == b'changed'
+
+
+def test_fetch_shared_content(cache, server):
+    server.contents['http://mirror.example.com/file.rpm'] = server.contents[URL]
+    assert cache.fetch(URL) == cache.fetch('http://mirror.example.com/file.rpm')
+    assert len(list((cache.cache_dir / 'blobs').iterdir())) == 1
+
+
+def test_fetch_unreachable(cache, server):
+    path = cache.fetch(URL)
+    server.side_effect = download_cache.requests.exceptions.ConnectionError()
+    assert cache.fetch(URL) == path
+    server.side_effect = None
+    server.return_value = mock.MagicMock()
+    server.return_value.__enter__.return_value.raise_for_status.side_effect = (
+        download_cache.requests.HTTPError()
+    )
+    server.return_value.__enter__.return_value.status_code = 404
+    with pytest.raises(download_cache.requests.HTTPError):
+        cache.fetch(URL)
+
+
+def test_evict(cache, server):
+    urls = [f'http://example.com/{index}.iso' for index in range(3)]
+    for index, url in enumerate(urls):
+        server.contents[url] = bytes([index]) * (download_cache.MEGABYTE // 2)
+    paths = []
+    for url in urls:
+        paths.append(cache.fetch(url))
+        time.sleep(0.01)
+    # the least recently used content is removed
+    assert [path.exists() for path in paths] == [False, True, True]
+    # and downloaded again when needed
+    assert cache.fetch(urls[0]).exists()
+    assert not paths[1].exists()
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Run the remote cache commands locally, with a fake wget"""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    (bin_dir / 'wget').write_text(FAKE_WGET)
+    (bin_dir / 'wget').chmod(0o755)
+    root = tmp_path / 'server'
+    root.mkdir()
+    env = dict(os.environ, PATH=f'{bin_dir}:{os.environ["PATH"]}', FAKE_WGET_ROOT=str(root))
+
+    def command(cmd, hostname=None, timeout=None):
+        process = subprocess.run(['bash', '-c', cmd], capture_output=True, env=env)
+        return ssh.SSHCommandResult(
+            stdout=process.stdout.decode().splitlines(),
+            stderr=process.stderr.decode(),
+            return_code=process.returncode,
+        )
+
+    with mock.patch.object(download_cache.ssh, 'command', side_effect=command):
+        yield download_cache.RemoteDownloadCache(
+            'host.example.com', cache_dir=str(tmp_path / 'remote'), max_size=1
+        ), root
+
+
+def test_remote_copy(remote, tmp_path):
+    cache, root = remote
+    (root / 'file.rpm').write_bytes(b'content')
+    destination = tmp_path / 'copy.rpm'
+    assert cache.copy(URL, str(destination)).return_code == 0
+    assert destination.read_bytes() == b'content'
+    # the server can not be reached
+    (root / 'file.rpm').unlink()
+    result = cache.copy('http://example.com/pub/missing.rpm', str(destination))
+    assert result.return_code == 8
+
+
+def test_remote_md5(remote):
+    cache, root = remote
+    (root / 'file.rpm').write_bytes(b'content')
+    result = cache.md5(URL)
+    assert result.stdout == [hashlib.md5(b'content').hexdigest()]
+    (root / 'file.rpm').write_bytes(b'changed')
+    os.utime(root / 'file.rpm', (time.time() + 10, time.time() + 10))
+    assert cache.md5(URL).stdout == [hashlib.md5(b'changed').hexdigest()]
+
+
+def test_remote_query_string(remote, tmp_path):
+    cache, root = remote
+    (root / 'file.rpm').write_bytes(b'content')
+    url = f'{URL}?token=secret'
+    destination = tmp_path / 'copy.rpm'
+    assert cache.copy(url, str(destination)).return_code == 0
+    assert destination.read_bytes() == b'content'
+    assert cache.md5(url).stdout == [hashlib.md5(b'content').hexdigest()]
+
+
+def test_remote_evict(remote, tmp_path):
+    cache, root = remote
+    urls = [f'http://example.com/{index}.iso' for index in range(3)]
+    for index, url in enumerate(urls):
+        (root / f'{index}.iso').write_bytes(b'x' * (download_cache.MEGABYTE // 3))
+        assert cache.copy(url, str(tmp_path / 'copy.iso')).return_code == 0
+        time.sleep(0.01)
+    entries = sorted(path.name for path in (tmp_path / 'remote').glob('*.used'))
+    assert len(entries) == 2
+    assert f'{download_cache._url_key(urls[0])}.used' not in entries
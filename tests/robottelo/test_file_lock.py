@@ -0,0 +1,89 @@
+"""Tests for module ``robottelo.utils.file_lock``."""
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from robottelo.utils import file_lock
+
+
+def _hold_lock(path, locked, duration):
+    with file_lock.file_lock(path, timeout=5):
+        locked.set()
+        time.sleep(duration)
+
+
+@pytest.fixture
+def holder(tmp_path):
+    """Start a process holding the lock of a file for 1 second"""
+    path = str(tmp_path / 'test.lock')
+    locked = multiprocessing.Event()
+    process = multiprocessing.Process(target=_hold_lock, args=(path, locked, 1))
+    process.start()
+    assert locked.wait(5)
+    yield path
+    process.join()
+
+
+def test_file_lock(tmp_path):
+    path = str(tmp_path / 'test.lock')
+    with file_lock.file_lock(path, name='test_lock') as handler:
+        handler.write('locked')
+    stats = file_lock.lock_wait_stats()['test_lock']
+    assert stats['count'] >= 1
+    with open(path) as lock_file:
+        assert lock_file.read() == 'locked'
+
+
+def test_file_lock_wait(holder):
+    start = time.monotonic()
+    with file_lock.file_lock(holder, timeout=5, name='test_lock_wait'):
+        waited = time.monotonic() - start
+    # the waiter retries at short intervals
+    assert 0.5 < waited < 1.5
+    stats = file_lock.lock_wait_stats()['test_lock_wait']
+    assert stats['waited'] == 1
+    assert stats['total'] == stats['max'] == pytest.approx(waited, abs=0.1)
+
+
+def test_file_lock_timeout(holder):
+    threads = threading.active_count()
+    with pytest.raises(file_lock.LockTimeoutError):
+        with file_lock.file_lock(holder, timeout=0.2):
+            pass
+    # no waiter is left behind to take the lock once released
+    assert threading.active_count() == threads
+    with file_lock.file_lock(holder, timeout=2):
+        pass
+
+
+def test_file_semaphore(holder, tmp_path):
+    free = str(tmp_path / 'free.lock')
+    start = time.monotonic()
+    with file_lock.file_semaphore([holder, free], timeout=5, name='test_semaphore') as handler:
+        # the free slot is taken at once
+        assert handler.name == free
+        assert time.monotonic() - start < 0.5
+        with file_lock.file_semaphore([holder, free], timeout=5) as second:
+            # both slots were locked, the first one released wins
+            assert second.name == holder
+            assert time.monotonic() - start > 0.5
+    stats = file_lock.lock_wait_stats()['test_semaphore']
+    assert stats['waited'] == 0
+    assert stats['held'] == stats['max_held'] > 0.5
+
+
+def test_file_semaphore_timeout(tmp_path):
+    slots = [str(tmp_path / f'slot{index}.lock') for index in range(3)]
+    threads = threading.active_count()
+    with file_lock.file_semaphore(slots), file_lock.file_semaphore(slots):
+        with file_lock.file_semaphore(slots) as last:
+            with pytest.raises(file_lock.LockTimeoutError):
+                with file_lock.file_semaphore(slots, timeout=0.2):
+                    pass
+            # the slots are polled by the caller, no thread waits for them
+            assert threading.active_count() == threads
+        # the released slot is free for the next waiter
+        with file_lock.file_semaphore(slots, timeout=0.2) as handler:
+            assert handler.name == last.name
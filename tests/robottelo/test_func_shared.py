@@ -1,15 +1,21 @@
+import json
 import multiprocessing
 import os
+import threading
 import time
+from types import SimpleNamespace
+from unittest import mock
 
 import pytest
 from fauxfactory import gen_integer
 from fauxfactory import gen_string
 
+from robottelo.decorators.func_shared import redis_storage
 from robottelo.decorators.func_shared.file_storage import get_temp_dir
 from robottelo.decorators.func_shared.file_storage import TEMP_FUNC_SHARED_DIR
 from robottelo.decorators.func_shared.file_storage import TEMP_ROOT_DIR
 from robottelo.decorators.func_shared.shared import _NAMESPACE_SCOPE_KEY_TYPE
+from robottelo.decorators.func_shared.redis_storage import RedisStorageHandler
 from robottelo.decorators.func_shared.shared import _set_configured
 from robottelo.decorators.func_shared.shared import enable_shared_function
 from robottelo.decorators.func_shared.shared import set_default_scope
@@ -128,7 +134,7 @@ def simple_shared_counter_with_exception(index=0):
 
 @shared
 def basic_shared_counter(index=0, increment_by=1):
-    """used with use_shared_data=False """
+    """used with use_shared_data=False"""
     return index + increment_by
 
 
@@ -141,7 +147,7 @@ def basic_shared_counter_string(prefix='', suffix='', counter=0, increment_by=1)
 
 
 class NotRestorableException(Exception):
-    """ this exception is not restorable as need mote args"""
+    """this exception is not restorable as need mote args"""
 
     def __init__(self, msg, details):
         self.msg = msg
@@ -551,3 +557,107 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+
+class FakeRedis:
+    """In memory redis client running the storage handler scripts"""
+
+    def __init__(self, connection_pool=None):
+        self.data = {}
+        self.calls = 0
+        self.published = threading.Condition()
+
+    def register_script(self, script):
+        if script == redis_storage.GET_OR_CLAIM_SCRIPT:
+            return self._get_or_claim
+        return self._release
+
+    def _get_or_claim(self, keys, args):
+        self.calls += 1
+        if keys[0] in self.data:
+            return self.data[keys[0]]
+        if keys[1] not in self.data:
+            self.data[keys[1]] = args[0]
+            return 1
+        return 0
+
+    def _release(self, keys, args):
+        self.calls += 1
+        if self.data.get(keys[0]) == args[0]:
+            del self.data[keys[0]]
+        with self.published:
+            self.published.notify_all()
+
+    def get(self, key):
+        self.calls += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.calls += 1
+        self.data[key] = value
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        client = self
+
+        class PubSub:
+            subscribe = close = mock.Mock()
+
+            def get_message(self, timeout):
+                with client.published:
+                    client.published.wait(timeout)
+
+        return PubSub()
+
+
+class TestRedisStorageHandler:
+    @pytest.fixture
+    def handler(self):
+        fake_redis = SimpleNamespace(
+            StrictRedis=FakeRedis,
+            ConnectionPool=mock.Mock,
+            exceptions=SimpleNamespace(LockError=TimeoutError),
+        )
+        with mock.patch.object(redis_storage, 'redis', fake_redis):
+            yield RedisStorageHandler(lock_timeout=SIMPLE_TIMEOUT_VALUE)
+        redis_storage._connection_pools.clear()
+
+    def test_encode_decode(self, handler):
+        value = {'state': 'READY', 'result': list(range(100))}
+        encoded = handler.encode(value)
+        assert len(encoded) < len(json.dumps(value))
+        assert handler.decode(encoded) == value
+        # values stored without compression are still readable
+        assert handler.decode(b'{"state": "READY"}') == {'state': 'READY'}
+
+    def test_claim(self, handler):
+        with handler.claim('key') as value:
+            assert value is None
+            handler.set('key', {'result': 1}, timeout=10)
+        assert 'key.lock' not in handler.client.data
+        calls = handler.client.calls
+        with handler.claim('key') as value:
+            assert value == {'result': 1}
+        # the ready value is read in one round-trip
+        assert handler.client.calls == calls + 1
+
+    def test_claim_wait(self, handler):
+        handler.client.data['key.lock'] = 'other'
+
+        def compute():
+            time.sleep(0.5)
+            handler.client.data['key'] = handler.encode({'result': 1})
+            handler.client._release(keys=['key.lock'], args=['other', 'key.ready'])
+
+        thread = threading.Thread(target=compute)
+        thread.start()
+        start = time.monotonic()
+        with handler.claim('key') as value:
+            assert value == {'result': 1}
+        thread.join()
+        assert time.monotonic() - start < SIMPLE_TIMEOUT_VALUE
+
+    def test_claim_wait_timeout(self, handler):
+        handler.client.data['key.lock'] = 'other'
+        with pytest.raises(TimeoutError):
+            with handler.claim('key'):
+                pass
@@ -20,6 +20,21 @@ class TestParseCSV:
             {'header': 'unicode', 'header-2': 'chårs'},
         ]
 
+    def test_parse_csv_iter(self):
+        output_lines = [
+            'Puppet and OSTree will no longer be supported in Katello 3.16',
+            'Header,Header 2',
+            'header value 1,header with spaces value',
+            '',
+            '"""double quote escaped value""","," escaped value',
+        ]
+        rows = hammer.parse_csv_iter(iter(output_lines))
+        assert next(rows) == {'header': 'header value 1', 'header-2': 'header with spaces value'}
+        assert list(rows) == [
+            {'header': '"double quote escaped value"', 'header-2': ', escaped value'}
+        ]
+        assert list(hammer.parse_csv_iter([])) == []
+
 
 class TestParseJSON:
     """Tests for parsing JSON hammer output"""
@@ -107,6 +122,40 @@ class TestParseJSON:
 
         assert hammer.parse_json(json_output) == hammer.parse_csv(csv_ouput_lines)[0]
 
+    def test_parse_json_iter(self):
+        """Output generated with:
+        hammer -u admin -p changeme --output json organization list"""
+        output = """[
+          {
+            "Id": 1,
+            "Title": "Default Organization",
+            "Labels": {
+              "Label": "Default_Organization"
+            }
+          },
+          {
+            "Id": 2,
+            "Title": "Other, Organization ]",
+            "Labels": {
+            }
+          }
+        ]
+        """
+        lines = iter(output.splitlines())
+        items = hammer.parse_json_iter(lines)
+        assert next(items) == {
+            'id': '1',
+            'title': 'Default Organization',
+            'labels': {'label': 'Default_Organization'},
+        }
+        # the second item was not read yet
+        assert next(lines).strip() == '{'
+        assert list(hammer.parse_json_iter(output.splitlines())) == hammer.parse_json(output)
+
+    def test_parse_json_iter_object(self):
+        output = '{\n  "ID": 160,\n  "Name": "QUWTHo0WzF"\n}\n'
+        assert list(hammer.parse_json_iter(output.splitlines())) == [hammer.parse_json(output)]
+
 
 class TestParseHelp:
     """Tests for parsing hammer help output"""
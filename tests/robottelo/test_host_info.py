@@ -1,24 +1,147 @@
+import base64
+import json
+import subprocess
 from unittest import mock
-from unittest.mock import call
 
 import pytest
 from attrdict import AttrDict
 
 from robottelo import host_info
+from robottelo.cli.base import CLIReturnCodeError
 from robottelo.ssh import SSHCommandResult
 
 
-class TestGetHostOsVersion:
-    """Tests for get_host_os_version version"""
+def fact_output(*facts):
+    """Return the output of the fact script for (return code, stdout, stderr) facts"""
+    return json.dumps(
+        [
+            {
+                'rc': rc,
+                'stdout': base64.b64encode(stdout.encode()).decode(),
+                'stderr': base64.b64encode(stderr.encode()).decode(),
+            }
+            for rc, stdout, stderr in facts
+        ]
+    )
 
-    @pytest.fixture(scope="function")
-    def ssh_result(self):
-        """Mocking ssh"""
-        patcher = mock.patch('robottelo.host_info.ssh.command')
-        yield patcher.start()
 
-        host_info.get_host_os_version.cache_clear()
-        patcher.stop()
+@pytest.fixture
+def ssh_result():
+    """Mocking ssh, the facts of each command are set in facts"""
+    facts = {}
+
+    def command(script, hostname=None, output_format=None):
+        commands = {*host_info._HOST_FACT_COMMANDS, *facts}
+        results = [
+            facts.get(cmd, (1, '', 'not found'))
+            for cmd in sorted(commands, key=lambda cmd: script.find(f'{{ {cmd}; }}'))
+            if f'{{ {cmd}; }}' in script
+        ]
+        return SSHCommandResult(stdout=fact_output(*results), output_format=output_format)
+
+    with mock.patch('robottelo.host_info.ssh.command', side_effect=command) as patcher:
+        patcher.facts = facts
+        yield patcher
+    host_info.HostFacts.invalidate()
+
+
+class TestFactScript:
+    """Tests for the fact script"""
+
+    def test_fact_script(self):
+        """Check the script output is JSON for commands with any output"""
+        commands = ['echo \'"quoted"\'; echo error >&2; exit 3', 'printf "a\\nb\\n" | cat']
+        output = subprocess.run(
+            ['sh', '-c', host_info.fact_script(commands)], stdout=subprocess.PIPE, check=True
+        ).stdout
+        assert json.loads(output) == json.loads(
+            fact_output((3, '"quoted"', 'error\n'), (0, 'a\nb', ''))
+        )
+
+
+class TestHostFacts:
+    """Tests for HostFacts"""
+
+    def test_gather_once(self, ssh_result):
+        """Check the host facts are gathered by one command and cached"""
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (
+            0,
+            'Red Hat Enterprise Linux Server release 7.9 (Maipo)',
+            '',
+        )
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (0, 'satellite-6.9.0-1.el7sat', '')
+        assert host_info.get_host_os_version() == 'RHEL7.9'
+        assert host_info.get_host_sat_version() == '6.9'
+        assert host_info.get_host_os_version() == 'RHEL7.9'
+        ssh_result.assert_called_once()
+        assert ssh_result.call_args[1]['output_format'] == 'plain'
+
+    def test_cache_per_hostname(self, ssh_result):
+        """Check the facts are cached per hostname and can be invalidated"""
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (0, 'satellite-6.9.0-1.el7sat', '')
+        assert host_info.get_host_sat_version('sat1.example.com') == '6.9'
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (0, 'satellite-6.10.0-1.el7sat', '')
+        assert host_info.get_host_sat_version('sat2.example.com') == '6.1'
+        assert host_info.get_host_sat_version('sat1.example.com') == '6.9'
+        assert [call[1]['hostname'] for call in ssh_result.call_args_list] == [
+            'sat1.example.com',
+            'sat2.example.com',
+        ]
+        host_info.HostFacts.invalidate('sat1.example.com')
+        assert host_info.get_host_sat_version('sat1.example.com') == '6.1'
+        assert ssh_result.call_count == 3
+
+    @mock.patch('robottelo.host_info.settings')
+    def test_default_hostname(self, settings, ssh_result):
+        """Check the facts of the default server are the facts of its hostname"""
+        settings.server.hostname = 'sat1.example.com'
+        facts = host_info.HostFacts.of()
+        assert host_info.HostFacts.of('sat1.example.com') is facts
+        assert facts.hostname == 'sat1.example.com'
+
+    @mock.patch('robottelo.host_info.logger')
+    def test_invalid_output(self, logger, ssh_result):
+        """Check the facts are not available nor cached when the script fails"""
+        ssh_result.side_effect = None
+        ssh_result.return_value = SSHCommandResult(
+            stdout='', stderr='base64: command not found', return_code=127
+        )
+        assert host_info.get_host_os_version() == 'Not Available'
+        assert host_info.get_host_os_version() == 'Not Available'
+        assert ssh_result.call_count == 2
+        assert logger.warning.call_count == 4
+
+    def test_repo_files(self, ssh_result):
+        """Check the repository files are gathered on each call"""
+        command = "find /var/lib/pulp/repo/ -name '*.rpm' | awk -F/ '{print $NF}'"
+        ssh_result.facts[command] = (0, 'walrus-0.71.rpm\n\nbear-4.1.rpm', '')
+        assert host_info.get_repo_files('/var/lib/pulp/repo') == [
+            'bear-4.1.rpm',
+            'walrus-0.71.rpm',
+        ]
+        ssh_result.facts[command] = (0, 'bear-4.1.rpm', '')
+        assert host_info.get_repo_files('/var/lib/pulp/repo/') == ['bear-4.1.rpm']
+        assert command not in host_info.HostFacts.of()._results
+        ssh_result.facts[command] = (1, '', 'find: no such directory')
+        with pytest.raises(CLIReturnCodeError):
+            host_info.get_repo_files('/var/lib/pulp/repo/')
+
+    def test_repomd_revision(self, ssh_result):
+        """Check the repository revision is gathered on each call"""
+        command = (
+            "grep -oP '(?<=<revision>).*?(?=</revision>)' " '/var/lib/pulp/repo/repodata/repomd.xml'
+        )
+        ssh_result.facts[command] = (0, '1611745587', '')
+        assert host_info.get_repomd_revision('/var/lib/pulp/repo') == '1611745587'
+        ssh_result.facts[command] = (0, '1611745599', '')
+        assert host_info.get_repomd_revision('/var/lib/pulp/repo') == '1611745599'
+        ssh_result.facts[command] = (0, '', '')
+        with pytest.raises(CLIReturnCodeError):
+            host_info.get_repomd_revision('/var/lib/pulp/repo')
+
+
+class TestGetHostOsVersion:
+    """Tests for get_host_os_version version"""
 
     def assert_rhel_version(self, ssh_version, parsed_version, ssh_result):
         """Encapsulate assertion logic regarding host os parsing
@@ -26,9 +149,9 @@ class TestGetHostOsVersion:
         :param ssh_version: version returned from ssh
         :param parsed_version: parsed version
         """
-        ssh_result.return_value.stdout = [ssh_version]
-        assert parsed_version == host_info.get_host_os_version.__wrapped__()
-        ssh_result.assert_called_once_with('cat /etc/redhat-release')
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (0, ssh_version, '')
+        assert parsed_version == host_info.get_host_os_version()
+        ssh_result.assert_called_once()
 
     def test_rhel_major_version_parsing(self, ssh_result):
         """Check if can parse major versions.
@@ -56,28 +179,31 @@ class TestGetHostOsVersion:
 
     def test_cache(self, request, ssh_result):
         """Check get_host_os_version() calls are cached"""
-        ssh_result.return_value.stdout = ['Red Hat Enterprise Linux Server release 7.2.1 (Maipo)']
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (
+            0,
+            'Red Hat Enterprise Linux Server release 7.2.1 (Maipo)',
+            '',
+        )
         assert 'RHEL7.2.1' == host_info.get_host_os_version()
-        ssh_result.assert_called_once_with('cat /etc/redhat-release')
-        ssh_result.return_value.stdout = ['Doesnt matter because because its cached']
+        ssh_result.assert_called_once()
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (0, 'Doesnt matter, its cached', '')
         assert 'RHEL7.2.1' == host_info.get_host_os_version()
         # if called more than once cache didn't worked
-        ssh_result.assert_called_once_with('cat /etc/redhat-release')
+        ssh_result.assert_called_once()
 
     @mock.patch('robottelo.host_info.logger')
     def test_command_error(self, logger, ssh_result):
         """Check returns 'Not Available' on error"""
-        cmd = SSHCommandResult(
-            stdout=[],
-            stderr='bash: generate: command not found\n',
-            return_code=127,
-            output_format=None,
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (
+            127,
+            '',
+            'bash: generate: command not found\n',
         )
-        ssh_result.return_value = cmd
-
-        os_version = host_info.get_host_os_version.__wrapped__()
+        os_version = host_info.get_host_os_version()
         assert 'Not Available' == os_version
-        ssh_result.assert_called_once_with('cat /etc/redhat-release')
+        cmd = host_info.HostFacts.of().result(host_info._OS_RELEASE_COMMAND)
+        assert cmd.return_code == 127
+        assert cmd.stderr == 'bash: generate: command not found\n'
         logger.warning.assert_called_once_with('Host version not available: %r' % cmd)
 
     @mock.patch('robottelo.host_info.logger')
@@ -85,80 +211,68 @@ class TestGetHostOsVersion:
         """Test return not available on Fedora machines
         It can be changed to handle other OS if needed
         """
-        cmd = SSHCommandResult(stdout=['Fedora release 23 (Twenty Three)'], return_code=0)
-        ssh_result.return_value = cmd
-        os_version = host_info.get_host_os_version.__wrapped__()
+        ssh_result.facts[host_info._OS_RELEASE_COMMAND] = (
+            0,
+            'Fedora release 23 (Twenty Three)',
+            '',
+        )
+        os_version = host_info.get_host_os_version()
         assert 'Not Available' == os_version
-        ssh_result.assert_called_once_with('cat /etc/redhat-release')
+        cmd = host_info.HostFacts.of().result(host_info._OS_RELEASE_COMMAND)
+        assert cmd.stdout == ['Fedora release 23 (Twenty Three)']
         logger.warning.assert_called_once_with('Host version not available: %r' % cmd)
 
 
 class TestGetHostSatVersion:
     """Tests for get_host_sat_version version"""
 
-    SSH_RESULT_ERROR = SSHCommandResult(
-        stdout=[],
-        stderr=('grep: /usr/share/foreman/lib/satellite/version.rb: No such file or directory'),
-        return_code=127,
-        output_format=None,
-    )
-
-    @pytest.fixture(scope="function")
-    def ssh_result(self):
-        """Mocking ssh"""
-        patcher = mock.patch('robottelo.host_info.ssh.command')
-        yield patcher.start()
-
-        host_info.get_host_sat_version.cache_clear()
-        patcher.stop()
-
     def test_sat_6_dot_2(self, ssh_result):
         """Check if can parse major 6.2.x versions"""
-        ssh_result.return_value.stdout = ['satellite-6.2.0-21.1.el7sat.noarch']
-        assert '6.2' == host_info.get_host_sat_version.__wrapped__()
-        ssh_result.assert_called_once_with(host_info._SAT_6_2_VERSION_COMMAND)
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (
+            0,
+            'satellite-6.2.0-21.1.el7sat.noarch',
+            '',
+        )
+        assert '6.2' == host_info.get_host_sat_version()
+        ssh_result.assert_called_once()
 
     def test_sat_6_dot_1(self, ssh_result):
-        """Check if can parse major 6.2.x versions"""
-        ssh_result_success = mock.Mock()
-        ssh_result_success.return_code = 0
-        ssh_result_success.stdout = ['  VERSION = "6.1.8"']
-
-        ssh_result.side_effect = (self.SSH_RESULT_ERROR, ssh_result_success)
-        sat_version = host_info.get_host_sat_version.__wrapped__()
-
-        assert "6.1" == sat_version
-        calls = [
-            call(host_info._SAT_6_2_VERSION_COMMAND),
-            call(host_info._SAT_6_1_VERSION_COMMAND),
-        ]
-        ssh_result.assert_has_calls(calls)
+        """Check if can parse major 6.1.x versions"""
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (
+            1,
+            '',
+            'package satellite is not installed',
+        )
+        ssh_result.facts[host_info._SAT_6_1_VERSION_COMMAND] = (0, '  VERSION = "6.1.8"', '')
+        assert '6.1' == host_info.get_host_sat_version()
+        ssh_result.assert_called_once()
 
     def test_cache(self, ssh_result):
         """Check get_host_sat_version() calls are cached"""
-        ssh_result.return_value.stdout = ['  SATELLITE_SHORT_VERSION = "6.2"']
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (
+            0,
+            '  SATELLITE_SHORT_VERSION = "6.2"',
+            '',
+        )
         assert '6.2' == host_info.get_host_sat_version()
-        ssh_result.assert_called_once_with(host_info._SAT_6_2_VERSION_COMMAND)
-        ssh_result.return_value.stdout = ['Doesnt matter because because its cached']
+        ssh_result.assert_called_once()
+        ssh_result.facts[host_info._SAT_6_2_VERSION_COMMAND] = (0, 'Doesnt matter, its cached', '')
         assert '6.2' == host_info.get_host_sat_version()
         # if called more than once cache didn't worked
-        ssh_result.assert_called_once_with(host_info._SAT_6_2_VERSION_COMMAND)
+        ssh_result.assert_called_once()
 
     @mock.patch('robottelo.host_info.logger')
     def test_command_error(self, logger, ssh_result):
         """Check returns 'Not Available' on error"""
-        ssh_result.return_value = self.SSH_RESULT_ERROR
-
-        sat_version = host_info.get_host_sat_version.__wrapped__()
-        assert 'Not Available' == sat_version
-        calls = [
-            call(host_info._SAT_6_2_VERSION_COMMAND),
-            call(host_info._SAT_6_1_VERSION_COMMAND),
-        ]
-        ssh_result.assert_has_calls(calls)
-        logger.warning.assert_called_once_with(
-            'Host Satellite version not available: %r' % self.SSH_RESULT_ERROR
+        ssh_result.facts[host_info._SAT_6_1_VERSION_COMMAND] = (
+            2,
+            '',
+            'grep: /usr/share/foreman/lib/satellite/version.rb: No such file or directory',
         )
+        sat_version = host_info.get_host_sat_version()
+        assert 'Not Available' == sat_version
+        cmd = host_info.HostFacts.of().result(host_info._SAT_6_1_VERSION_COMMAND)
+        logger.warning.assert_called_once_with('Host Satellite version not available: %r' % cmd)
 
 
 class TestSatVersionDependentValues:
@@ -182,8 +296,6 @@ class TestSatVersionDependentValues:
         )
         yield versions
 
-        host_info.get_host_sat_version.cache_clear()
-
     @mock.patch("robottelo.host_info.get_host_sat_version")
     def test_init(self, get_host_sat_version, dep_versions_data):
         """Test __init__ and check the is no call to get os Satellite version"""
@@ -231,7 +343,7 @@ class TestSatVersionDependentValues:
 
     @mock.patch("robottelo.host_info.get_host_sat_version")
     def test_common_dct_override(self, get_host_sat_version, common_versions_data):
-        """Check common is overridden by version dct """
+        """Check common is overridden by version dct"""
         get_host_sat_version.return_value = '6.1'
         common_versions_data.sat_dep_values = host_info.SatVersionDependentValues(
             {"6.1": self.rpms_61}, {"6.2": self.rpms_62}, common={'missing_version': 'fallback'}
@@ -0,0 +1,117 @@
+"""Tests for module ``robottelo.hosts``."""
+import threading
+import time
+
+import pytest
+
+from robottelo.hosts import ContentHostError
+from robottelo.hosts import ContentHostFleet
+from robottelo.hosts import ContentHostFleetError
+from robottelo.ssh import SSHCommandResult
+
+
+class FakeHost:
+    """Content host recording the steps run, with the steps durations"""
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def __init__(self, hostname, durations=None, failing=()):
+        self.hostname = hostname
+        self.durations = durations or {}
+        self.failing = failing
+        self.events = []
+
+    def _step(self, name, **kwargs):
+        cls = type(self)
+        with cls.lock:
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        self.events.append(('start', name, time.monotonic()))
+        time.sleep(self.durations.get(name, 0.01))
+        self.events.append(('end', name, time.monotonic()))
+        with cls.lock:
+            cls.running -= 1
+        if name in self.failing:
+            raise ContentHostError(f'{name} failed')
+        return f'{name} {kwargs}' if kwargs else name
+
+    def install_katello_ca(self, sat_hostname=None):
+        return self._step('install_katello_ca', sat_hostname=sat_hostname)
+
+    def register_contenthost(self, org='Default_Organization'):
+        self._step('register_contenthost')
+        return SSHCommandResult(return_code=70 if org == 'missing' else 0, stderr='no org')
+
+    def install_katello_host_tools(self):
+        return self._step('install_katello_host_tools')
+
+
+@pytest.fixture
+def hosts():
+    FakeHost.running = FakeHost.max_running = 0
+    return [FakeHost(f'host{index}.example.com') for index in range(6)]
+
+
+def test_run(hosts):
+    fleet = ContentHostFleet(hosts, concurrency=3)
+    results = fleet.run(
+        ('install_katello_ca', {'sat_hostname': 'sat.example.com'}),
+        'install_katello_host_tools',
+        lambda host: host.hostname,
+    )
+    assert results == [
+        [
+            "install_katello_ca {'sat_hostname': 'sat.example.com'}",
+            'install_katello_host_tools',
+            host.hostname,
+        ]
+        for host in hosts
+    ]
+    assert FakeHost.max_running == 3
+
+
+def test_map(hosts):
+    assert ContentHostFleet(hosts).map('install_katello_host_tools') == [
+        'install_katello_host_tools'
+    ] * len(hosts)
+
+
+def test_run_failures(hosts):
+    hosts[1].failing = ('install_katello_ca',)
+    with pytest.raises(ContentHostFleetError) as context:
+        ContentHostFleet(hosts).run(
+            'install_katello_ca', ('register_contenthost', {'org': 'missing'}), barrier=True
+        )
+    errors = context.value.errors
+    assert [(host.hostname, step) for host, step, _ in errors] == [
+        (host.hostname, 'install_katello_ca' if index == 1 else 'register_contenthost')
+        for index, host in enumerate(hosts)
+    ]
+    assert isinstance(context.value.results[1][0], ContentHostError)
+    # the following steps are skipped on a failed host
+    assert len(context.value.results[1]) == 1
+    assert [name for event, name, _ in hosts[1].events if event == 'start'] == [
+        'install_katello_ca'
+    ]
+    assert 'no org' in str(errors[0][2])
+
+
+def test_run_barrier(hosts):
+    hosts[0].durations = {'install_katello_ca': 0.2}
+    ContentHostFleet(hosts).run('install_katello_ca', 'install_katello_host_tools', barrier=True)
+    ca_end = max(end for host in hosts for event, _, end in host.events[:2] if event == 'end')
+    tools_start = min(host.events[2][2] for host in hosts)
+    assert tools_start >= ca_end
+
+
+def test_run_without_barrier(hosts):
+    hosts[0].durations = {'install_katello_ca': 0.2}
+    ContentHostFleet(hosts).run('install_katello_ca', 'install_katello_host_tools')
+    # the other hosts go on without waiting for the slow one
+    assert hosts[1].events[-1][2] < hosts[0].events[1][2]
+
+
+def test_run_no_hosts():
+    assert ContentHostFleet([]).run('install_katello_ca') == []
@@ -1,7 +1,10 @@
+import json
 import os
 import subprocess
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from packaging.version import Version
@@ -11,6 +14,7 @@ from robottelo.constants import CLOSED_STATUSES
 from robottelo.constants import OPEN_STATUSES
 from robottelo.constants import WONTFIX_RESOLUTIONS
 from robottelo.utils.issue_handlers import add_workaround
+from robottelo.utils.issue_handlers import bugzilla
 from robottelo.utils.issue_handlers import is_open
 from robottelo.utils.issue_handlers import should_deselect
 
@@ -411,3 +415,98 @@ def test_add_workaround():
         used_in = data[issue.strip()]['used_in']
         assert {'usage': 'test', 'foo': 'bar'} in used_in
         assert {'usage': 'test', 'zaz': 'traz'} not in used_in
+
+
+class TestBugzillaCollection:
+    @pytest.fixture(autouse=True)
+    def bz_settings(self, mocker, tmp_path):
+        """Mock the bugzilla settings and reset the BZ caches"""
+        settings = mocker.patch('robottelo.utils.issue_handlers.bugzilla.settings')
+        settings.bugzilla.api_key = 'key'
+        settings.bugzilla.chunk_size = 2
+        settings.bugzilla.workers = 2
+        settings.bugzilla.cache_file = str(tmp_path / 'bz_data_cache.json')
+        settings.bugzilla.cache_ttl = 3600
+        mocker.patch.object(bugzilla, 'CACHED_RESPONSES', defaultdict(dict))
+        mocker.patch.object(bugzilla, '_disk_cache', None)
+        return settings.bugzilla
+
+    @pytest.fixture
+    def get_chunk_bz(self, mocker):
+        return mocker.patch.object(
+            bugzilla,
+            'get_chunk_bz',
+            side_effect=lambda numbers: [
+                {'id': int(number), 'resolution': '', 'clone_ids': [], 'cf_clone_of': None}
+                for number in numbers
+            ],
+        )
+
+    def test_get_data_bz_chunks(self, get_chunk_bz):
+        """Assert BZs are requested in chunks and cached by number"""
+        data = bugzilla.get_data_bz(['1', '2', '3', '4', '5'])
+        assert [bz['id'] for bz in data] == [1, 2, 3, 4, 5]
+        assert sorted(call[0][0] for call in get_chunk_bz.call_args_list) == [
+            ['1', '2'],
+            ['3', '4'],
+            ['5'],
+        ]
+        get_chunk_bz.reset_mock()
+        data = bugzilla.get_data_bz(['6', '2'])
+        assert [bz['id'] for bz in data] == [6, 2]
+        get_chunk_bz.assert_called_once_with(['6'])
+
+    def test_get_data_bz_disk_cache(self, bz_settings, get_chunk_bz):
+        """Assert BZs are persisted on disk and expired after cache_ttl"""
+        with open(bz_settings.cache_file, 'w') as cache_file:
+            json.dump(
+                {
+                    '1': {'fetched': time.time(), 'data': {'id': 1, 'summary': 'cached'}},
+                    '2': {'fetched': time.time() - 7200, 'data': {'id': 2, 'summary': 'old'}},
+                },
+                cache_file,
+            )
+        data = bugzilla.get_data_bz(['1', '2'])
+        assert data[0] == {'id': 1, 'summary': 'cached'}
+        assert data[1]['id'] == 2 and 'summary' not in data[1]
+        get_chunk_bz.assert_called_once_with(['2'])
+        with open(bz_settings.cache_file) as cache_file:
+            assert sorted(json.load(cache_file)) == ['1', '2']
+
+    def test_save_disk_cache_merges(self, bz_settings, get_chunk_bz):
+        """Assert the BZs written by other workers are kept in the disk cache"""
+        bugzilla.get_data_bz(['1'])
+        with open(bz_settings.cache_file) as cache_file:
+            entries = json.load(cache_file)
+        # written by another worker meanwhile
+        entries['2'] = {'fetched': time.time(), 'data': {'id': 2, 'summary': 'other'}}
+        with open(bz_settings.cache_file, 'w') as cache_file:
+            json.dump(entries, cache_file)
+        bugzilla.get_data_bz(['3'])
+        with open(bz_settings.cache_file) as cache_file:
+            assert sorted(json.load(cache_file)) == ['1', '2', '3']
+        # and used by this worker from then on
+        assert bugzilla.get_data_bz(['2']) == [{'id': 2, 'summary': 'other'}]
+        assert ['2'] not in [call[0][0] for call in get_chunk_bz.call_args_list]
+
+    def test_prefetch_related_bz(self, get_chunk_bz):
+        """Assert duplicates and clones are fetched one level at a time"""
+        related = {'2': {'dupe_of': 4, 'resolution': 'DUPLICATE'}, '3': {'cf_clone_of': 5}}
+
+        def get_chunk(numbers):
+            return [
+                {'id': int(number), 'resolution': '', 'clone_ids': [], **related.get(number, {})}
+                for number in numbers
+            ]
+
+        get_chunk_bz.side_effect = get_chunk
+        bz_data = [{'id': 1, 'resolution': '', 'clone_ids': [2, 3], 'cf_clone_of': None}]
+        bugzilla.prefetch_related_bz(bz_data)
+        assert [call[0][0] for call in get_chunk_bz.call_args_list] == [['2', '3'], ['4', '5']]
+
+    def test_get_session_shared(self, mocker):
+        """Assert the threads fetching the BZs share one HTTP session"""
+        mocker.patch.object(bugzilla, '_session', None)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sessions = list(executor.map(lambda _: bugzilla.get_session(), range(4)))
+        assert all(session is sessions[0] for session in sessions)
@@ -0,0 +1,102 @@
+"""Tests for module ``robottelo.libvirt_watch``."""
+import queue
+import threading
+from unittest import mock
+
+import pytest
+
+from robottelo import libvirt_watch
+from robottelo.libvirt_discovery import LibvirtGuest
+from robottelo.libvirt_discovery import LibvirtGuestError
+
+
+class FakeStream:
+    """Yield the lines put in the queue, until None"""
+
+    def __init__(self):
+        self.lines = queue.Queue()
+        self.closed = threading.Event()
+        self.return_code = None
+        self.stderr = None
+
+    def __iter__(self):
+        try:
+            while True:
+                line = self.lines.get()
+                if line is None:
+                    self.return_code = 1
+                    self.stderr = 'virsh: command not found'
+                    return
+                yield line
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def stream():
+    stream = FakeStream()
+    with mock.patch.object(libvirt_watch.ssh, 'command', return_value=stream) as command:
+        stream.command = command
+        yield stream
+
+
+def _wait_in_thread(watcher, mac, results, timeout=5):
+    thread = threading.Thread(
+        target=lambda: results.append(watcher.wait(mac, timeout=timeout)), daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def test_wait_shared_command(stream):
+    watcher = libvirt_watch.GuestAddressWatcher('hypervisor.example.com')
+    results = []
+    threads = [
+        _wait_in_thread(watcher, mac, results) for mac in ('52:54:00:00:00:01', '52:54:00:00:00:02')
+    ]
+    stream.lines.put('52:54:00:00:00:02 192.168.0.2')
+    stream.lines.put('')
+    stream.lines.put('52:54:00:00:00:01 192.168.0.1')
+    for thread in threads:
+        thread.join(5)
+    assert sorted(results) == ['192.168.0.1', '192.168.0.2']
+    # a single ssh command on the hypervisor for all the guests
+    assert stream.command.call_count == 1
+    assert stream.command.call_args[1]['hostname'] == 'hypervisor.example.com'
+    assert stream.command.call_args[1]['stream']
+    # the command is stopped on the next line once nobody waits
+    stream.lines.put('')
+    assert stream.closed.wait(5)
+    # the addresses found are kept
+    assert watcher.wait('52:54:00:00:00:01'.upper(), timeout=0) == '192.168.0.1'
+
+
+def test_wait_timeout(stream):
+    watcher = libvirt_watch.GuestAddressWatcher('hypervisor.example.com')
+    assert watcher.wait('52:54:00:00:00:01', timeout=0.1) is None
+    stream.lines.put('')
+    assert stream.closed.wait(5)
+
+
+def test_wait_command_failed(stream):
+    watcher = libvirt_watch.GuestAddressWatcher('hypervisor.example.com')
+    stream.lines.put(None)
+    assert watcher.wait('52:54:00:00:00:01', timeout=5) is None
+    assert stream.command.call_count == 1
+
+
+def test_libvirt_guest_wait_for_ip(stream):
+    libvirt_watch._watchers.clear()
+    guest = LibvirtGuest(
+        libvirt_server='libvirt.example.com',
+        mac='52:54:00:00:00:03',
+        network='default',
+        network_type='network',
+    )
+    with pytest.raises(LibvirtGuestError):
+        guest.wait_for_ip()
+    guest._created = True
+    stream.lines.put('52:54:00:00:00:03 192.168.0.3')
+    assert guest.wait_for_ip(timeout=5) == guest.ip_addr == '192.168.0.3'
+    assert libvirt_watch._watchers['libvirt.example.com'].hostname == 'libvirt.example.com'
+    stream.lines.put('')
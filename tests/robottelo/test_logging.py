@@ -0,0 +1,169 @@
+"""Tests for the queued log handlers of module ``robottelo.logging``."""
+import logging
+import os
+import threading
+
+import pytest
+
+from robottelo.logging import BatchingHandler
+from robottelo.logging import LogListener
+from robottelo.logging import LogQueueHandler
+from robottelo.logging import queue_file_handlers
+
+
+class RecordingHandler(logging.Handler):
+    """Record the messages, waiting until unblocked"""
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = []
+        self.threads = set()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def emit(self, record):
+        self.unblocked.wait()
+        self.threads.add(threading.current_thread())
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def listener():
+    listener = LogListener(maxsize=2)
+    listener.start()
+    yield listener
+    listener.stop()
+
+
+def _logger(name, *handlers):
+    logger = logging.getLogger(f'robottelo.tests.{name}')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for handler in handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def test_records_handled_in_listener_thread(listener):
+    handler = RecordingHandler()
+    logger = _logger('thread', LogQueueHandler(listener, [handler]))
+    logger.info('value %s', 1)
+    logger.handlers[0].flush()
+    assert handler.messages == ['value 1']
+    assert handler.threads == {listener._thread}
+
+
+def test_queue_handler_level(listener):
+    debug, info = RecordingHandler(logging.DEBUG), RecordingHandler(logging.INFO)
+    queue_handler = LogQueueHandler(listener, [info])
+    assert queue_handler.level == logging.INFO
+    queue_handler.addHandler(debug)
+    assert queue_handler.level == logging.DEBUG
+    logger = _logger('level', queue_handler)
+    logger.debug('debug')
+    logger.info('info')
+    queue_handler.flush()
+    assert debug.messages == ['debug', 'info']
+    assert info.messages == ['info']
+    queue_handler.removeHandler(debug)
+    assert queue_handler.level == logging.INFO
+
+
+def test_drop_policy():
+    listener = LogListener(maxsize=2, policy='drop')
+    listener.start()
+    handler = RecordingHandler()
+    handler.unblocked.clear()
+    logger = _logger('drop', LogQueueHandler(listener, [handler]))
+    for index in range(10):
+        logger.info(index)
+    handler.unblocked.set()
+    listener.stop()
+    assert listener.dropped > 0
+    assert len(handler.messages) == 10 - listener.dropped + 1
+    assert f'{listener.dropped} log records dropped, the log queue was full' in handler.messages
+
+
+def test_block_policy(listener):
+    handler = RecordingHandler()
+    handler.unblocked.clear()
+    logger = _logger('block', LogQueueHandler(listener, [handler]))
+    thread = threading.Thread(target=lambda: [logger.info(index) for index in range(10)])
+    thread.start()
+    thread.join(0.2)
+    # the logging thread waits for room in the queue
+    assert thread.is_alive()
+    handler.unblocked.set()
+    thread.join()
+    logger.handlers[0].flush()
+    assert handler.messages == [str(index) for index in range(10)]
+
+
+def test_stopped_listener_handles_records():
+    listener = LogListener(maxsize=1)
+    handler = RecordingHandler()
+    logger = _logger('stopped', LogQueueHandler(listener, [handler]))
+    for index in range(3):
+        logger.info(index)
+    assert handler.messages == ['0', '1', '2']
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        LogListener(policy='wait')
+
+
+def test_batching_handler():
+    target = RecordingHandler()
+    handler = BatchingHandler(target, capacity=3)
+    logger = _logger('batch', handler)
+    logger.info('first')
+    logger.info('second')
+    assert target.messages == []
+    logger.error('error')
+    assert target.messages == ['first', 'second', 'error']
+    logger.info('last')
+    handler.flush()
+    assert target.messages[-1] == 'last'
+
+
+def test_queue_file_handlers(listener, tmp_path):
+    file_handler = logging.FileHandler(tmp_path / 'test.log')
+    stream_handler = logging.StreamHandler()
+    logger = _logger('file', file_handler, stream_handler)
+    queue_handler = queue_file_handlers(logger, listener)
+    assert logger.handlers == [stream_handler, queue_handler]
+    assert queue_handler.handlers == (file_handler,)
+    logger.info('logged')
+    queue_handler.flush()
+    assert (tmp_path / 'test.log').read_text() == 'logged\n'
+    file_handler.close()
+
+
+def test_exception_formatted_by_listener(listener):
+    handler = RecordingHandler()
+    logger = _logger('exception', LogQueueHandler(listener, [handler]))
+    try:
+        raise ValueError('invalid')
+    except ValueError:
+        logger.exception('failed %s', 'task')
+    logger.handlers[0].flush()
+    assert handler.messages[0].startswith('failed task\nTraceback')
+    assert handler.messages[0].endswith('ValueError: invalid')
+
+
+def test_forked_child_handles_records(listener, tmp_path):
+    path = tmp_path / 'child.log'
+    handler = logging.FileHandler(path)
+    logger = _logger('fork', LogQueueHandler(listener, [handler]))
+    pid = os.fork()
+    if pid == 0:
+        # more records than the queue size, with the block policy
+        for index in range(5):
+            logger.info(index)
+        os._exit(0)
+    os.waitpid(pid, 0)
+    handler.close()
+    assert path.read_text().split() == [str(index) for index in range(5)]
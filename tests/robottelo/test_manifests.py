@@ -0,0 +1,236 @@
+"""Tests for module ``robottelo.manifests``."""
+import io
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import Future
+from unittest import mock
+
+import pytest
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from robottelo import manifests
+from robottelo.utils import download_cache
+
+TEMPLATE_URL = 'http://example.com/manifest.zip'
+KEY_URL = 'http://example.com/manifest.key'
+
+
+def _template():
+    consumer_export = io.BytesIO()
+    with zipfile.ZipFile(consumer_export, 'w') as consumer_export_zip:
+        consumer_export_zip.writestr(
+            'export/consumer.json', json.dumps({'uuid': 'template', 'owner': {}})
+        )
+        consumer_export_zip.writestr('export/meta.json', '{}')
+    template = io.BytesIO()
+    with zipfile.ZipFile(template, 'w') as template_zip:
+        template_zip.writestr('consumer_export.zip', consumer_export.getvalue())
+        template_zip.writestr('signature', b'')
+    return template.getvalue()
+
+
+@pytest.fixture(scope='module')
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+
+
+@pytest.fixture
+def server(private_key):
+    """Serve the template and the key with an ETag"""
+    contents = {
+        TEMPLATE_URL: _template(),
+        KEY_URL: private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+    }
+
+    def get(url, headers=None, timeout=None, stream=False):
+        etag = f'"{hash(contents[url])}"'
+        response = mock.MagicMock(status_code=200, headers={'ETag': etag})
+        if (headers or {}).get('If-None-Match') == etag:
+            response.status_code = 304
+        response.iter_content.side_effect = lambda size: iter([contents[url]])
+        response.__enter__.return_value = response
+        return response
+
+    with mock.patch.object(download_cache.requests, 'get', side_effect=get) as server:
+        server.contents = contents
+        yield server
+
+
+@pytest.fixture
+def settings(tmp_path):
+    with mock.patch.object(manifests, 'settings') as settings:
+        settings.fake_manifest.url = {'default': TEMPLATE_URL}
+        settings.fake_manifest.key_url = KEY_URL
+        settings.fake_manifest.cache_dir = str(tmp_path)
+        settings.fake_manifest.download_timeout = 10
+        settings.fake_manifest.pool_size = 2
+        settings.fake_manifest.pool_workers = 1
+        cache = download_cache.DownloadCache(cache_dir=str(tmp_path / 'downloads'), max_size=10)
+        with mock.patch.object(manifests, 'download_cache', cache):
+            yield settings
+
+
+def _consumer(content, private_key):
+    manifest_zip = zipfile.ZipFile(io.BytesIO(content))
+    consumer_export = manifest_zip.read('consumer_export.zip')
+    private_key.public_key().verify(
+        manifest_zip.read('signature'), consumer_export, padding.PKCS1v15(), hashes.SHA256()
+    )
+    consumer_export_zip = zipfile.ZipFile(io.BytesIO(consumer_export))
+    return json.loads(consumer_export_zip.read('export/consumer.json'))
+
+
+def test_download_cached(settings, server):
+    """The template and key are kept in the download cache"""
+    cloner = manifests.ManifestCloner()
+    assert cloner.template_data() == (server.contents[TEMPLATE_URL], server.contents[KEY_URL])
+    assert manifests.ManifestCloner().template_data() == cloner.template_data()
+    assert server.call_args[1]['timeout'] == 10
+    assert 'If-None-Match' in server.call_args[1]['headers']
+
+
+def test_clone(settings, server, private_key):
+    cloner = manifests.ManifestCloner()
+    first = _consumer(cloner.clone().read(), private_key)
+    second = _consumer(cloner.clone(org_environment_access=True).read(), private_key)
+    assert first['uuid'] != second['uuid'] != 'template'
+    assert second['contentAccessMode'] == 'org_environment'
+    assert server.call_count == 2
+
+
+def test_pool(settings, server, private_key, tmp_path):
+    pool = manifests.ManifestPool(manifests.ManifestCloner())
+    pool.fill()
+    pool_dir = pool._pool_dir('default', False)
+    for _ in range(100):
+        if len(list(pool_dir.glob('*.zip'))) == 2:
+            break
+        time.sleep(0.1)
+    cloned = sorted(pool_dir.glob('*.zip'))
+    assert len(cloned) == 2
+    uuids = {_consumer(pool.get().read(), private_key)['uuid'] for _ in range(3)}
+    # the third manifest is cloned on the calling thread
+    assert len(uuids) == 3
+    assert not any(path.exists() for path in cloned)
+    assert pool._pool_dir('default', True) != pool_dir
+
+
+def test_pool_disabled(settings, server, private_key):
+    settings.fake_manifest.pool_size = 0
+    pool = manifests.ManifestPool(manifests.ManifestCloner())
+    assert _consumer(pool.get().read(), private_key)['uuid'] != 'template'
+    assert pool._executor is None
+
+
+class DoneExecutor:
+    """Executor running the functions at once, or broken"""
+
+    broken = False
+
+    def submit(self, function, *args):
+        if self.broken:
+            raise manifests.BrokenProcessPool('a worker died')
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+def test_pool_done_futures(settings, server, private_key):
+    pool = manifests.ManifestPool(manifests.ManifestCloner())
+    executor = pool._executor = DoneExecutor()
+    pool._pid = os.getpid()
+    pool.fill()
+    assert len(list(pool._pool_dir('default', False).glob('*.zip'))) == 2
+    assert not list(pool._pool_dir('default', False).glob('*.claim'))
+    assert pool._executor is executor
+
+
+def test_pool_broken(settings, server, private_key):
+    pool = manifests.ManifestPool(manifests.ManifestCloner())
+    pool._executor = DoneExecutor()
+    pool._executor.broken = True
+    pool._pid = os.getpid()
+    # the manifest is cloned on the calling thread
+    assert _consumer(pool.get().read(), private_key)['uuid'] != 'template'
+    assert pool._executor is None
+    assert not list(pool._pool_dir('default', False).glob('*.claim'))
+
+
+class PendingExecutor:
+    """Executor never running the functions"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, function, *args):
+        self.submitted += 1
+        return Future()
+
+
+def test_pool_shared_claims(settings, server, private_key):
+    """The workers sharing a pool directory do not clone the same missing
+    manifests
+    """
+    pools = [manifests.ManifestPool(manifests.ManifestCloner()) for _ in range(2)]
+    for pool in pools:
+        pool._executor = PendingExecutor()
+        pool._pid = os.getpid()
+        pool.fill()
+    assert [pool._executor.submitted for pool in pools] == [2, 0]
+    pool_dir = pools[0]._pool_dir('default', False)
+    assert len(list(pool_dir.glob('*.claim'))) == 2
+    # the claims of a dead worker are dropped
+    for claim in pool_dir.glob('*.claim'):
+        claim.rename(pool_dir / f'999999999.{claim.name.split(".", 1)[1]}')
+    pools[1].fill()
+    assert pools[1]._executor.submitted == 2
+
+
+def _upload(org_id, hostname, lock_dir, started, release):
+    with mock.patch.object(manifests, 'get_temp_dir', return_value=lock_dir):
+        with mock.patch.object(manifests, 'settings') as settings:
+            settings.fake_manifest.concurrent_uploads = 2
+            with manifests.upload_lock(org_id, hostname=hostname, timeout=5):
+                started.put(org_id)
+                release.wait(5)
+
+
+def test_upload_lock(tmp_path):
+    context = multiprocessing.get_context('fork')
+    started, release = context.Queue(), context.Event()
+    processes = [
+        context.Process(
+            target=_upload, args=(org_id, 'sat.example.com', str(tmp_path), started, release)
+        )
+        for org_id in (1, 1, 2, 3)
+    ]
+    for process in processes:
+        process.start()
+    running = sorted(started.get(timeout=5) for _ in range(2))
+    time.sleep(0.3)
+    # two uploads at once, never two into the same organization
+    assert started.empty()
+    assert len(set(running)) == 2
+    release.set()
+    assert sorted(running + [started.get(timeout=5) for _ in range(2)]) == [1, 1, 2, 3]
+    for process in processes:
+        process.join(5)
+    lock_dir = tmp_path / 'robottelo' / 'manifest_upload' / 'sat.example.com'
+    assert {path.name for path in lock_dir.iterdir()} == {
+        'org_1.lock',
+        'org_2.lock',
+        'org_3.lock',
+        'slot_0.lock',
+        'slot_1.lock',
+    }
@@ -0,0 +1,89 @@
+"""Tests for module ``robottelo.remote_log``."""
+import subprocess
+from unittest import mock
+
+import pytest
+
+from robottelo import remote_log
+
+
+class FakeStream:
+    """SSHCommandStream yielding the given lines"""
+
+    def __init__(self, lines, return_code=0):
+        self.lines = lines
+        self.return_code = None
+        self._return_code = return_code
+        self.stderr = ''
+
+    def __iter__(self):
+        yield from self.lines
+        self.return_code = self._return_code
+
+
+@pytest.fixture
+def ssh():
+    with mock.patch.object(remote_log, 'ssh') as ssh:
+        sftp = ssh.get_sftp_session.return_value.__enter__.return_value
+        sftp.stat.return_value.st_size = 1024
+        yield ssh
+
+
+def test_tail_records_offset(ssh):
+    log = remote_log.LogFile('/var/log/messages', tail=True)
+    assert log.offset == 1024
+    ssh.download_file.assert_not_called()
+
+
+def test_tail_filter(ssh):
+    ssh.command.return_value = FakeStream(['INFO started', 'ERROR failed', 'INFO done'])
+    log = remote_log.LogFile('/var/log/messages', pattern='ERROR', tail=True)
+    assert log.filter() == ['ERROR failed\n']
+    cmd = ssh.command.call_args[0][0]
+    assert 'tail -c +1025 /var/log/messages' in cmd
+    assert 'grep' not in cmd
+
+
+def test_tail_filter_grep(ssh):
+    ssh.command.return_value = FakeStream([], return_code=1)
+    log = remote_log.LogFile('/var/log/messages', tail=True)
+    assert log.filter('ERROR|WARN', grep=True) == []
+    assert "| grep -E 'ERROR|WARN';" in ssh.command.call_args[0][0]
+
+
+@pytest.mark.parametrize(
+    'content, return_code', [(None, 2), ('INFO started\n', 1), ('ERROR failed\n', 0)]
+)
+def test_tail_grep_return_code(ssh, tmp_path, content, return_code):
+    """Check a read error is not taken for no matching line"""
+    path = tmp_path / 'messages'
+    if content is not None:
+        path.write_text(content)
+    ssh.get_sftp_session.return_value.__enter__.return_value.stat.return_value.st_size = 0
+
+    def command(cmd, **kwargs):
+        process = subprocess.run(['bash', '-c', cmd], capture_output=True, text=True)
+        return FakeStream(process.stdout.splitlines(), return_code=process.returncode)
+
+    ssh.command.side_effect = command
+    log = remote_log.LogFile(str(path), tail=True)
+    if return_code == 2:
+        with pytest.raises(remote_log.LogFileError):
+            log.filter('ERROR', grep=True)
+    else:
+        assert log.filter('ERROR', grep=True) == (['ERROR failed\n'] if return_code == 0 else [])
+
+
+def test_tail_iter_lines_is_lazy(ssh):
+    ssh.command.return_value = FakeStream(['line 1', 'line 2'])
+    log = remote_log.LogFile('/var/log/messages', tail=True)
+    lines = log.iter_lines()
+    ssh.command.assert_not_called()
+    assert next(lines) == 'line 1\n'
+
+
+def test_tail_read_error(ssh):
+    ssh.command.return_value = FakeStream([], return_code=1)
+    log = remote_log.LogFile('/var/log/messages', tail=True)
+    with pytest.raises(remote_log.LogFileError):
+        log.filter('ERROR')
@@ -0,0 +1,107 @@
+"""Tests for module ``robottelo.report_portal.portal``."""
+from unittest import mock
+
+import pytest
+
+from robottelo.report_portal.portal import Launch
+from robottelo.report_portal.portal import ReportPortal
+
+
+def _test_item(number, status='PASSED', issue_type=None, owner='jsmith'):
+    return {
+        'name': f'tests/foreman/test_dummy.py::test_{number}',
+        'status': status,
+        'issue': {'issueType': issue_type} if issue_type else None,
+        'attributes': [{'key': 'case_owner', 'value': owner}],
+    }
+
+
+ITEMS = [
+    _test_item(0),
+    _test_item(1, 'FAILED', 'pb001'),
+    _test_item(2, 'FAILED', 'ab001', owner='jdoe'),
+    _test_item(3, 'SKIPPED', 'ti001'),
+    _test_item(4, 'FAILED', 'si001'),
+]
+
+
+class FakeSession:
+    """Session serving the test items in pages of ``page.size`` items"""
+
+    def __init__(self, items):
+        self.items = items
+        self.pages = []
+
+    def get(self, url, params):
+        size, page = params['page.size'], params['page.page']
+        self.pages.append(page)
+        response = mock.Mock()
+        response.json.return_value = {
+            'page': {'totalPages': -(-len(self.items) // size)},
+            'content': self.items[(page - 1) * size : page * size],  # noqa: E203
+        }
+        return response
+
+
+@pytest.fixture
+def rp_settings(tmpdir):
+    with mock.patch('robottelo.report_portal.portal.settings') as settings:
+        settings.report_portal.page_size = 2
+        settings.report_portal.workers = 2
+        settings.report_portal.cache_dir = str(tmpdir)
+        yield settings.report_portal
+
+
+@pytest.fixture
+def launch(rp_settings):
+    rp = ReportPortal()
+    rp._session = FakeSession(ITEMS)
+    info = {
+        'id': 42,
+        'name': 'satellite6',
+        'status': 'FAILED',
+        'statistics': {'executions': {}},
+        'attributes': [],
+    }
+    return Launch(rp=rp, launch_info=info)
+
+
+def test_tests_fetch_all_pages_once(launch):
+    assert len(launch.tests()) == len(ITEMS)
+    assert sorted(launch.report_portal.session.pages) == [1, 2, 3]
+    assert [*launch.tests()] == [item['name'] for item in ITEMS]
+    assert len(launch.report_portal.session.pages) == 3
+
+
+def test_tests_filter(launch):
+    assert [*launch.tests(status='failed')] == [
+        ITEMS[1]['name'],
+        ITEMS[2]['name'],
+        ITEMS[4]['name'],
+    ]
+    failed_bugs = launch.tests(status='failed', defect_type=['product_bug', 'automation_bug'])
+    assert [*failed_bugs] == [ITEMS[1]['name'], ITEMS[2]['name']]
+    assert [*launch.tests(status=['skipped', 'passed'])] == [ITEMS[0]['name'], ITEMS[3]['name']]
+    assert [*launch.tests(status='failed', user='jdoe')] == [ITEMS[2]['name']]
+    assert launch.tests(status=[]) == {}
+    with pytest.raises(ValueError):
+        launch.tests(status='unknown')
+    with pytest.raises(ValueError):
+        launch.tests(defect_type='unknown_bug')
+
+
+def test_tests_disk_cache(launch, rp_settings):
+    launch.tests()
+    rerun_launch = Launch(rp=launch.report_portal, launch_info=launch.info)
+    launch.report_portal.session.pages.clear()
+    assert len(rerun_launch.tests()) == len(ITEMS)
+    assert launch.report_portal.session.pages == []
+
+
+def test_tests_in_progress_launch_not_cached(launch):
+    launch.info['status'] = 'IN_PROGRESS'
+    launch.tests()
+    rerun_launch = Launch(rp=launch.report_portal, launch_info=launch.info)
+    launch.report_portal.session.pages.clear()
+    rerun_launch.tests()
+    assert sorted(launch.report_portal.session.pages) == [1, 2, 3]
@@ -0,0 +1,73 @@
+"""Tests for module ``robottelo.rh_cloud_utils``."""
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from robottelo import rh_cloud_utils
+
+
+def _add_member(tar, name, content):
+    data = content.encode('utf-8')
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture(params=['xz', 'gz', 'bz2', ''])
+def report(request, tmp_path):
+    path = tmp_path / 'report_for_1.tar'
+    slices = {
+        'slice_a': [{'fqdn': f'host{i}.example.com', 'facts': [1, 2.5, None]} for i in range(3)],
+        'slice_b': [],
+    }
+    with tarfile.open(path, mode=f'w:{request.param}') as tar:
+        metadata = {
+            'report_slices': {name: {'number_hosts': len(hosts)} for name, hosts in slices.items()}
+        }
+        _add_member(tar, 'report/metadata.json', json.dumps(metadata))
+        for name, hosts in slices.items():
+            _add_member(
+                tar, f'report/{name}.json', json.dumps({'report_slice_id': name, 'hosts': hosts})
+            )
+    return path
+
+
+def test_get_local_file_data(report):
+    data = rh_cloud_utils.get_local_file_data(report)
+    assert data['checksum'] == hashlib.sha256(report.read_bytes()).hexdigest()
+    assert data['size'] == report.stat().st_size
+    assert data['extractable'] and data['json_files_parsable']
+    assert data['metadata_counts'] == {'slice_a.json': 3, 'slice_b.json': 0}
+    assert data['slices_counts'] == data['metadata_counts']
+
+
+def test_get_local_file_data_not_tar(tmp_path):
+    path = tmp_path / 'report.tar.xz'
+    path.write_bytes(b'not a tar file' * 1000)
+    data = rh_cloud_utils.get_local_file_data(path)
+    assert data['checksum'] == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert not data['extractable']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64 * 1024])
+def test_count_json_array(monkeypatch, chunk_size):
+    monkeypatch.setattr(rh_cloud_utils, 'JSON_CHUNK_SIZE', chunk_size)
+    document = {'id': 1234567, 'hosts': [{'name': 'é'}, 12345, 'host', [1]], 'end': True}
+    content = io.BytesIO(json.dumps(document, indent=2).encode('utf-8'))
+    assert rh_cloud_utils.count_json_array(content, 'hosts') == 4
+
+
+@pytest.mark.parametrize(
+    'content', [b'{"hosts": [1, 2', b'{"hosts": [1 2]}', b'{"hosts": []} []', b'[]']
+)
+def test_count_json_array_invalid(content):
+    with pytest.raises(json.JSONDecodeError):
+        rh_cloud_utils.count_json_array(io.BytesIO(content), 'hosts')
+
+
+def test_count_json_array_missing_key():
+    with pytest.raises(KeyError):
+        rh_cloud_utils.count_json_array(io.BytesIO(b'{"slices": []}'), 'hosts')
@@ -0,0 +1,100 @@
+"""Tests for the satellite_affinity xdist scheduler plugin."""
+from unittest import mock
+
+import pytest
+
+from pytest_plugins import satellite_affinity
+from pytest_plugins.satellite_affinity import SatelliteAffinityScheduling
+
+MODULES = {
+    'test_cv.py': 'def test_cv(module_org, module_cv):\n    pass\n',
+    'test_cv_publish.py': 'def test_publish(module_org, module_cv):\n    pass\n',
+    'test_host.py': 'def test_host(module_host):\n    pass\n',
+    'test_host_update.py': 'def test_update(module_host):\n    pass\n',
+}
+
+
+class FakeNode:
+    def __init__(self, worker_id, satellite):
+        self.gateway = mock.Mock(id=worker_id)
+        self.workerinput = {'satellite_hostname': satellite}
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indexes):
+        self.sent.extend(indexes)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+@pytest.fixture
+def collection(tmp_path):
+    nodeids = []
+    for name, source in MODULES.items():
+        (tmp_path / name).write_text(source)
+        nodeids.extend(f'{name}::test_{index}' for index in range(2))
+    satellite_affinity.module_signature.cache_clear()
+    return nodeids
+
+
+def _scheduler(tmp_path, nodes, collection, durations=None):
+    config = mock.Mock(rootdir=tmp_path)
+    config.getvalue.return_value = [f'{len(nodes)}*popen']
+    config.cache.get.return_value = durations or {}
+    scheduler = SatelliteAffinityScheduling(config)
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler
+
+
+def _modules(scheduler, node, collection):
+    return {scheduler._split_scope(collection[index]) for index in node.sent}
+
+
+def test_module_signature(tmp_path, collection):
+    assert satellite_affinity.module_signature(str(tmp_path / 'test_cv.py')) == {
+        'module_org',
+        'module_cv',
+    }
+    assert satellite_affinity.module_signature(str(tmp_path / 'missing.py')) == set()
+
+
+def test_schedule_modules_by_fixtures(tmp_path, collection):
+    nodes = [FakeNode('gw0', 'sat1'), FakeNode('gw1', 'sat2')]
+    scheduler = _scheduler(tmp_path, nodes, collection)
+    scheduled = [_modules(scheduler, node, collection) for node in nodes]
+    assert sorted(scheduled, key=sorted) == [
+        {'test_cv.py', 'test_cv_publish.py'},
+        {'test_host.py', 'test_host_update.py'},
+    ]
+
+
+def test_schedule_balance_durations(tmp_path, collection):
+    nodes = [FakeNode('gw0', 'sat1'), FakeNode('gw1', 'sat2')]
+    durations = {'test_cv.py': {'duration': 300, 'tests': 2}}
+    scheduler = _scheduler(tmp_path, nodes, collection, durations)
+    scheduled = [_modules(scheduler, node, collection) for node in nodes]
+    # the long module runs alone on its Satellite
+    assert {'test_cv.py'} in scheduled
+
+
+def test_schedule_steal_from_same_satellite(tmp_path, collection):
+    collection = collection + [f'test_extra_{index}.py::test_0' for index in range(8)]
+    nodes = [FakeNode('gw0', 'sat1'), FakeNode('gw1', 'sat1'), FakeNode('gw2', 'sat2')]
+    scheduler = _scheduler(tmp_path, nodes, collection)
+    planned = {node: set(scheduler.plan[node]) for node in nodes}
+    # gw0 runs all its planned modules
+    while any(scope in scheduler.workqueue for scope in planned[nodes[0]]):
+        for index in list(nodes[0].sent):
+            scheduler.mark_test_complete(nodes[0], index)
+    assert scheduler.workqueue
+    nodes[0].sent.clear()
+    for work_unit in list(scheduler.assigned_work[nodes[0]].values()):
+        for nodeid in list(work_unit):
+            scheduler.mark_test_complete(nodes[0], collection.index(nodeid))
+    stolen = _modules(scheduler, nodes[0], collection)
+    assert len(stolen) == 1
+    assert stolen <= planned[nodes[1]]
@@ -1,4 +1,9 @@
 """Module for testing settings and settings hooks"""
+from unittest import mock
+
+import pytest
+
+from robottelo import config
 from robottelo.config.base import SharedFunctionSettings
 
 
@@ -8,3 +13,18 @@ def test_share_timetout_validation():
     shared_function_settings.storage = 'file'
     shared_function_settings.storage = 'file'
     assert [] == shared_function_settings.validate()
+
+
+def test_configure_settings_retry(monkeypatch):
+    """Assert a retried settings configuration registers the validators once"""
+    dynaconf_settings = mock.MagicMock()
+    monkeypatch.setattr(config, 'dynaconf_settings', dynaconf_settings)
+    monkeypatch.setattr(config, 'legacy_settings', mock.MagicMock())
+    monkeypatch.setattr(config, 'settings', mock.MagicMock())
+    monkeypatch.setattr(config, '_validators_registered', False)
+    config.settings.configure_airgun.side_effect = [RuntimeError, None]
+    with pytest.raises(RuntimeError):
+        config._configure_settings()
+    config._configure_settings()
+    assert dynaconf_settings.validators.register.call_count == 1
+    assert dynaconf_settings.validators.validate.call_count == 2
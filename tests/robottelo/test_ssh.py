@@ -1,5 +1,6 @@
 """Tests for module ``robottelo.ssh``."""
 import os
+import time
 from io import StringIO
 from unittest import mock
 
@@ -30,6 +31,18 @@ class MockStdout:
         return self.cmd
 
 
+class MockTransport:
+    def __init__(self):
+        self.active = True
+        self.keepalive = None
+
+    def is_active(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        self.keepalive = interval
+
+
 class MockSSHClient:
     """A mock ``paramiko.SSHClient`` object."""
 
@@ -51,6 +64,7 @@ class MockSSHClient:
         self.pkey = None
         self.password = None
         self.ret_code = 0
+        self.transport = MockTransport()
 
     def set_missing_host_key_policy(self, policy):
         """A no-op stub method."""
@@ -94,6 +108,17 @@ class MockSSHClient:
     def exec_command(self, cmd, *args, **kwargs):
         return (self.ret_code, MockStdout(cmd, self.ret_code), MockStdout('', self.ret_code))
 
+    def get_transport(self):
+        return self.transport
+
+
+@pytest.fixture(autouse=True)
+def clean_connection_pool():
+    ssh.close_pooled_connections()
+    ssh._connection_pool._reset()
+    yield
+    ssh.close_pooled_connections()
+
 
 class TestSSH:
     """Tests for module ``robottelo.ssh``."""
@@ -309,6 +334,9 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.pool_size = 4
+        settings.ssh_client.pool_idle_timeout = 300
+        settings.ssh_client.keepalive_interval = 30
 
         ret = ssh.command('ls -la')
         assert ret.stdout == ['ls -la']
@@ -323,6 +351,9 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.pool_size = 4
+        settings.ssh_client.pool_idle_timeout = 300
+        settings.ssh_client.keepalive_interval = 30
 
         ret = ssh.command('ls -la', output_format='base')
         assert ret.stdout == 'ls -la'
@@ -337,6 +368,9 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.pool_size = 4
+        settings.ssh_client.pool_idle_timeout = 300
+        settings.ssh_client.keepalive_interval = 30
 
         ret = ssh.command('a,b,c\n1,2,3', output_format='csv')
         assert ret.stdout == [{'a': '1', 'b': '2', 'c': '3'}]
@@ -351,6 +385,9 @@ class TestSSH:
         settings.server.ssh_password = 'test_password'
         settings.ssh_client.command_timeout = 300
         settings.ssh_client.connection_timeout = 10
+        settings.ssh_client.pool_size = 4
+        settings.ssh_client.pool_idle_timeout = 300
+        settings.ssh_client.keepalive_interval = 30
 
         ret = ssh.command('{"a": 1, "b": true}', output_format='json')
         assert ret.stdout == {'a': '1', 'b': True}
@@ -358,3 +395,236 @@ class TestSSH:
 
     def test_call_paramiko_client(self):
         assert isinstance(ssh._call_paramiko_sshclient(), (paramiko.SSHClient, MockSSHClient))
+
+
+class TestSSHConnectionPool:
+    """Tests for the pooled connections of module ``robottelo.ssh``."""
+
+    @pytest.fixture
+    def settings(self):
+        with mock.patch('robottelo.ssh.settings') as settings:
+            ssh._call_paramiko_sshclient = MockSSHClient
+            settings.server.hostname = 'example.com'
+            settings.server.ssh_username = 'nobody'
+            settings.server.ssh_key = None
+            settings.server.ssh_password = 'test_password'
+            settings.ssh_client.command_timeout = 300
+            settings.ssh_client.connection_timeout = 10
+            settings.ssh_client.pool_size = 2
+            settings.ssh_client.pool_idle_timeout = 300
+            settings.ssh_client.keepalive_interval = 30
+            yield settings
+
+    def test_connection_reused(self, settings):
+        with ssh.get_pooled_connection() as first:
+            assert first.transport.keepalive == 30
+        with ssh.get_pooled_connection() as second:
+            assert second is first
+        assert first.close_ == 0
+        stats = ssh.pool_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['idle'] == 1
+
+    def test_command_uses_pool(self, settings):
+        ssh.command('ls -la')
+        ret = ssh.execute_command('ls -la', output_format='base')
+        assert ret.stdout == 'ls -la'
+        assert ssh.pool_stats()['hits'] == 1
+
+    def test_pool_keyed_by_credentials(self, settings):
+        with ssh.get_pooled_connection() as first:
+            pass
+        with ssh.get_pooled_connection(username='other') as second:
+            assert second is not first
+            assert second.username == 'other'
+        assert ssh.pool_stats()['misses'] == 2
+
+    def test_pool_size_bounded(self, settings):
+        with ssh.get_pooled_connection() as first:
+            with ssh.get_pooled_connection() as second:
+                with ssh.get_pooled_connection() as third:
+                    pass
+        assert ssh.pool_stats()['idle'] == 2
+        assert third.close_ == 0
+        assert second.close_ == 0
+        assert first.close_ == 1
+
+    def test_inactive_transport_evicted(self, settings):
+        with ssh.get_pooled_connection() as first:
+            pass
+        first.transport.active = False
+        with ssh.get_pooled_connection() as second:
+            assert second is not first
+        assert first.close_ == 1
+        assert ssh.pool_stats()['evictions'] == 1
+
+    def test_idle_connection_evicted(self, settings):
+        settings.ssh_client.pool_idle_timeout = 0
+        with ssh.get_pooled_connection() as first:
+            pass
+        with mock.patch('robottelo.ssh.time.time', return_value=time.time() + 1):
+            with ssh.get_pooled_connection() as second:
+                assert second is not first
+        assert first.close_ == 1
+
+    def test_connection_discarded_on_error(self, settings):
+        with pytest.raises(ssh.SSHCommandTimeoutError):
+            with ssh.get_pooled_connection() as first:
+                raise ssh.SSHCommandTimeoutError()
+        assert first.close_ == 1
+        assert ssh.pool_stats()['idle'] == 0
+
+    def test_pool_disabled(self, settings):
+        settings.ssh_client.pool_size = 0
+        with ssh.get_pooled_connection() as first:
+            pass
+        assert first.close_ == 1
+        assert ssh.pool_stats()['misses'] == 0
+
+    def test_pool_reset_after_fork(self, settings):
+        with ssh.get_pooled_connection() as first:
+            pass
+        with mock.patch('robottelo.ssh.os.getpid', return_value=os.getpid() + 1):
+            with ssh.get_pooled_connection() as second:
+                assert second is not first
+        # the parent's connection must not be closed by the child
+        assert first.close_ == 0
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+    def test_pool_lock_after_fork(self, settings):
+        """A lock held in the parent while forking is usable in the child"""
+        with ssh.get_pooled_connection():
+            pass
+        ssh._connection_pool._lock.acquire()
+        try:
+            pid = os.fork()
+            if pid == 0:
+                if not ssh._connection_pool._lock.acquire(timeout=5):
+                    os._exit(1)
+                ssh._connection_pool._lock.release()
+                os._exit(0 if not ssh.pool_stats()['idle'] else 2)
+        finally:
+            ssh._connection_pool._lock.release()
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+
+    def test_run_many_ordered_results(self, settings):
+        cmds = [f'echo {index}' for index in range(20)]
+        results = ssh.run_many(cmds, output_format='base', concurrency=5)
+        assert [result.stdout for result in results] == cmds
+        stats = ssh.pool_stats()
+        assert stats['misses'] == 1
+        assert stats['idle'] == 1
+
+    def test_run_many_with_connection(self, settings):
+        client = MockSSHClient()
+        client.run_many = ssh.SSHClient.run_many.__get__(client)
+        results = client.run_many(['ls', 'pwd'], output_format='base')
+        assert [result.stdout for result in results] == ['ls', 'pwd']
+        assert ssh.pool_stats()['misses'] == 0
+
+    def test_run_many_ordered_errors(self, settings):
+        def exec_command(cmd, *args, **kwargs):
+            if cmd.startswith('fail'):
+                raise ssh.SSHCommandTimeoutError(cmd)
+            return (0, MockStdout(cmd, 0), MockStdout('', 0))
+
+        client = MockSSHClient()
+        client.exec_command = exec_command
+        cmds = ['ok 0', 'fail 1', 'ok 2', 'fail 3']
+        with pytest.raises(ssh.SSHRunManyError) as context:
+            ssh.run_many(cmds, output_format='base', connection=client)
+        error = context.value
+        assert [index for index, _, _ in error.errors] == [1, 3]
+        assert [cmd for _, cmd, _ in error.errors] == ['fail 1', 'fail 3']
+        assert error.results[0].stdout == 'ok 0'
+        assert isinstance(error.results[1], ssh.SSHCommandTimeoutError)
+
+    def test_run_many_timeout_per_command(self, settings):
+        with pytest.raises(ValueError):
+            ssh.run_many(['ls', 'pwd'], timeout=[10])
+        with mock.patch('robottelo.ssh.execute_command') as execute_command:
+            ssh.run_many(['ls', 'pwd'], timeout=[10, 20], connection=MockSSHClient())
+        assert sorted(call.args[3] for call in execute_command.call_args_list) == [10, 20]
+
+
+class MockStreamChannel:
+    """A channel sending its output in several chunks"""
+
+    def __init__(self, chunks, stderr=b'', ret=0):
+        self.chunks = list(chunks)
+        self.stderr = stderr
+        self.ret = ret
+        self.closed = False
+
+    def recv_ready(self):
+        return bool(self.chunks)
+
+    def recv(self, size):
+        return self.chunks.pop(0)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        data, self.stderr = self.stderr, b''
+        return data
+
+    def exit_status_ready(self):
+        return not self.chunks
+
+    def recv_exit_status(self):
+        return self.ret
+
+    def close(self):
+        self.closed = True
+
+
+class MockStream:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def read(self):
+        return b''
+
+
+class TestSSHCommandStream:
+    """Tests for ``robottelo.ssh.SSHCommandStream``."""
+
+    @pytest.fixture
+    def connection(self):
+        connection = MockSSHClient()
+        connection.channel = MockStreamChannel(
+            [b'Id,Na', b'me\n1,\x1b[32mfoo\x1b[0m\n[debug]\n2,b', b'ar'], stderr=b'warn', ret=3
+        )
+        connection.exec_command = lambda cmd, **kwargs: (
+            None,
+            MockStream(connection.channel),
+            MockStream(connection.channel),
+        )
+        return connection
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_stream_lines(self, settings, connection):
+        stream = ssh.execute_command('hammer', connection, output_format='csv', stream=True)
+        lines = iter(stream)
+        assert next(lines) == 'Id,Name'
+        assert stream.return_code is None
+        assert list(lines) == ['1,foo', '2,bar']
+        assert stream.return_code == 3
+        assert stream.stderr == 'warn'
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_stream_raw_lines(self, settings, connection):
+        stream = ssh.execute_command('hammer', connection, output_format='json', stream=True)
+        assert list(stream)[2] == '[debug]'
+
+    @mock.patch('robottelo.ssh.settings')
+    def test_stream_timeout(self, settings, connection):
+        connection.channel.exit_status_ready = lambda: False
+        connection.channel.chunks = []
+        stream = ssh.execute_command('hammer', connection, timeout=0.05, stream=True)
+        with pytest.raises(ssh.SSHCommandTimeoutError):
+            list(stream)
+        assert connection.channel.closed
@@ -1,4 +1,5 @@
 """Tests for :mod:`robottelo.vm`."""
+import time
 from unittest.mock import call
 from unittest.mock import patch
 from unittest.mock import PropertyMock
@@ -15,6 +16,7 @@ from robottelo.constants import NO_REPOS_AVAILABLE
 from robottelo.constants import SM_OVERALL_STATUS
 from robottelo.vm import VirtualMachine
 from robottelo.vm import VirtualMachineError
+from robottelo.vm import VMPool
 
 PROV_SERVER_DEFAULT = 'provisioning.example.com'
 
@@ -32,6 +34,7 @@ class TestVirtualMachine:
         """Provide mock patches scoped to the function for vm settings"""
         with patch('robottelo.vm.settings', spec=True) as patcher:
             patcher.clients.provisioning_server = None
+            patcher.clients.pool_size = 0
             patcher.distro = DistroSettings()
             yield patcher
 
@@ -236,3 +239,111 @@ class TestVirtualMachine:
             vm.subscription_manager_list_repos().stdout
             == 'This system has no repositories available through subscriptions.'
         )
+
+    @patch('robottelo.vm.wait_for_guest_ip', return_value='10.8.30.136')
+    @patch(
+        'robottelo.ssh.command',
+        side_effect=[
+            ssh.SSHCommandResult(
+                return_code=0,
+                stdout=['CPUs:     1', 'Memory:   512 MB', 'MAC:      52:54:00:f7:bb:a8'],
+            ),
+            ssh.SSHCommandResult(),
+        ],
+    )
+    def test_watch_gets_ip(
+        self,
+        ssh_command,
+        wait_for_guest_ip,
+        vm_settings_patch,
+        config_provisioning_server,
+        host_os_version_patch,
+    ):
+        """Verify that the IP is taken from the guest addresses watch"""
+        vm_settings_patch.clients.ip_discovery = 'watch'
+        vm = VirtualMachine()
+        vm.create()
+        assert vm.ip_addr == '10.8.30.136'
+        wait_for_guest_ip.assert_called_once_with(PROV_SERVER_DEFAULT, '52:54:00:f7:bb:a8')
+        assert ssh_command.call_count == 2
+
+
+class TestVMPool:
+    """Tests for :class:`robottelo.vm.VMPool`."""
+
+    @pytest.fixture
+    def pool(self):
+        with patch('robottelo.vm.settings', spec=True) as settings:
+            settings.clients.provisioning_server = PROV_SERVER_DEFAULT
+            settings.distro = DistroSettings()
+            pool = VMPool(size=2)
+            with patch('robottelo.vm.vm_pool', pool), patch('robottelo.ssh.command'), patch.object(
+                VirtualMachine, 'allowed_distros', new_callable=PropertyMock
+            ) as allowed_distros:
+                allowed_distros.return_value = [DISTRO_RHEL6, DISTRO_RHEL7]
+                yield pool
+                pool.shutdown()
+
+    @pytest.fixture
+    def boot(self):
+        """Boot the virtual machines without the provisioning server"""
+        booted = []
+
+        def boot(vm):
+            booted.append(vm.hostname)
+            vm._created = True
+            vm.ip_addr = f'192.168.0.{len(booted)}'
+
+        with patch.object(VirtualMachine, '_boot', autospec=True, side_effect=boot):
+            yield booted
+
+    @staticmethod
+    def _wait_depth(pool, depth):
+        for _ in range(100):
+            if pool.stats()['depth'].get(DISTRO_RHEL7) == depth:
+                return
+            time.sleep(0.01)
+        raise AssertionError(f'pool depth is not {depth}: {pool.stats()}')
+
+    def test_take(self, pool, boot):
+        first = VirtualMachine(distro=DISTRO_RHEL7)
+        first.create()
+        assert first.hostname in boot
+        self._wait_depth(pool, 2)
+        second = VirtualMachine(distro=DISTRO_RHEL7)
+        hostname = second.hostname
+        second.create()
+        # the pooled virtual machine is handed out and replaced
+        assert second.hostname != hostname
+        assert second.hostname in boot
+        assert second.hostname != first.hostname
+        assert second._created
+        assert second.ip_addr
+        self._wait_depth(pool, 2)
+        assert len(boot) == 4
+        stats = pool.stats()
+        assert (stats['hits'], stats['misses'], stats['boots']) == (1, 1, 4)
+        assert stats['hit_rate'] == 0.5
+
+    def test_not_pooled(self, pool, boot):
+        vm = VirtualMachine(distro=DISTRO_RHEL7, tag='test')
+        vm.create()
+        assert boot == [vm.hostname]
+        assert pool.stats()['misses'] == 0
+        VirtualMachine(distro=DISTRO_RHEL6, cpu=2).create()
+        assert pool.stats()['depth'].get(DISTRO_RHEL7, 0) == 0
+
+    def test_shutdown(self, pool, boot):
+        first = VirtualMachine(distro=DISTRO_RHEL7)
+        first.create()
+        self._wait_depth(pool, 2)
+        with patch('robottelo.ssh.command') as ssh_command:
+            pool.shutdown()
+        # the pooled virtual machines are destroyed
+        destroyed = {args[0] for args, _ in ssh_command.call_args_list if 'destroy' in args[0]}
+        assert destroyed == {
+            f'virsh destroy {hostname}' for hostname in boot if hostname != first.hostname
+        }
+        vm = VirtualMachine(distro=DISTRO_RHEL7)
+        vm.create()
+        assert boot[-1] == vm.hostname